@@ -0,0 +1,12 @@
+"""
+VRP optimizer benchmark'ları
+Repo kökünden çalıştır: python3 -m benchmarks.<modül>
+"""
+
+import os
+import sys
+
+# railway/ modüllerini (ortools_optimizer, distance_matrix, ...) import edilebilir yap
+RAILWAY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'railway')
+if RAILWAY_DIR not in sys.path:
+    sys.path.append(RAILWAY_DIR)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Sonuç cache'i denetimi: aynı epoch X-Deadline ile gelen iki eşzamanlı /optimize isteği (çift tıklama /
+retry) tek çözümde birleşir, tekrarı cache'ten döner. Deadline'dan hesaplanan bütçe her çağrıda
+farklı olsa da cache anahtarı aynı kalmalıdır. Birleşmezse sıfırdan farklı kodla çıkar.
+Kullanım: python3 -m benchmarks.deadline_cache [--instance seed-istanbul] [--deadline 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+os.environ['OSRM_URL'] = 'http://127.0.0.1:9'
+os.environ['MATRIX_CACHE_DIR'] = ''
+
+from .instances import build_instance
+from main import OptimizeRequest, optimize
+from result_cache import get_result_cache
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instance", default="seed-istanbul")
+    parser.add_argument("--deadline", type=float, default=5, help="X-Deadline: şimdiden kaç saniye sonrası (epoch)")
+    args = parser.parse_args()
+
+    request = OptimizeRequest(**build_instance(args.instance))
+    x_deadline = str(time.time() + args.deadline)
+    results = [None, None]
+
+    def call(index: int) -> None:
+        results[index] = optimize(request, x_deadline)
+
+    cache = get_result_cache()
+    before = cache.stats()
+    # Optimizer çıktısı bastırılır
+    with contextlib.redirect_stdout(io.StringIO()):
+        threads = [threading.Thread(target=call, args=(index,)) for index in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        repeat = optimize(request, x_deadline)
+    after = cache.stats()
+
+    counts = {name: after[name] - before[name] for name in ("misses", "coalesced", "hits")}
+    print(f"Eşzamanlı iki istek + tekrar: {counts}")
+    ok = counts == {"misses": 1, "coalesced": 1, "hits": 1} and results[0] == results[1] == repeat
+    print("Birleşti" if ok else "BİRLEŞMEDİ: epoch deadline'lı aynı istekler ayrı çözüldü")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
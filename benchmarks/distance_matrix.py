@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Haversine mesafe matrisi benchmark'ı: saf Python çift döngü vs NumPy broadcasting
+Kullanım: python3 -m benchmarks.distance_matrix [--sizes 100 1000 5000]
+"""
+
+import argparse
+import random
+import time
+
+from . import RAILWAY_DIR  # noqa: F401  (sys.path ayarı)
+from distance_matrix import haversine_matrix
+from ortools_optimizer import haversine_distance
+
+# Büyük boyutlarda saf Python döngüsü dakikalar sürer; bu kadar satır ölçülüp ekstrapole edilir
+MAX_PYTHON_ROWS = 200
+
+
+def python_matrix_rows(locations: list, rows: int) -> list:
+    """Eski implementasyon (get_osrm_distance_matrix fallback) - ilk `rows` satır"""
+    matrix = []
+    for i, loc1 in enumerate(locations[:rows]):
+        row = []
+        for j, loc2 in enumerate(locations):
+            if i == j:
+                row.append(0)
+            else:
+                dist = haversine_distance(loc1[0], loc1[1], loc2[0], loc2[1])
+                row.append(int(dist * 1000))
+        matrix.append(row)
+    return matrix
+
+
+def random_locations(n: int, seed: int = 42) -> list:
+    """Adana civarında rastgele noktalar"""
+    rng = random.Random(seed)
+    return [(37.0 + rng.uniform(-0.5, 0.5), 35.32 + rng.uniform(-0.5, 0.5)) for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"{'N':>6} | {'Python (s)':>12} | {'NumPy (s)':>10} | {'Hızlanma':>9} | {'Maks fark (m)':>13}")
+    print("-" * 72)
+
+    for n in args.sizes:
+        locations = random_locations(n)
+        rows = min(n, MAX_PYTHON_ROWS)
+
+        start = time.perf_counter()
+        py_rows = python_matrix_rows(locations, rows)
+        py_seconds = (time.perf_counter() - start) * n / rows
+
+        start = time.perf_counter()
+        np_matrix = haversine_matrix(locations)
+        np_seconds = time.perf_counter() - start
+
+        max_diff = max(
+            abs(int(np_matrix[i][j]) - py_rows[i][j])
+            for i in range(rows) for j in range(n)
+        )
+        extrapolated = "*" if rows < n else " "
+        print(f"{n:>6} | {py_seconds:>11.3f}{extrapolated} | {np_seconds:>10.4f} | {py_seconds / np_seconds:>8.0f}x | {max_diff:>13}")
+
+    print("-" * 72)
+    print(f"* saf Python süresi ilk {MAX_PYTHON_ROWS} satırdan ekstrapole edildi")
+
+
+if __name__ == '__main__':
+    main()
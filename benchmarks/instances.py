@@ -0,0 +1,341 @@
+"""
+Benchmark örnekleri: sentetik (uniform / kümeli) üreticiler ve scripts/00x-seed-*.sql
+dosyalarından türetilen gerçek müşteri/depo/araç setleri.
+Tüm örnekler optimize_routes() girdi formatındadır: {name, depots, customers, vehicles}
+"""
+
+import os
+import random
+import re
+from typing import Dict, List
+
+from . import RAILWAY_DIR  # noqa: F401  (sys.path ayarı)
+from ortools_optimizer import SERVICE_TIMES, VEHICLE_TYPES
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+
+# Sentetik örnekler için merkez (Adana Merkez Depo, scripts/test_ortools.py)
+DEFAULT_CENTER = (37.0, 35.32)
+
+# Araç tipi adı -> VEHICLE_TYPES anahtarı ('kamyon' eski şemadaki 12 paletlik kamyon)
+VEHICLE_TYPE_IDS = {
+    "kamyonet": 0,
+    "kamyon": 1,
+    "kamyon_1": 1,
+    "kamyon_2": 2,
+    "tir": 3,
+    "romork": 4,
+}
+
+# Müşteri adı öneki -> SERVICE_TIMES iş tipi
+SEED_BUSINESS_PREFIXES = (("MCD", "MCD"), ("IKEA", "IKEA"), ("OPET", "OPT"), ("CHL", "CHL"))
+
+# Seed'lerde depo yok; Adana müşterileri için scripts/test_ortools.py'deki depo kullanılır
+ADANA_DEPOT = {"id": "depot-adana", "name": "Adana Merkez Depo", "city": "Adana", "location": {"lat": 37.0, "lng": 35.32}}
+
+
+def _fleet_for_demand(total_demand: int, depot_id: str, rng: random.Random, headroom: float = 1.5) -> List[dict]:
+    """Talebi headroom oranında karşılayan karışık tipli filo"""
+    vehicles = []
+    capacity = 0
+    while capacity < total_demand * headroom:
+        vehicle_type = rng.choice(list(VEHICLE_TYPES))
+        spec = VEHICLE_TYPES[vehicle_type]
+        vehicles.append({
+            "id": f"{depot_id}-v{len(vehicles) + 1}",
+            "type": vehicle_type,
+            "capacity_pallets": spec["capacity"],
+            "fuel_consumption": spec["fuel"],
+        })
+        capacity += spec["capacity"]
+    return vehicles
+
+
+def _synthetic_customer(index: int, lat: float, lng: float, depot_id: str, rng: random.Random) -> dict:
+    business_type = rng.choice(["MCD", "IKEA", "CHL", "OPT"])
+    return {
+        "id": f"c{index}",
+        "name": f"Müşteri {index}",
+        "location": {"lat": round(lat, 6), "lng": round(lng, 6)},
+        "demand_pallets": rng.randint(1, 8),
+        "business_type": business_type,
+        "service_duration": SERVICE_TIMES[business_type],
+        "depot_id": depot_id,
+    }
+
+
+def uniform_instance(num_customers: int, seed: int = 42, radius_deg: float = 0.3) -> dict:
+    """Depo etrafında kare alana düzgün dağılmış müşteriler"""
+    rng = random.Random(seed)
+    depot = {"id": "depot-1", "name": "Sentetik Depo", "location": {"lat": DEFAULT_CENTER[0], "lng": DEFAULT_CENTER[1]}}
+    customers = [
+        _synthetic_customer(
+            i,
+            DEFAULT_CENTER[0] + rng.uniform(-radius_deg, radius_deg),
+            DEFAULT_CENTER[1] + rng.uniform(-radius_deg, radius_deg),
+            depot["id"], rng
+        )
+        for i in range(num_customers)
+    ]
+    vehicles = _fleet_for_demand(sum(c["demand_pallets"] for c in customers), depot["id"], rng)
+    return {"name": f"uniform-{num_customers}", "depots": [depot], "customers": customers, "vehicles": vehicles}
+
+
+def clustered_instance(num_customers: int, seed: int = 42, num_clusters: int = 8,
+                       radius_deg: float = 0.3, cluster_sigma_deg: float = 0.03) -> dict:
+    """Gaussian kümelerde toplanmış müşteriler (şehir içi ilçe yapısı)"""
+    rng = random.Random(seed)
+    depot = {"id": "depot-1", "name": "Sentetik Depo", "location": {"lat": DEFAULT_CENTER[0], "lng": DEFAULT_CENTER[1]}}
+    centers = [
+        (DEFAULT_CENTER[0] + rng.uniform(-radius_deg, radius_deg), DEFAULT_CENTER[1] + rng.uniform(-radius_deg, radius_deg))
+        for _ in range(num_clusters)
+    ]
+    customers = []
+    for i in range(num_customers):
+        center = centers[i % num_clusters]
+        customers.append(_synthetic_customer(
+            i,
+            rng.gauss(center[0], cluster_sigma_deg),
+            rng.gauss(center[1], cluster_sigma_deg),
+            depot["id"], rng
+        ))
+    vehicles = _fleet_for_demand(sum(c["demand_pallets"] for c in customers), depot["id"], rng)
+    return {"name": f"clustered-{num_customers}", "depots": [depot], "customers": customers, "vehicles": vehicles}
+
+
+# ---------------------------------------------------------------------------
+# Seed SQL ayrıştırma
+# ---------------------------------------------------------------------------
+
+def _split_tuples(values_sql: str) -> List[List[str]]:
+    """VALUES (...), (...) bloğunu ham alan listelerine ayır (tırnak, '' kaçışı ve alt sorgular desteklenir)"""
+    rows = []
+    depth = 0
+    field = []
+    fields = []
+    in_string = False
+    i = 0
+    while i < len(values_sql):
+        ch = values_sql[i]
+        if in_string:
+            if ch == "'" and values_sql[i + 1:i + 2] == "'":
+                field.append("'")
+                i += 1
+            elif ch == "'":
+                in_string = False
+                field.append(ch)
+            else:
+                field.append(ch)
+        elif ch == "'":
+            in_string = True
+            field.append(ch)
+        elif ch == '-' and values_sql[i + 1:i + 2] == '-' and depth == 0:
+            # Satır yorumu
+            newline = values_sql.find('\n', i)
+            i = len(values_sql) if newline == -1 else newline
+            continue
+        elif ch == '(':
+            depth += 1
+            if depth > 1:
+                field.append(ch)
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                fields.append(''.join(field).strip())
+                rows.append(fields)
+                fields, field = [], []
+            else:
+                field.append(ch)
+        elif ch == ',' and depth == 1:
+            fields.append(''.join(field).strip())
+            field = []
+        elif ch == ';' and depth == 0:
+            break
+        elif depth >= 1:
+            field.append(ch)
+        i += 1
+    return rows
+
+
+def _sql_value(raw: str):
+    if raw.upper() == 'NULL':
+        return None
+    if raw.startswith("'") and raw.endswith("'"):
+        return raw[1:-1]
+    try:
+        return float(raw) if '.' in raw else int(raw)
+    except ValueError:
+        return raw  # alt sorgu vb.
+
+
+def parse_insert_rows(sql: str, table: str) -> List[Dict[str, object]]:
+    """INSERT INTO <table> (kolonlar) VALUES ... satırlarını dict listesine çevir"""
+    rows = []
+    pattern = re.compile(rf"INSERT INTO {table}\s*\(([^)]*)\)\s*VALUES", re.IGNORECASE)
+    for match in pattern.finditer(sql):
+        columns = [c.strip() for c in match.group(1).split(',')]
+        for raw in _split_tuples(sql[match.end():]):
+            if len(raw) == len(columns):
+                rows.append({col: _sql_value(value) for col, value in zip(columns, raw)})
+    return rows
+
+
+def _read_sql(filename: str) -> str:
+    with open(os.path.join(SCRIPTS_DIR, filename), encoding='utf-8') as f:
+        return f.read()
+
+
+def seed_depots() -> List[dict]:
+    """002-seed-depots.sql (+ 021 İzmir koordinat düzeltmesi zaten dosyada)"""
+    depots = []
+    for index, row in enumerate(parse_insert_rows(_read_sql('002-seed-depots.sql'), 'depots'), start=1):
+        depots.append({
+            "id": f"depot-{index}",
+            "name": row["name"],
+            "city": row["city"],
+            "location": {"lat": float(row["lat"]), "lng": float(row["lng"])},
+        })
+    return depots
+
+
+def seed_vehicles(depots: List[dict]) -> List[dict]:
+    """003-seed-vehicles.sql (generate_series blokları) + 009-expand-vehicle-fleet.sql"""
+    vehicles = []
+    depots_by_city = {d["city"]: d for d in depots}
+    depots_by_id = {d["id"]: d for d in depots}
+
+    # 003: her blok "CASE WHEN n <= K THEN 'kamyon' ELSE 'tir'" + generate_series(1, N) + WHERE d.city = '...'
+    for block in _read_sql('003-seed-vehicles.sql').split('INSERT INTO vehicles')[1:]:
+        threshold = re.search(r"CASE WHEN n <= (\d+) THEN '(\w+)' ELSE '(\w+)' END", block)
+        capacities = re.findall(r"CASE WHEN n <= \d+ THEN ([\d.]+) ELSE ([\d.]+) END", block)
+        count = re.search(r"generate_series\(1,\s*(\d+)\)", block)
+        city = re.search(r"WHERE d\.city = '([^']+)'", block)
+        if not (threshold and capacities and count and city) or city.group(1) not in depots_by_city:
+            continue
+        depot = depots_by_city[city.group(1)]
+        limit, small_type, large_type = int(threshold.group(1)), threshold.group(2), threshold.group(3)
+        small_capacity, large_capacity = int(capacities[0][0]), int(capacities[0][1])
+        # Sıra: pallets, kg, cost_per_km, fuel
+        small_fuel, large_fuel = float(capacities[3][0]), float(capacities[3][1])
+        for n in range(1, int(count.group(1)) + 1):
+            small = n <= limit
+            vehicles.append({
+                "id": f"{depot['id']}-seed-{n}",
+                "depot_id": depot["id"],
+                "type": VEHICLE_TYPE_IDS[small_type if small else large_type],
+                "capacity_pallets": small_capacity if small else large_capacity,
+                "fuel_consumption": small_fuel if small else large_fuel,
+            })
+
+    for row in parse_insert_rows(_read_sql('009-expand-vehicle-fleet.sql'), 'vehicles'):
+        if row["depot_id"] not in depots_by_id:
+            continue
+        vehicles.append({
+            "id": row["id"],
+            "depot_id": row["depot_id"],
+            "plate": row["plate"],
+            "type": VEHICLE_TYPE_IDS[row["vehicle_type"]],
+            "capacity_pallets": int(row["capacity_pallets"]),
+            "fuel_consumption": float(row["fuel_consumption_per_100km"]),
+        })
+    return vehicles
+
+
+def seed_customers() -> List[dict]:
+    """004/005/006 şehir müşterileri + 022 Adana (talepler 023 siparişlerinden)"""
+    customers = []
+    for filename in ('004-seed-customers-istanbul.sql', '005-seed-customers-ankara.sql', '006-seed-customers-izmir.sql'):
+        for row in parse_insert_rows(_read_sql(filename), 'customers'):
+            customers.append(row)
+
+    adana_sql = _read_sql('023-create-adana-orders.sql')
+    adana_demands = {name: qty for name, qty in re.findall(r"\('([^']+)',\s*(\d+)\)", adana_sql)}
+    for row in parse_insert_rows(_read_sql('022-seed-customers-adana.sql'), 'customers'):
+        row["demand_pallets"] = int(adana_demands.get(row["name"], 1))
+        customers.append(row)
+
+    result = []
+    for index, row in enumerate(customers, start=1):
+        name = row["name"]
+        business_type = next((b for prefix, b in SEED_BUSINESS_PREFIXES if name.upper().startswith(prefix)), "default")
+        result.append({
+            "id": row.get("id") or f"seed-c{index}",
+            "name": name,
+            "city": row["city"],
+            "location": {"lat": float(row["lat"]), "lng": float(row["lng"])},
+            "demand_pallets": int(row.get("demand_pallets") or 1),
+            "business_type": business_type,
+            "service_duration": int(row.get("service_duration_minutes") or SERVICE_TIMES.get(business_type, SERVICE_TIMES["default"])),
+            "required_vehicle_type": row.get("required_vehicle_type"),
+        })
+    return result
+
+
+def seed_instance(city: str = None) -> dict:
+    """
+    Seed verisinden örnek. city=None: tüm şehirler (İstanbul/Ankara/İzmir/Adana depoları).
+    Müşteriler kendi şehrinin deposuna atanır; Adana için ADANA_DEPOT kullanılır.
+    """
+    depots = seed_depots() + [ADANA_DEPOT]
+    fleet = seed_vehicles(depots)
+    rng = random.Random(0)
+
+    depots_by_city = {d["city"]: d for d in depots}
+    if city:
+        depots = [depots_by_city[city]]
+
+    customers = []
+    for customer in seed_customers():
+        depot = depots_by_city.get(customer["city"])
+        if depot is None or depot not in depots:
+            continue
+        customers.append(dict(customer, depot_id=depot["id"]))
+
+    vehicles = []
+    for depot in depots:
+        depot_vehicles = [v for v in fleet if v["depot_id"] == depot["id"]]
+        depot_demand = sum(c["demand_pallets"] for c in customers if c["depot_id"] == depot["id"])
+        if not depot_vehicles:
+            # Seed'de filosu olmayan depo (Adana): talebe göre filo üret
+            depot_vehicles = _fleet_for_demand(depot_demand, depot["id"], rng)
+        vehicles.extend(depot_vehicles)
+
+    slug = (city or 'all').lower().replace('İ', 'i').replace('ı', 'i').replace('i̇', 'i')
+    return {"name": f"seed-{slug}", "depots": depots, "customers": customers, "vehicles": vehicles}
+
+
+def to_solve_vrp_input(instance: dict, time_limit_seconds: int) -> dict:
+    """Tek depolu örneği scripts/ortools_optimizer.py (solve_vrp) girdi formatına çevir"""
+    depot = instance["depots"][0]["location"]
+    return {
+        "depot": {"lat": depot["lat"], "lng": depot["lng"]},
+        "vehicles": [
+            {"id": i, "type": v["type"], "capacity_pallets": v["capacity_pallets"]}
+            for i, v in enumerate(instance["vehicles"])
+        ],
+        "customers": [
+            {
+                "lat": c["location"]["lat"],
+                "lng": c["location"]["lng"],
+                "pallets": c["demand_pallets"],
+                "business": c.get("business_type", ""),
+                "special_constraint": "HAYIR",
+                "allowed_vehicle_types": None,
+            }
+            for c in instance["customers"]
+        ],
+        "time_limit_seconds": time_limit_seconds,
+    }
+
+
+def build_instance(spec: str, seed: int = 42) -> dict:
+    """'uniform-500', 'clustered-2000', 'seed-adana', 'seed-all' gibi tanımlardan örnek üret"""
+    kind, _, arg = spec.partition('-')
+    if kind == 'uniform':
+        return uniform_instance(int(arg), seed)
+    if kind == 'clustered':
+        return clustered_instance(int(arg), seed)
+    if kind == 'seed':
+        cities = {"istanbul": "İstanbul", "ankara": "Ankara", "izmir": "İzmir", "adana": "Adana", "all": None}
+        return seed_instance(cities[arg])
+    raise ValueError(f"Bilinmeyen örnek tanımı: {spec}")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+kNN yay budaması benchmark'ı: aynı örnek tam N x N yay kümesiyle ve müşteri başına
+k en yakın komşuyla çözülür. İki aşama ölçülür: (a) ilk çözüm, (b) aynı ilk plandan
+başlayan yerel arama (yerel optimuma ya da süre sınırına kadar). Arama süresi
+(summary.search_seconds, matris/model kurulumu hariç) ve toplam maliyet karşılaştırılır.
+Kullanım: python3 -m benchmarks.neighbors [--instances uniform-2000 clustered-2000] [--k 40]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import time
+
+os.environ['OSRM_URL'] = 'http://127.0.0.1:9'
+os.environ['MATRIX_CACHE_DIR'] = ''
+
+from .instances import build_instance
+from .warm_start import plan_of
+from ortools_optimizer import optimize_routes
+
+
+def solve(instance: dict, neighbors: int = None, initial_routes: list = None, time_limit: int = 120) -> tuple:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimize_routes(
+            instance["depots"], instance["customers"], instance["vehicles"], max_workers=1,
+            time_limit_seconds=time_limit, initial_routes=initial_routes, nearest_neighbors=neighbors
+        )
+    return result, time.perf_counter() - start
+
+
+def cost(result: dict) -> float:
+    return round(sum(route["total_cost"] for route in result["routes"]), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instances", nargs="+", default=["uniform-1000", "uniform-2000", "uniform-5000"])
+    parser.add_argument("--k", type=int, default=40, help="Müşteri başına komşu sayısı")
+    parser.add_argument("--time-limit", type=int, default=60, help="Yerel arama süre sınırı (saniye)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'örnek':16} {'aşama':12} {'yaylar':>8} {'arama (s)':>10} {'duvar (s)':>10} {'maliyet':>12} {'araç':>6}")
+    for spec in args.instances:
+        instance = build_instance(spec, args.seed)
+        first, _ = solve(instance)
+        plan = plan_of(first)
+        for stage, initial_routes in (("ilk çözüm", None), ("yerel arama", plan)):
+            for label, neighbors in (("tam", None), (f"k={args.k}", args.k)):
+                result, wall = solve(instance, neighbors, initial_routes, args.time_limit)
+                summary = result["summary"]
+                print(f"{spec:16} {stage:12} {label:>8} {summary['search_seconds']:10.2f} {wall:10.2f} "
+                      f"{cost(result):12.2f} {summary['total_vehicles_used']:6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Solver benchmark paketi: sabit seed ve süre bütçesiyle sentetik + seed örneklerini çözer,
+duvar süresi, tepe bellek (RSS), amaç değeri, kullanılan araç ve toplam mesafeyi JSON rapora yazar.
+Saklanan baseline'a göre eşiği aşan gerileme varsa sıfırdan farklı kodla çıkar.
+
+Kullanım:
+  python3 -m benchmarks.run                        # quick paket, baseline ile karşılaştır
+  python3 -m benchmarks.run --suite full           # 50..5000 müşteri
+  python3 -m benchmarks.run --cases uniform-500 seed-all --time-limit 10
+  python3 -m benchmarks.run --update-baseline      # mevcut sonuçları baseline olarak kaydet
+  python3 -m benchmarks.run --cases uniform-2000 --solvers optimize_routes decomposed --workers 4
+
+Her örnek ayrı bir process'te çalışır (tepe RSS örnekler arasında karışmaz).
+Mesafe matrisleri haversine'dir: OSRM_URL erişilemez adrese, MATRIX_CACHE_DIR boşa ayarlanır.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+SUITES = {
+    "quick": ["uniform-50", "clustered-200", "seed-adana", "seed-istanbul", "seed-all"],
+    "full": [
+        "uniform-50", "uniform-200", "uniform-1000", "uniform-2000", "uniform-5000",
+        "clustered-50", "clustered-200", "clustered-1000", "clustered-2000", "clustered-5000",
+        "seed-adana", "seed-istanbul", "seed-ankara", "seed-izmir", "seed-all",
+    ],
+}
+
+# Baseline'a göre izin verilen göreli kötüleşme
+DEFAULT_THRESHOLD = 0.10
+# Kısa örneklerde süre gürültüsünü yok saymak için mutlak tolerans
+WALL_SLACK_SECONDS = 1.0
+RSS_SLACK_MB = 32.0
+
+# Karşılaştırılan metrikler (hepsinde küçük olan iyidir)
+COMPARED_METRICS = ("wall_seconds", "peak_rss_mb", "objective", "distance_km", "vehicles_used")
+
+
+def _peak_rss_mb() -> float:
+    """Process ve (depo havuzu gibi) alt process'lerin tepe RSS'i; Linux'ta ru_maxrss KB cinsindendir"""
+    self_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children_kb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(max(self_kb, children_kb) / scale, 1)
+
+
+def _run_case(spec: str, solver: str, seed: int, time_limit: int, workers: int, neighbors, queue) -> None:
+    """Alt process gövdesi: örneği üret, çöz, metrikleri kuyruğa yaz"""
+    # Çevrimdışı ve tekrarlanabilir: OSRM yok, cache yok
+    os.environ['OSRM_URL'] = 'http://127.0.0.1:9'
+    os.environ['MATRIX_CACHE_DIR'] = ''
+    # Depo havuzu OPTIMIZER_WORKERS boyutunda kurulur
+    os.environ['OPTIMIZER_WORKERS'] = str(workers)
+    if not os.environ.get('BENCHMARK_VERBOSE'):
+        sys.stdout = open(os.devnull, 'w')
+
+    try:
+        from .instances import build_instance, to_solve_vrp_input
+        instance = build_instance(spec, seed)
+        result = {
+            "case": spec,
+            "solver": solver,
+            "customers": len(instance["customers"]),
+            "vehicles_available": len(instance["vehicles"]),
+        }
+
+        if solver in ("optimize_routes", "decomposed"):
+            from ortools_optimizer import optimize_routes
+            start = time.perf_counter()
+            solution = optimize_routes(
+                instance["depots"], instance["customers"], instance["vehicles"],
+                max_workers=workers, time_limit_seconds=time_limit, decompose=solver == "decomposed",
+                nearest_neighbors=neighbors
+            )
+            result["wall_seconds"] = round(time.perf_counter() - start, 3)
+            routes = solution["routes"]
+            result["objective"] = round(sum(r["total_cost"] for r in routes), 2)
+            result["distance_km"] = solution["summary"]["total_distance_km"]
+            result["vehicles_used"] = solution["summary"]["total_vehicles_used"]
+            result["customers_served"] = sum(len(r["stops"]) for r in routes)
+        else:
+            import importlib.util
+            path = os.path.join(os.path.dirname(BENCHMARK_DIR), 'scripts', 'ortools_optimizer.py')
+            module_spec = importlib.util.spec_from_file_location('scripts_ortools_optimizer', path)
+            scripts_optimizer = importlib.util.module_from_spec(module_spec)
+            module_spec.loader.exec_module(scripts_optimizer)
+
+            data = scripts_optimizer.create_data_model(to_solve_vrp_input(instance, time_limit))
+            start = time.perf_counter()
+            solution = scripts_optimizer.solve_vrp(data)
+            result["wall_seconds"] = round(time.perf_counter() - start, 3)
+            if "error" in solution:
+                raise RuntimeError(solution["error"])
+            # solve_vrp amaç değeri: mesafe (km) + araç sabit maliyeti (1000 birim = 10 km)
+            result["distance_km"] = round(solution["total_distance"], 2)
+            result["vehicles_used"] = solution["num_routes"]
+            result["objective"] = round(solution["total_distance"] + 10 * solution["num_routes"], 2)
+            result["customers_served"] = sum(len(r["stops"]) for r in solution["routes"])
+
+        result["status"] = "ok"
+    except Exception as e:
+        result = {"case": spec, "solver": solver, "status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    result["peak_rss_mb"] = _peak_rss_mb()
+    queue.put(result)
+    # Kalıcı depo havuzu açık kalırsa alt process çıkışta worker'larını beklerken kilitlenir
+    optimizer = sys.modules.get("ortools_optimizer")
+    if optimizer is not None and optimizer._depot_pool is not None:
+        optimizer._depot_pool.shutdown(wait=True)
+
+
+def run_case(spec: str, solver: str, seed: int, time_limit: int, workers: int, neighbors: int = None) -> dict:
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_case, args=(spec, solver, seed, time_limit, workers, neighbors, queue))
+    process.start()
+    # Bütçe + matris/model kurulumu için pay
+    try:
+        result = queue.get(timeout=time_limit * 10 + 600)
+    except Exception:
+        process.kill()
+        result = {"case": spec, "solver": solver, "status": "error", "error": "timeout"}
+    process.join()
+    return result
+
+
+def compare(results: list, baseline: dict, threshold: float) -> list:
+    """Baseline'a göre gerilemeleri döndür"""
+    regressions = []
+    baseline_cases = {(c["case"], c["solver"]): c for c in baseline.get("cases", [])}
+    for result in results:
+        previous = baseline_cases.get((result["case"], result["solver"]))
+        if previous is None:
+            continue
+        name = f"{result['case']} [{result['solver']}]"
+        if result["status"] != "ok":
+            if previous.get("status") == "ok":
+                regressions.append(f"{name}: çözüm başarısız ({result.get('error')})")
+            continue
+        if previous.get("status") != "ok":
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = previous.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            slack = {"wall_seconds": WALL_SLACK_SECONDS, "peak_rss_mb": RSS_SLACK_MB}.get(metric, 0)
+            if new > old * (1 + threshold) + slack:
+                regressions.append(f"{name}: {metric} {old} -> {new}")
+        if result.get("customers_served", 0) < previous.get("customers_served", 0):
+            regressions.append(f"{name}: customers_served {previous['customers_served']} -> {result['customers_served']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VRP solver benchmark paketi")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick")
+    parser.add_argument("--cases", nargs="+", help="Paket yerine örnek listesi (ör. uniform-500 seed-adana)")
+    parser.add_argument("--solvers", nargs="+", choices=["optimize_routes", "decomposed", "solve_vrp"],
+                        default=["optimize_routes", "solve_vrp"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--time-limit", type=int, default=5, help="Örnek başına solver süre bütçesi (saniye)")
+    parser.add_argument("--workers", type=int, default=1, help="optimize_routes depo/dilim worker sayısı")
+    parser.add_argument("--neighbors", type=int, help="optimize_routes kNN yay budaması (k)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="JSON raporu yazılacak dosya (varsayılan: stdout)")
+    args = parser.parse_args()
+
+    cases = args.cases or SUITES[args.suite]
+    results = []
+    for spec in cases:
+        for solver in args.solvers:
+            # solve_vrp tek depoludur
+            if solver == "solve_vrp" and spec == "seed-all":
+                continue
+            result = run_case(spec, solver, args.seed, args.time_limit, args.workers, args.neighbors)
+            results.append(result)
+            if result["status"] == "ok":
+                print(f"{spec:16} {solver:16} {result['wall_seconds']:8.2f}s {result['peak_rss_mb']:8.1f}MB "
+                      f"obj={result['objective']} km={result['distance_km']} araç={result['vehicles_used']} "
+                      f"müşteri={result['customers_served']}/{result['customers']}", file=sys.stderr)
+            else:
+                print(f"{spec:16} {solver:16} HATA: {result['error']}", file=sys.stderr)
+
+    report = {
+        "seed": args.seed,
+        "time_limit_seconds": args.time_limit,
+        "workers": args.workers,
+        "neighbors": args.neighbors,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "cases": results,
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+        print(f"Baseline güncellendi: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Baseline yok, karşılaştırma atlandı (--update-baseline ile oluştur)", file=sys.stderr)
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if (baseline.get("seed"), baseline.get("time_limit_seconds")) != (args.seed, args.time_limit):
+        print("UYARI: Baseline farklı seed/süre bütçesiyle üretilmiş", file=sys.stderr)
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} gerileme (eşik %{args.threshold * 100:.0f}):", file=sys.stderr)
+        for line in regressions:
+            print(f"  - {line}", file=sys.stderr)
+        return 1
+    print("Gerileme yok", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Araç sınıfı simetri kırma benchmark'ı: filo ağırlıklı örneklerde (özdeş araçlar, --fleet-factor ile
+çoğaltılmış filo) aynı ilk plandan başlayan yerel arama sıralı araç kullanımı kısıtıyla ve kısıtsız,
+artan süre bütçeleriyle çözülür. Bütçe başına toplam maliyet (zaman -> kalite) karşılaştırılır.
+Kullanım: python3 -m benchmarks.symmetry [--instances uniform-1000 seed-all] [--budgets 2 5 10 20]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+
+os.environ['OSRM_URL'] = 'http://127.0.0.1:9'
+os.environ['MATRIX_CACHE_DIR'] = ''
+
+from .instances import build_instance
+from .warm_start import plan_of
+from ortools_optimizer import optimize_routes
+from solve_context import SolveContext
+
+
+def fleet_heavy(instance: dict, factor: int) -> dict:
+    """Her aracın factor - 1 özdeş kopyası eklenir (aynı tip, kapasite, depo, yakıt)"""
+    vehicles = list(instance["vehicles"])
+    for copy in range(1, factor):
+        vehicles.extend(dict(vehicle, id=f"{vehicle['id']}-x{copy}") for vehicle in instance["vehicles"])
+    return dict(instance, vehicles=vehicles)
+
+
+def solve(instance: dict, break_symmetry: bool, initial_routes: list = None, time_limit: int = 60) -> dict:
+    context = SolveContext.create(time_limit_seconds=time_limit, break_symmetry=break_symmetry)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return optimize_routes(
+            instance["depots"], instance["customers"], instance["vehicles"], max_workers=1,
+            initial_routes=initial_routes, context=context
+        )
+
+
+def cost(result: dict) -> float:
+    return round(sum(route["total_cost"] for route in result["routes"]), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instances", nargs="+", default=["uniform-1000", "clustered-1000", "seed-all"])
+    parser.add_argument("--fleet-factor", type=int, default=2, help="Filo çoğaltma katsayısı")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[2, 5, 10, 20], help="Yerel arama süreleri (saniye)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'örnek':16} {'araç':>6} {'mod':>10} " + " ".join(f"{f'{b}s':>11}" for b in args.budgets))
+    for spec in args.instances:
+        instance = fleet_heavy(build_instance(spec, args.seed), args.fleet_factor)
+        plan = plan_of(solve(instance, break_symmetry=False))
+        for label, enabled in (("kısıtsız", False), ("sıralı", True)):
+            costs = [cost(solve(instance, enabled, plan, budget)) for budget in args.budgets]
+            print(f"{spec:16} {len(instance['vehicles']):6} {label:>10} " + " ".join(f"{c:11.0f}" for c in costs))
+
+
+if __name__ == "__main__":
+    main()
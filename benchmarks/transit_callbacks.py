@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Transit değerlendirme benchmark'ı: Python callback closure'ları vs native tamsayı matrisler
+Aynı modeli sabit süreli guided local search ile iki şekilde çözer ve
+saniyede keşfedilen çözüm / branch sayısını karşılaştırır.
+Kullanım: python3 -m benchmarks.transit_callbacks [--customers 200] [--seconds 10]
+"""
+
+import argparse
+import random
+import time
+
+from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+
+from . import RAILWAY_DIR  # noqa: F401  (sys.path ayarı)
+from distance_matrix import haversine_matrix, to_int_lists, travel_time_matrix
+from ortools_optimizer import SERVICE_TIMES, AVERAGE_SPEED_KMH
+
+
+def build_instance(num_customers: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    locations = [(37.0, 35.32)] + [
+        (37.0 + rng.uniform(-0.3, 0.3), 35.32 + rng.uniform(-0.3, 0.3)) for _ in range(num_customers)
+    ]
+    customers = [{"business_type": rng.choice(list(SERVICE_TIMES))} for _ in range(num_customers)]
+    demands = [0] + [rng.randint(1, 8) for _ in range(num_customers)]
+    num_vehicles = max(1, sum(demands) // 25 + 2)
+    return {
+        "distance_matrix": to_int_lists(haversine_matrix(locations)),
+        "customers": customers,
+        "service_times": [0] + [SERVICE_TIMES[c["business_type"]] for c in customers],
+        "demands": demands,
+        "capacities": [32] * num_vehicles,
+    }
+
+
+def solve(instance: dict, native: bool, seconds: int) -> dict:
+    distance_matrix = instance["distance_matrix"]
+    customers = instance["customers"]
+    demands = instance["demands"]
+    manager = pywrapcp.RoutingIndexManager(len(distance_matrix), len(instance["capacities"]), 0)
+    routing = pywrapcp.RoutingModel(manager)
+
+    if native:
+        distance_index = routing.RegisterTransitMatrix(distance_matrix)
+        demand_index = routing.RegisterUnaryTransitVector(demands)
+        time_matrix = to_int_lists(travel_time_matrix(distance_matrix, instance["service_times"], AVERAGE_SPEED_KMH))
+        time_index = routing.RegisterTransitMatrix(time_matrix)
+    else:
+        # Eski implementasyon (_optimize_single_depot closure'ları)
+        def distance_callback(from_index, to_index):
+            from_node = manager.IndexToNode(from_index)
+            to_node = manager.IndexToNode(to_index)
+            return distance_matrix[from_node][to_node]
+
+        def demand_callback(from_index):
+            return demands[manager.IndexToNode(from_index)]
+
+        def time_callback(from_index, to_index):
+            try:
+                from_node = manager.IndexToNode(from_index)
+                to_node = manager.IndexToNode(to_index)
+                distance_km = distance_matrix[from_node][to_node] / 1000.0
+                travel_time_minutes = (distance_km / AVERAGE_SPEED_KMH) * 60.0
+                if to_node == 0:
+                    service_time_minutes = 0
+                else:
+                    business_type = customers[to_node - 1].get("business_type", "default")
+                    service_time_minutes = SERVICE_TIMES.get(business_type, SERVICE_TIMES["default"])
+                return int(travel_time_minutes + service_time_minutes)
+            except Exception as e:
+                print(f"[OR-Tools] ERROR in time_callback: {e}")
+                return 999999
+
+        distance_index = routing.RegisterTransitCallback(distance_callback)
+        demand_index = routing.RegisterUnaryTransitCallback(demand_callback)
+        time_index = routing.RegisterTransitCallback(time_callback)
+
+    routing.SetArcCostEvaluatorOfAllVehicles(distance_index)
+    routing.SetFixedCostOfAllVehicles(10000)
+    routing.AddDimensionWithVehicleCapacity(demand_index, 0, instance["capacities"], True, 'Capacity')
+    routing.AddDimension(time_index, 120, 1440, True, 'Time')
+
+    solutions = [0]
+    routing.AddAtSolutionCallback(lambda: solutions.__setitem__(0, solutions[0] + 1))
+
+    params = pywrapcp.DefaultRoutingSearchParameters()
+    params.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+    params.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+    params.time_limit.seconds = seconds
+
+    start = time.perf_counter()
+    solution = routing.SolveWithParameters(params)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "seconds": elapsed,
+        "solutions": solutions[0],
+        "branches": routing.solver().Branches(),
+        "objective": solution.ObjectiveValue() if solution else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--customers', type=int, default=200)
+    parser.add_argument('--seconds', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    instance = build_instance(args.customers, args.seed)
+    print(f"{args.customers} müşteri, {len(instance['capacities'])} araç, {args.seconds}s GLS")
+    print("=" * 78)
+    print(f"{'Mod':<16} | {'Çözüm':>8} | {'Çözüm/s':>9} | {'Branch/s':>10} | {'Amaç':>12}")
+    print("-" * 78)
+
+    results = {}
+    for label, native in (("Python callback", False), ("Native matris", True)):
+        r = solve(instance, native, args.seconds)
+        results[label] = r
+        print(f"{label:<16} | {r['solutions']:>8} | {r['solutions'] / r['seconds']:>9.1f} | "
+              f"{r['branches'] / r['seconds']:>10.0f} | {r['objective']:>12}")
+
+    print("-" * 78)
+    before, after = results["Python callback"], results["Native matris"]
+    print(f"Çözüm/s hızlanma: {(after['solutions'] / after['seconds']) / max(before['solutions'] / before['seconds'], 1e-9):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Araç tipi kısıtı benchmark'ı: müşterilerin bir kısmına required_vehicle_type atanır ve aynı örnek
+(a) kısıtsız (eski davranış: tipler sadece loglanır), (b) VehicleVar domain'leriyle çözülür.
+İlk çözüm ve aynı modun ilk planından başlayan yerel arama ölçülür: model kurulumu, arama süresi
+(summary.search_seconds), toplam maliyet ve uyumsuz araçla ziyaret edilen durak sayısı.
+Kullanım: python3 -m benchmarks.vehicle_types [--instances uniform-1000 clustered-1000] [--share 0.3]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import time
+
+os.environ['OSRM_URL'] = 'http://127.0.0.1:9'
+os.environ['MATRIX_CACHE_DIR'] = ''
+
+from .instances import build_instance
+from .warm_start import plan_of
+from feasibility import VEHICLE_TYPE_CODES, allowed_vehicle_types
+from ortools_optimizer import optimize_routes
+from solve_context import SolveContext
+
+
+def with_required_types(instance: dict, share: float, seed: int) -> dict:
+    """Müşterilerin share oranına filoda bulunan bir tipi zorunlu kıl"""
+    rng = random.Random(seed)
+    fleet_types = {vehicle["type"] for vehicle in instance["vehicles"]}
+    names = [name for name, code in VEHICLE_TYPE_CODES.items() if code in fleet_types]
+    customers = [
+        dict(customer, required_vehicle_type=rng.choice(names)) if rng.random() < share else customer
+        for customer in instance["customers"]
+    ]
+    return dict(instance, customers=customers)
+
+
+def violations(instance: dict, result: dict) -> int:
+    customer_by_id = {customer["id"]: customer for customer in instance["customers"]}
+    count = 0
+    for route in result["routes"]:
+        for stop in route["stops"]:
+            types = allowed_vehicle_types(customer_by_id[stop["customer_id"]])
+            if types is not None and route["vehicle_type"] not in types:
+                count += 1
+    return count
+
+
+def solve(instance: dict, enforce: bool, initial_routes: list = None, time_limit: int = 60) -> tuple:
+    context = SolveContext.create(time_limit_seconds=time_limit, enforce_vehicle_types=enforce)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimize_routes(
+            instance["depots"], instance["customers"], instance["vehicles"], max_workers=1,
+            initial_routes=initial_routes, context=context
+        )
+    return result, time.perf_counter() - start
+
+
+def cost(result: dict) -> float:
+    return round(sum(route["total_cost"] for route in result["routes"]), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instances", nargs="+", default=["uniform-500", "uniform-1000", "clustered-1000"])
+    parser.add_argument("--share", type=float, default=0.3, help="Araç tipi isteyen müşteri oranı")
+    parser.add_argument("--time-limit", type=int, default=30, help="Yerel arama süre sınırı (saniye)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'örnek':16} {'aşama':12} {'mod':>8} {'model (s)':>10} {'arama (s)':>10} {'duvar (s)':>10} "
+          f"{'maliyet':>12} {'araç':>6} {'ihlal':>6}")
+    for spec in args.instances:
+        instance = with_required_types(build_instance(spec, args.seed), args.share, args.seed)
+        for label, enforce in (("kısıtsız", False), ("domain", True)):
+            first, _ = solve(instance, enforce)
+            for stage, initial_routes in (("ilk çözüm", None), ("yerel arama", plan_of(first))):
+                result, wall = solve(instance, enforce, initial_routes, args.time_limit)
+                summary = result["summary"]
+                print(f"{spec:16} {stage:12} {label:>8} {summary['timings'].get('model', 0):10.2f} "
+                      f"{summary['search_seconds']:10.2f} {wall:10.2f} {cost(result):12.2f} "
+                      f"{summary['total_vehicles_used']:6} {violations(instance, result):6}")
+
+
+if __name__ == "__main__":
+    main()
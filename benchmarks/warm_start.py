@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Warm start benchmark'ı: küçük sipariş değişikliğinden sonra re-optimizasyon
+Önce plan yakınsatılır (ilk çözüm + yerel arama), sonra birkaç müşteri çıkarılıp
+yenileri eklenir ve aynı örnek (a) sıfırdan yerel arama, (b) önceki plandan warm start
+ile çözülür. Süre ve toplam mesafe karşılaştırılır.
+Kullanım: python3 -m benchmarks.warm_start [--instance clustered-200] [--changes 5]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import time
+
+os.environ['OSRM_URL'] = 'http://127.0.0.1:9'
+os.environ['MATRIX_CACHE_DIR'] = ''
+
+from .instances import build_instance, uniform_instance
+from ortools_optimizer import optimize_routes
+
+
+def solve(instance: dict, customers: list, initial_routes: list = None, time_limit: int = 60) -> tuple:
+    start = time.perf_counter()
+    # Optimizer çıktısı bastırılır (müşteri başına log)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = optimize_routes(
+            instance["depots"], customers, instance["vehicles"],
+            max_workers=1, time_limit_seconds=time_limit, initial_routes=initial_routes
+        )
+    return result, time.perf_counter() - start
+
+
+def plan_of(result: dict) -> list:
+    return [
+        {"vehicle_id": route["vehicle_id"], "customer_ids": [stop["customer_id"] for stop in route["stops"]]}
+        for route in result["routes"]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--instance", default="clustered-200")
+    parser.add_argument("--changes", type=int, default=5, help="Çıkarılan ve eklenen müşteri sayısı")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    instance = build_instance(args.instance, args.seed)
+    customers = instance["customers"]
+
+    # Yakınsamış plan: ilk çözümden warm start = ilk çözüm + yerel arama optimumu
+    first, _ = solve(instance, customers)
+    converged, converge_time = solve(instance, customers, plan_of(first))
+    print(f"Yakınsamış plan: {converged['summary']['total_distance_km']} km, "
+          f"{converged['summary']['total_vehicles_used']} araç ({converge_time:.2f}s yerel arama)")
+
+    # Küçük düzenleme: birkaç sipariş iptal, birkaç yeni sipariş
+    removed = set(c["id"] for c in rng.sample(customers, args.changes))
+    extra = uniform_instance(args.changes, seed=args.seed + 1)["customers"]
+    for index, customer in enumerate(extra):
+        customer.update(id=f"new-{index}", depot_id=instance["depots"][0]["id"])
+    edited = [c for c in customers if c["id"] not in removed] + extra
+
+    # Sıfırdan: ilk çözüm + aynı yerel arama
+    cold_first, first_time = solve(instance, edited)
+    cold, search_time = solve(instance, edited, plan_of(cold_first))
+    cold_time = first_time + search_time
+    warm, warm_time = solve(instance, edited, plan_of(converged))
+
+    print(f"{'':12} {'süre (s)':>10} {'mesafe (km)':>12} {'araç':>6}")
+    print(f"{'sıfırdan':12} {cold_time:10.2f} {cold['summary']['total_distance_km']:12.2f} {cold['summary']['total_vehicles_used']:6}")
+    print(f"{'warm start':12} {warm_time:10.2f} {warm['summary']['total_distance_km']:12.2f} {warm['summary']['total_vehicles_used']:6}")
+    print(f"Warm start: {warm['summary']['warm_start']}")
+    print(f"Hızlanma: {cold_time / warm_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
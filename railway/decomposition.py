@@ -0,0 +1,91 @@
+import math
+from typing import List
+
+# Büyük tek depolu örnekler için coğrafi ayrıştırma (sweep / açısal kümeleme)
+# Müşteriler depo etrafındaki açıya göre sıralanır, talebe göre dengeli ardışık dilimlere bölünür;
+# her dilim ayrı bir alt problem olarak çözülür, komşu dilim sınırları sonradan onarılır.
+
+
+def _angle(depot: dict, customer: dict) -> float:
+    """Depodan müşteriye pusula açısı (radyan, [0, 2π)); boylam enlem ölçeğine düzeltilir"""
+    d_lat = customer["location"]["lat"] - depot["location"]["lat"]
+    d_lng = (customer["location"]["lng"] - depot["location"]["lng"]) * math.cos(math.radians(depot["location"]["lat"]))
+    return math.atan2(d_lat, d_lng) % (2 * math.pi)
+
+
+def sweep_clusters(depot: dict, customers: list, num_clusters: int) -> List[list]:
+    """
+    Müşterileri depo etrafında açısal ardışık num_clusters dilime böl (talebe göre dengeli).
+    Tarama en geniş boş açıdan başlar, böylece kesimler yoğun bölgelerin ortasına düşmez.
+    Returns: dilim listesi (saat yönünün tersine sıralı; i ve i+1 komşudur, son dilim ilkine komşudur)
+    """
+    if num_clusters <= 1 or len(customers) <= num_clusters:
+        return [list(customers)]
+
+    ordered = sorted(customers, key=lambda c: _angle(depot, c))
+    angles = [_angle(depot, c) for c in ordered]
+    gaps = [(angles[(i + 1) % len(angles)] - angles[i]) % (2 * math.pi) for i in range(len(angles))]
+    start = (max(range(len(gaps)), key=gaps.__getitem__) + 1) % len(ordered)
+    ordered = ordered[start:] + ordered[:start]
+
+    total_demand = sum(c.get("demand_pallets", 1) for c in ordered) or 1
+    clusters = [[] for _ in range(num_clusters)]
+    cumulative = 0
+    for customer in ordered:
+        # Dilimi, müşterinin talep aralığının ortası belirler
+        demand = customer.get("demand_pallets", 1)
+        index = min(int((cumulative + demand / 2) * num_clusters / total_demand), num_clusters - 1)
+        clusters[index].append(customer)
+        cumulative += demand
+    return [cluster for cluster in clusters if cluster]
+
+
+def split_fleet(clusters: List[list], vehicles: list) -> List[list]:
+    """
+    Araçları dilimlere talep payına göre dağıt: büyükten küçüğe her araç,
+    kapasite açığı (talep payı - atanmış kapasite) en büyük dilime verilir.
+    """
+    demands = [sum(c.get("demand_pallets", 1) for c in cluster) for cluster in clusters]
+    total_demand = sum(demands) or 1
+    total_capacity = sum(v.get("capacity_pallets", 26) for v in vehicles)
+    targets = [total_capacity * demand / total_demand for demand in demands]
+
+    owners = {}
+    assigned = [0.0] * len(clusters)
+    for position in sorted(range(len(vehicles)), key=lambda i: -vehicles[i].get("capacity_pallets", 26)):
+        index = max(range(len(clusters)), key=lambda i: targets[i] - assigned[i])
+        owners[position] = index
+        assigned[index] += vehicles[position].get("capacity_pallets", 26)
+
+    # Dilim filoları girdideki araç sırasını korur (ilk çözüm araçları sırayla kullanır)
+    fleets = [[] for _ in clusters]
+    for position, vehicle in enumerate(vehicles):
+        fleets[owners[position]].append(vehicle)
+    return fleets
+
+
+def boundary_routes(depot: dict, routes: List[dict], boundary_angle: float, count: int) -> List[dict]:
+    """Ağırlık merkezi açısı sınır açısına en yakın count rota (sınır onarımına girecek rotalar)"""
+    def distance_to_boundary(route):
+        stops = route["stops"]
+        centroid = {
+            "location": {
+                "lat": sum(s["location"]["lat"] for s in stops) / len(stops),
+                "lng": sum(s["location"]["lng"] for s in stops) / len(stops),
+            }
+        }
+        delta = abs(_angle(depot, centroid) - boundary_angle) % (2 * math.pi)
+        return min(delta, 2 * math.pi - delta)
+
+    return sorted((r for r in routes if r["stops"]), key=distance_to_boundary)[:count]
+
+
+def cluster_boundaries(depot: dict, clusters: List[list]) -> List[float]:
+    """Dilim i ile i+1 arasındaki sınır açısı (dilim i'nin son müşterisi ile i+1'in ilki arası)"""
+    boundaries = []
+    for i, cluster in enumerate(clusters):
+        following = clusters[(i + 1) % len(clusters)]
+        last, first = _angle(depot, cluster[-1]), _angle(depot, following[0])
+        gap = (first - last) % (2 * math.pi)
+        boundaries.append((last + gap / 2) % (2 * math.pi))
+    return boundaries
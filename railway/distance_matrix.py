@@ -0,0 +1,77 @@
+import numpy as np
+from typing import List, Sequence
+
+# Vektörize haversine mesafe matrisi (NumPy broadcasting)
+EARTH_RADIUS_KM = 6371.0
+
+# 20,000 km üzeri mesafeler hatalı koordinat demektir
+MAX_DISTANCE_M = 20_000_000
+
+
+def haversine_matrix(
+    origins: Sequence[Sequence[float]],
+    destinations: Sequence[Sequence[float]] = None,
+    min_distance_m: int = 0,
+    max_distance_m: int = MAX_DISTANCE_M,
+) -> np.ndarray:
+    """
+    (lat, lng) listeleri arasında haversine mesafe matrisi hesapla.
+    Returns: int32 mesafe matrisi (metre cinsinden), shape (len(origins), len(destinations))
+
+    destinations verilmezse kare matris üretilir ve köşegen 0 yapılır.
+    Köşegen dışı değerler [min_distance_m, max_distance_m] aralığına sıkıştırılır.
+    """
+    square = destinations is None
+    src = np.radians(np.asarray(origins, dtype=np.float64).reshape(-1, 2))
+    dst = src if square else np.radians(np.asarray(destinations, dtype=np.float64).reshape(-1, 2))
+
+    lat1 = src[:, 0, np.newaxis]
+    lon1 = src[:, 1, np.newaxis]
+    lat2 = dst[np.newaxis, :, 0]
+    lon2 = dst[np.newaxis, :, 1]
+
+    a = np.sin((lat2 - lat1) / 2.0) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2.0) ** 2
+    # Yuvarlama hatası a'yı 1'in biraz üstüne taşıyabilir (antipodal noktalar)
+    np.clip(a, 0.0, 1.0, out=a)
+    meters = 2.0 * EARTH_RADIUS_KM * 1000.0 * np.arcsin(np.sqrt(a))
+
+    np.clip(meters, min_distance_m, max_distance_m, out=meters)
+    matrix = meters.astype(np.int32)
+
+    if square:
+        np.fill_diagonal(matrix, 0)
+
+    return matrix
+
+
+def clamp_matrix(matrix, max_distance_m: int = MAX_DISTANCE_M) -> np.ndarray:
+    """Dış kaynaklı (OSRM) matrisi int32'ye çevir: negatifleri 0'a, aşırı değerleri üst sınıra sıkıştır"""
+    values = np.asarray(matrix, dtype=np.float64)
+    # OSRM ulaşılamayan çiftler için null döndürür -> üst sınır
+    values = np.nan_to_num(values, nan=max_distance_m)
+    np.clip(values, 0, max_distance_m, out=values)
+    return values.astype(np.int32)
+
+
+def to_int_lists(matrix: np.ndarray) -> List[List[int]]:
+    """OR-Tools callback'leri için native Python int listesine çevir"""
+    return np.asarray(matrix).tolist()
+
+
+def duration_time_matrix(durations_seconds, service_times: Sequence[int]) -> np.ndarray:
+    """
+    Yol seyahat süresi (saniye) + varış noktasındaki servis süresi matrisi (dakika, int64).
+    time[i][j] = int(süre(i, j) / 60 + servis[j])
+    """
+    minutes = np.asarray(durations_seconds, dtype=np.float64) / 60.0 + np.asarray(service_times, dtype=np.float64)[np.newaxis, :]
+    return minutes.astype(np.int64)
+
+
+def travel_time_matrix(distance_matrix, service_times: Sequence[int], speed_kmh: float = 60.0) -> np.ndarray:
+    """
+    Seyahat + varış noktasındaki servis süresi matrisi (dakika, int64).
+    time[i][j] = int(mesafe_km(i, j) / hız * 60 + servis[j])
+    """
+    distances_km = np.asarray(distance_matrix, dtype=np.float64) / 1000.0
+    minutes = distances_km / speed_kmh * 60.0 + np.asarray(service_times, dtype=np.float64)[np.newaxis, :]
+    return minutes.astype(np.int64)
@@ -0,0 +1,149 @@
+import numpy as np
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from distance_matrix import haversine_matrix
+from matrix_cache import get_matrix_cache, matrix_cache_key
+from matrix_store import get_matrix_store
+from osrm_table import DEFAULT_TIMEOUT_SECONDS, fetch_osrm_table, fetch_osrm_table_rect
+
+# Mesafe kaynakları (metre, int32 matris): önceden hesaplanmış depo, OSRM matris cache'i,
+# OSRM Table API ve haversine. DistanceChain kaynakları sırayla dener; isteği tam karşılayan
+# ilk kaynağın sonucu kullanılır (tek istekte karışık metrik olmaz).
+
+T = TypeVar('T')
+
+
+class DistanceProvider:
+    """
+    Mesafe kaynağı arayüzü. table() karşılayamadığı isteklerde exception fırlatır
+    (ağ hatası, depoda olmayan id, cache miss); zincir bir sonraki kaynağa geçer.
+    """
+    name = "provider"
+
+    def table(self, sources: Sequence[tuple], destinations: Sequence[tuple] = None,
+              source_ids: Sequence[str] = None, destination_ids: Sequence[str] = None) -> np.ndarray:
+        """
+        (lat, lng) kaynak x hedef mesafe matrisi; destinations verilmezse kare matris.
+        *_ids: noktaların kalıcı id'leri (depo / müşteri), id ile çalışan kaynaklar için
+        """
+        raise NotImplementedError
+
+
+class HaversineProvider(DistanceProvider):
+    """Vektörize kuş uçuşu mesafe (ağ yok, her zaman karşılar)"""
+    name = "haversine"
+
+    def table(self, sources, destinations=None, source_ids=None, destination_ids=None) -> np.ndarray:
+        return haversine_matrix(sources, destinations)
+
+
+class OsrmProvider(DistanceProvider):
+    """
+    OSRM Table API (karolu, paralel); cache=True ise kare matrisler kalıcı matris cache'ine yazılır.
+    timeout: karo isteği başına süre (deadline bütçesinden; aşılırsa zincir haversine'e düşer)
+    """
+    name = "osrm"
+
+    def __init__(self, osrm_url: str, profile: str = 'driving', cache: bool = True,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        self.osrm_url = osrm_url
+        self.profile = profile
+        self.cache = cache
+        self.timeout = timeout
+
+    def table(self, sources, destinations=None, source_ids=None, destination_ids=None) -> np.ndarray:
+        if destinations is not None:
+            return fetch_osrm_table_rect(sources, destinations, self.osrm_url, self.profile, timeout=self.timeout)
+        matrix = fetch_osrm_table(sources, self.osrm_url, self.profile, timeout=self.timeout)
+        cache = get_matrix_cache() if self.cache else None
+        if cache:
+            cache.put(matrix_cache_key(sources, self.osrm_url, self.profile), matrix)
+        return matrix
+
+
+class MatrixCacheProvider(DistanceProvider):
+    """Daha önce OSRM'den çekilmiş kare matrisler (koordinat seti + router anahtarlı disk cache'i)"""
+    name = "cache"
+
+    def __init__(self, osrm_url: str, profile: str = 'driving'):
+        self.osrm_url = osrm_url
+        self.profile = profile
+
+    def table(self, sources, destinations=None, source_ids=None, destination_ids=None) -> np.ndarray:
+        cache = get_matrix_cache()
+        if cache is None or destinations is not None:
+            raise LookupError("matrix cache not applicable")
+        cached = cache.get(matrix_cache_key(sources, self.osrm_url, self.profile))
+        if cached is None or cached.shape != (len(sources), len(sources)):
+            raise LookupError("matrix cache miss")
+        return cached
+
+
+class MatrixStoreProvider(DistanceProvider):
+    """Önceden hesaplanmış, mmap'lenmiş depo (matrix_store); noktalar id ile aranır"""
+    name = "store"
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+
+    def table(self, sources, destinations=None, source_ids=None, destination_ids=None) -> np.ndarray:
+        store = get_matrix_store(self.store_dir)
+        if store is None:
+            raise LookupError(f"distance store not available: {self.store_dir}")
+        if source_ids is None or (destinations is not None and destination_ids is None):
+            raise LookupError("location ids required")
+        return store.table(source_ids, destination_ids)
+
+    def durations(self, location_ids: Sequence[str]) -> np.ndarray:
+        """Kare yol seyahat süresi matrisi (saniye); depoda süre yoksa / id eksikse exception"""
+        store = get_matrix_store(self.store_dir)
+        if store is None:
+            raise LookupError(f"distance store not available: {self.store_dir}")
+        return store.table(location_ids, kind='durations')
+
+
+class DistanceChain:
+    """Sıralı kaynak listesi: ilk başarılı kaynak kullanılır, hatalar loglanıp atlanır"""
+
+    def __init__(self, providers: List[DistanceProvider], log_prefix: str = "[OR-Tools]"):
+        self.providers = providers
+        self.log_prefix = log_prefix
+
+    def first(self, call: Callable[[DistanceProvider], T]) -> Tuple[T, str]:
+        """
+        call(provider) sonucunu döndüren ilk kaynak.
+        Returns: (sonuç, kaynak adı)
+        """
+        last_error = None
+        for provider in self.providers:
+            if isinstance(provider, OsrmProvider):
+                print(f"{self.log_prefix} OSRM Table API çağrılıyor: {provider.osrm_url}")
+            try:
+                return call(provider), provider.name
+            except Exception as e:
+                last_error = e
+                # Depo / cache isabetsizliği normal akış; ağ hataları görünür olsun
+                if isinstance(provider, OsrmProvider):
+                    print(f"{self.log_prefix} ✗ OSRM Table API hatası: {str(e)[:200]}")
+        raise last_error or LookupError("no distance providers")
+
+    def matrix(self, locations: Sequence[tuple], location_ids: Sequence[str] = None) -> Tuple[np.ndarray, str]:
+        """Kare mesafe matrisi. Returns: (int32 matris (metre), kaynak adı)"""
+        return self.first(lambda provider: provider.table(locations, source_ids=location_ids))
+
+
+def distance_chain(osrm_url: str, matrix_store_dir: Optional[str] = None, log_prefix: str = "[OR-Tools]",
+                   cache: bool = True, timeout: Optional[float] = None) -> DistanceChain:
+    """
+    Varsayılan sıra: depo (varsa) -> matris cache'i -> OSRM -> haversine
+    cache=False: matris cache'i okunmaz/yazılmaz (ör. /insert'in tek seferlik küçük blokları)
+    timeout: OSRM istek süresi (varsayılan DEFAULT_TIMEOUT_SECONDS, bunu aşmaz)
+    """
+    providers = []
+    if matrix_store_dir:
+        providers.append(MatrixStoreProvider(matrix_store_dir))
+    if cache:
+        providers.append(MatrixCacheProvider(osrm_url))
+    osrm_timeout = DEFAULT_TIMEOUT_SECONDS if timeout is None else min(timeout, DEFAULT_TIMEOUT_SECONDS)
+    providers.extend([OsrmProvider(osrm_url, cache=cache, timeout=osrm_timeout), HaversineProvider()])
+    return DistanceChain(providers, log_prefix)
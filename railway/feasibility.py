@@ -0,0 +1,213 @@
+import numpy as np
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from distance_matrix import haversine_matrix
+
+# Çözüm öncesi uygulanabilirlik analizi: solver başlatılmadan (milisaniyeler içinde) kesin
+# uygulanamaz durumlar tespit edilir, yapılandırılmış teşhislerle raporlanır.
+# Her teşhis: {"code", "severity" ("error" | "warning"), "depot_id", "message", ...}
+
+# Kuş uçuşu alt sınırında yol ağına yapışma (snapping) payı: OSRM mesafesi haversine'in
+# biraz altında kalabilir, alt sınır bu oranla küçültülür (yanlış pozitif olmasın)
+LOWER_BOUND_FACTOR = 0.98
+
+# required_vehicle_type adı -> VEHICLE_TYPES kodu
+VEHICLE_TYPE_CODES = {
+    "kamyonet": 0,
+    "kamyon_1": 1,
+    "kamyon_2": 2,
+    "tir": 3,
+    "romork": 4
+}
+
+
+class InfeasibleProblemError(ValueError):
+    """Solver başlatılmadan tespit edilen uygulanamazlık; diagnostics = teşhis listesi"""
+    def __init__(self, message: str, diagnostics: List[dict]):
+        super().__init__(message, diagnostics)
+        self.message = message
+        self.diagnostics = diagnostics
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def allowed_vehicle_types(customer: dict) -> Optional[FrozenSet[int]]:
+    """
+    Müşterinin kabul ettiği araç tipi kodları; kısıt yoksa None.
+    required_vehicle_types (kod listesi) önceliklidir; bilinmeyen required_vehicle_type adı boş küme verir.
+    """
+    codes = customer.get("required_vehicle_types")
+    if codes:
+        return frozenset(codes)
+    name = customer.get("required_vehicle_type")
+    if name:
+        code = VEHICLE_TYPE_CODES.get(name.strip().lower())
+        return frozenset() if code is None else frozenset([code])
+    return None
+
+
+def vehicle_type_domains(customers: list, vehicles: list) -> Tuple[List[Optional[FrozenSet[int]]], List[Optional[FrozenSet[int]]]]:
+    """
+    Uyumluluk indeksi: araçlar tipe göre bir kez gruplanır, aynı tip kümesini isteyen müşteriler
+    aynı araç kümesini paylaşır.
+    Returns: (domains, fallbacks) - müşteri başına
+      domains[i]: izin verilen araç indeksleri (VehicleVar domain'i) ya da None
+      fallbacks[i]: kesin kısıt uygulanamayan müşterinin istediği tipler (uyumlu araç yok, sipariş
+      uyumlu araçlara sığmıyor ya da tip kümesinin toplam kapasitesi yetmiyor) - ceza ile çözülür
+    """
+    vehicles_by_type: Dict[int, List[int]] = defaultdict(list)
+    capacity_by_type: Dict[int, int] = defaultdict(int)
+    max_capacity_by_type: Dict[int, int] = defaultdict(int)
+    for index, vehicle in enumerate(vehicles):
+        capacity = vehicle.get("capacity_pallets", 26)
+        vehicles_by_type[vehicle["type"]].append(index)
+        capacity_by_type[vehicle["type"]] += capacity
+        max_capacity_by_type[vehicle["type"]] = max(max_capacity_by_type[vehicle["type"]], capacity)
+
+    customer_types = [allowed_vehicle_types(customer) for customer in customers]
+    demand_by_types: Dict[FrozenSet[int], int] = defaultdict(int)
+    for customer, types in zip(customers, customer_types):
+        if types is not None:
+            demand_by_types[types] += customer.get("demand_pallets", 0)
+
+    vehicle_sets: Dict[FrozenSet[int], Optional[FrozenSet[int]]] = {}
+    for types, demand in demand_by_types.items():
+        compatible = [t for t in types if t in vehicles_by_type]
+        if compatible and sum(capacity_by_type[t] for t in compatible) >= demand:
+            vehicle_sets[types] = frozenset(i for t in compatible for i in vehicles_by_type[t])
+        else:
+            vehicle_sets[types] = None
+
+    domains, fallbacks = [], []
+    for customer, types in zip(customers, customer_types):
+        allowed = vehicle_sets.get(types) if types is not None else None
+        if allowed is not None and customer.get("demand_pallets", 0) > max(max_capacity_by_type[t] for t in types if t in vehicles_by_type):
+            allowed = None
+        domains.append(allowed)
+        fallbacks.append(types if types is not None and allowed is None else None)
+    return domains, fallbacks
+
+
+def check_fleet(depot: dict, customers: list, vehicles: list, enforce_vehicle_types: bool = True) -> List[dict]:
+    """
+    Filo teşhisleri (matris gerekmez): toplam kapasite, tek siparişin uygun araçlara sığmaması,
+    eşleşen aracı olmayan / bilinmeyen araç tipi ve tip kümesi başına toplam kapasite.
+    enforce_vehicle_types=False: tip teşhisleri uyarıdır ve sipariş boyutu tüm filoya göre kontrol edilir.
+    """
+    diagnostics = []
+    depot_id = depot["id"]
+    type_severity = "error" if enforce_vehicle_types else "warning"
+
+    def add(code: str, severity: str, message: str, **details):
+        diagnostics.append({"code": code, "severity": severity, "depot_id": depot_id, "message": message, **details})
+
+    capacity_by_type: Dict[int, int] = defaultdict(int)
+    max_capacity_by_type: Dict[int, int] = defaultdict(int)
+    for vehicle in vehicles:
+        capacity = vehicle.get("capacity_pallets", 26)
+        capacity_by_type[vehicle["type"]] += capacity
+        max_capacity_by_type[vehicle["type"]] = max(max_capacity_by_type[vehicle["type"]], capacity)
+    max_capacity = max(max_capacity_by_type.values(), default=0)
+
+    total_demand = sum(c.get("demand_pallets", 0) for c in customers)
+    total_capacity = sum(capacity_by_type.values())
+    if total_demand > total_capacity:
+        add("total_capacity_exceeded", "error",
+            f"Depot {depot_id}: demand {total_demand} pallets exceeds fleet capacity {total_capacity}",
+            demand=total_demand, capacity=total_capacity)
+
+    demand_by_types: Dict[FrozenSet[int], int] = defaultdict(int)
+    customers_by_types: Dict[FrozenSet[int], int] = defaultdict(int)
+    for customer in customers:
+        demand = customer.get("demand_pallets", 0)
+        types = allowed_vehicle_types(customer)
+        if types is not None:
+            demand_by_types[types] += demand
+            customers_by_types[types] += 1
+
+        if types is not None and not types:
+            add("unknown_vehicle_type", type_severity,
+                f"Customer {customer['id']}: unknown required_vehicle_type {customer.get('required_vehicle_type')!r}",
+                customer_id=customer["id"])
+            types = None  # sipariş boyutu aşağıda tüm filoya göre kontrol edilir
+        elif types is not None and not types.intersection(capacity_by_type):
+            add("no_matching_vehicle", type_severity,
+                f"Customer {customer['id']}: no vehicle of type {sorted(types)} in depot fleet",
+                customer_id=customer["id"], vehicle_types=sorted(types))
+            types = None
+
+        if types is not None and enforce_vehicle_types:
+            largest = max(max_capacity_by_type.get(t, 0) for t in types)
+            if demand > largest:
+                add("order_exceeds_vehicle_capacity", "error",
+                    f"Customer {customer['id']}: order of {demand} pallets exceeds largest compatible vehicle ({largest})",
+                    customer_id=customer["id"], demand=demand, capacity=largest, vehicle_types=sorted(types))
+        elif demand > max_capacity:
+            add("order_exceeds_vehicle_capacity", "error",
+                f"Customer {customer['id']}: order of {demand} pallets exceeds largest vehicle ({max_capacity})",
+                customer_id=customer["id"], demand=demand, capacity=max_capacity)
+
+    for types, demand in demand_by_types.items():
+        capacity = sum(capacity_by_type.get(t, 0) for t in types)
+        if types and 0 < capacity < demand:
+            add("type_capacity_exceeded", type_severity,
+                f"Depot {depot_id}: {customers_by_types[types]} customers restricted to types {sorted(types)} "
+                f"need {demand} pallets, those vehicles carry {capacity}",
+                vehicle_types=sorted(types), demand=demand, capacity=capacity)
+    return diagnostics
+
+
+def check_reachability(depot: dict, customers: list, time_from_depot: Sequence[float], time_to_depot: Sequence[float],
+                       max_route_minutes: int, lower_bound: bool = False) -> List[dict]:
+    """
+    Depodan gidiş + servis + dönüş süresi rota ufkunu (max_route_minutes) aşan müşteriler.
+    time_from_depot[i]: depo -> müşteri i (varıştaki servis dahil), time_to_depot[i]: müşteri i -> depo.
+    lower_bound: süreler kuş uçuşu alt sınırdan hesaplandı (gerçek süre daha uzun olabilir)
+    """
+    round_trip = np.asarray(time_from_depot, dtype=np.float64) + np.asarray(time_to_depot, dtype=np.float64)
+    diagnostics = []
+    for i in np.flatnonzero(round_trip > max_route_minutes):
+        customer = customers[i]
+        bound = "at least " if lower_bound else ""
+        diagnostics.append({
+            "code": "unreachable_customer",
+            "severity": "error",
+            "depot_id": depot["id"],
+            "customer_id": customer["id"],
+            "round_trip_minutes": int(round_trip[i]),
+            "max_route_minutes": max_route_minutes,
+            "message": f"Customer {customer['id']}: depot round trip takes {bound}{int(round_trip[i])} min, "
+                       f"route limit is {max_route_minutes} min",
+        })
+    return diagnostics
+
+
+def haversine_reachability(depot: dict, customers: list, service_times: Sequence[int], speed_kmh: float,
+                           max_route_minutes: int) -> List[dict]:
+    """
+    Kuş uçuşu mesafe yol mesafesinin alt sınırıdır: ortalama hız modelinde buradan çıkan
+    ulaşılamazlık kesindir (matris çekilmeden önce). Yay süreleri Time matrisindeki gibi
+    tam dakikaya aşağı yuvarlanır.
+    """
+    if not customers:
+        return []
+    depot_location = [(depot["location"]["lat"], depot["location"]["lng"])]
+    customer_locations = [(c["location"]["lat"], c["location"]["lng"]) for c in customers]
+    meters = haversine_matrix(depot_location, customer_locations)[0] * LOWER_BOUND_FACTOR
+    minutes = meters / 1000.0 / speed_kmh * 60.0
+    return check_reachability(
+        depot, customers, np.floor(minutes + np.asarray(service_times, dtype=np.float64)), np.floor(minutes),
+        max_route_minutes, lower_bound=True
+    )
+
+
+def raise_if_infeasible(diagnostics: List[dict]) -> List[dict]:
+    """Hata teşhisi varsa InfeasibleProblemError; yoksa uyarıları döndür"""
+    errors = [d for d in diagnostics if d["severity"] == "error"]
+    if errors:
+        shown = "; ".join(d["message"] for d in errors[:5])
+        more = f" (+{len(errors) - 5} more)" if len(errors) > 5 else ""
+        raise InfeasibleProblemError(f"Infeasible problem: {shown}{more}", diagnostics)
+    return diagnostics
@@ -0,0 +1,107 @@
+import math
+import numpy as np
+from typing import Container, Dict, List, Optional, Sequence
+
+# Model kurulmadan önce filo ön boyutlandırma: depoya ayrılan araçların hepsi yerine paletleri
+# taşıyabilen, araç tipi kısıtlarına uyan ve süre kısıtından tahmin edilen rota sayısına yeten
+# yaklaşık en küçük alt küme (+ pay) modele verilir. Boşta kalacak araçlar modeli ve aramayı şişirmez.
+
+# Tahminin üstüne eklenen pay: araç sayısının FLEET_HEADROOM oranı, en az FLEET_SPARE araç
+FLEET_HEADROOM = 0.1
+FLEET_SPARE = 2
+
+# Süre tahmininde en ucuz gelen yay sütun blokları halinde aranır (maskeli kopya bu kadar sütunluk)
+MIN_INCOMING_BLOCK = 512
+
+
+def estimated_route_count(time_matrix: np.ndarray, max_route_time: int) -> Optional[int]:
+    """
+    Süre kısıtının gerektirdiği tahmini rota sayısı: müşteri başına en ucuz gelen yay (servis süresi dahil)
+    toplamı, rota başına depo gidiş-dönüşünün ortalaması düşülmüş süre sınırına bölünür.
+    Köşegen (kendine yay) sütun bloklarının maskeli kopyasında hariç tutulur: matris yazılmaz (salt okunur /
+    mmap'li depo matrisleri, paylaşılan diziler), bellek N x MIN_INCOMING_BLOCK ile sınırlı kalır.
+    Returns: rota sayısı; ortalama gidiş-dönüş sınırı aşıyorsa None (tahmin yapılamaz)
+    """
+    times = np.asarray(time_matrix)
+    size = len(times)
+    if size <= 1:
+        return 0
+    incoming = 0.0
+    for start in range(1, size, MIN_INCOMING_BLOCK):
+        stop = min(start + MIN_INCOMING_BLOCK, size)
+        block = times[:, start:stop].astype(np.float64)
+        columns = np.arange(stop - start)
+        block[start + columns, columns] = np.inf
+        incoming += block.min(axis=0).sum()
+    available = max_route_time - 2 * float(times[1:, 0].mean())
+    if available <= 0:
+        return None
+    return math.ceil(incoming / available)
+
+
+def presize_fleet(demands: Sequence[int], capacities: Sequence[int], time_matrix: np.ndarray, max_route_time: int,
+                  allowed_vehicles: Sequence[Optional[Container[int]]] = None, keep: Sequence[int] = (),
+                  headroom: float = FLEET_HEADROOM, spare: int = FLEET_SPARE) -> Optional[List[int]]:
+    """
+    Modele verilecek araç indeksleri (filo sırasıyla).
+    Paletler best-fit decreasing ile kutulanır: tip kısıtlı (domain'i dar) müşteriler önce, sığmayan
+    müşteri için domain'indeki en büyük kapasiteli kullanılmayan araç açılır. Araç sayısı en az
+    estimated_route_count'tur; üstüne pay eklenir (önce her domain'e bir yedek,
+    sonra en büyük kapasiteliler). keep: her durumda dahil edilen araçlar (warm start planındakiler).
+    allowed_vehicles[node]: düğümün izinli araç indeksleri (None = hepsi)
+    Returns: araç indeksleri; kutulama / süre tahmini başarısızsa ya da alt küme tüm filoysa None
+    """
+    num_vehicles = len(capacities)
+    caps = np.asarray(capacities, dtype=np.int64)
+    allowed = allowed_vehicles if allowed_vehicles is not None else [None] * len(demands)
+    by_capacity = np.argsort(-caps, kind='stable')
+    opened = np.zeros(num_vehicles, dtype=bool)
+    remaining = np.zeros(num_vehicles, dtype=np.int64)
+    for vehicle in keep:
+        opened[vehicle] = True
+        remaining[vehicle] = caps[vehicle]
+
+    domain_masks: Dict[Container[int], np.ndarray] = {}
+
+    def mask_of(domain: Optional[Container[int]]) -> np.ndarray:
+        if domain is None:
+            return np.ones(num_vehicles, dtype=bool)
+        if domain not in domain_masks:
+            mask = np.zeros(num_vehicles, dtype=bool)
+            mask[list(domain)] = True
+            domain_masks[domain] = mask
+        return domain_masks[domain]
+
+    nodes = sorted(
+        range(1, len(demands)),
+        key=lambda n: (len(allowed[n]) if allowed[n] is not None else num_vehicles + 1, -demands[n])
+    )
+    for node in nodes:
+        demand = demands[node]
+        mask = mask_of(allowed[node])
+        fits = np.flatnonzero(opened & mask & (remaining >= demand))
+        if len(fits):
+            vehicle = fits[np.argmin(remaining[fits])]
+        else:
+            closed = by_capacity[(~opened & mask & (caps >= demand))[by_capacity]]
+            if not len(closed):
+                return None
+            vehicle = closed[0]
+            opened[vehicle] = True
+            remaining[vehicle] = caps[vehicle]
+        remaining[vehicle] -= demand
+
+    routes_for_time = estimated_route_count(time_matrix, max_route_time)
+    if routes_for_time is None:
+        return None
+    needed = max(int(opened.sum()), routes_for_time)
+    target = needed + max(spare, math.ceil(needed * headroom))
+    if target >= num_vehicles:
+        return None
+    for mask in domain_masks.values():
+        closed = by_capacity[(~opened & mask)[by_capacity]]
+        if len(closed):
+            opened[closed[0]] = True
+    closed = by_capacity[~opened[by_capacity]]
+    opened[closed[:max(0, target - int(opened.sum()))]] = True
+    return np.flatnonzero(opened).tolist()
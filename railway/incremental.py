@@ -0,0 +1,233 @@
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+
+from distance_matrix import travel_time_matrix
+from distance_providers import DistanceChain, DistanceProvider, OsrmProvider, distance_chain
+from metrics import OSRM_FALLBACKS
+from feasibility import vehicle_type_domains
+from insertion import insert_cheapest, route_time
+from osrm_table import DEFAULT_MAX_CONCURRENCY
+from ortools_optimizer import business_service_time
+from solve_context import AVERAGE_SPEED_KMH, MAX_ROUTE_MINUTES, VEHICLE_FIXED_COST, default_matrix_store_dir, default_osrm_url
+
+# Gün içi yeni sipariş: mevcut (onaylı) plana tam matris / model kurmadan en ucuz uygun ekleme
+# Sadece gereken yaylar hesaplanır: rota içi bloklar (mevcut yaylar) + yeni noktaların satır/sütunları
+
+
+def _location(entity: dict) -> tuple:
+    return (entity["location"]["lat"], entity["location"]["lng"])
+
+
+def _fetch_blocks(points: List[tuple], point_ids: List[str], blocks: list, chain: DistanceChain) -> tuple:
+    """
+    Her (kaynak düğümler, hedef düğümler) bloğu için mesafe matrisi (metre).
+    Tüm bloklar aynı kaynaktan alınır: bir blok bile alınamazsa zincirdeki sonraki kaynağa
+    (en sonda haversine) geçilir (karışık metrik olmasın).
+    """
+    def fetch_all(provider: DistanceProvider) -> list:
+        def fetch(block):
+            sources, destinations = block
+            if sources is destinations:
+                return provider.table([points[i] for i in sources], source_ids=[point_ids[i] for i in sources])
+            return provider.table(
+                [points[i] for i in sources], [points[j] for j in destinations],
+                [point_ids[i] for i in sources], [point_ids[j] for j in destinations]
+            )
+
+        if isinstance(provider, OsrmProvider):
+            with ThreadPoolExecutor(max_workers=DEFAULT_MAX_CONCURRENCY) as executor:
+                return list(executor.map(fetch, blocks))
+        return [fetch(block) for block in blocks]
+
+    matrices, source = chain.first(fetch_all)
+    if source == "haversine":
+        OSRM_FALLBACKS.labels("insert").inc()
+        print(f"[Insert] → Fallback: Haversine (kuş uçuşu) mesafe kullanılıyor")
+    return matrices, source
+
+
+def _route_distance(route: List[int], depot: int, distance) -> int:
+    total = 0
+    previous = depot
+    for node in route:
+        total += distance[previous][node]
+        previous = node
+    return total + distance[previous][depot]
+
+
+def _reoptimize_route(route: List[int], depot: int, distance, travel_time, time_limit_ms: int) -> List[int]:
+    """Tek rotanın durak sırasını mevcut sıradan başlayarak kısa GLS ile iyileştir (TSP + süre sınırı)"""
+    nodes = [depot] + route
+    size = len(nodes)
+    distance_matrix = [[distance[i][j] if i != j else 0 for j in nodes] for i in nodes]
+    time_matrix = [[travel_time[i][j] if i != j else 0 for j in nodes] for i in nodes]
+
+    manager = pywrapcp.RoutingIndexManager(size, 1, 0)
+    routing = pywrapcp.RoutingModel(manager)
+    routing.SetArcCostEvaluatorOfAllVehicles(routing.RegisterTransitMatrix(distance_matrix))
+    routing.AddDimension(routing.RegisterTransitMatrix(time_matrix), 0, MAX_ROUTE_MINUTES, True, 'Time')
+
+    search_parameters = pywrapcp.DefaultRoutingSearchParameters()
+    search_parameters.local_search_metaheuristic = (
+        routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+    )
+    search_parameters.time_limit.FromMilliseconds(max(1, time_limit_ms))
+    routing.CloseModelWithParameters(search_parameters)
+
+    initial = routing.ReadAssignmentFromRoutes([[manager.NodeToIndex(i) for i in range(1, size)]], True)
+    if initial is None:
+        return route
+    solution = routing.SolveFromAssignmentWithParameters(initial, search_parameters)
+    if not solution:
+        return route
+
+    ordered = []
+    index = solution.Value(routing.NextVar(routing.Start(0)))
+    while not routing.IsEnd(index):
+        ordered.append(nodes[manager.IndexToNode(index)])
+        index = solution.Value(routing.NextVar(index))
+    return ordered
+
+
+def insert_customers(depots: list, vehicles: list, routes: list, new_customers: list,
+                     osrm_url: str = None, local_search_seconds: float = 0) -> dict:
+    """
+    Onaylı rotalara (vehicle_id, depot_id, sıralı stops) yeni müşterileri en ucuz uygun
+    konuma ekle. Uygunluk: araç kapasitesi ve Time boyutu (rota <= MAX_ROUTE_MINUTES).
+    Plana girmemiş araçlar kendi depot_id'lerinden (yoksa ilk depodan) yeni rota açabilir.
+    local_search_seconds > 0 ise yeni durak alan rotaların sırası kısa GLS ile iyileştirilir.
+    Returns: {"routes", "inserted", "unassigned", "summary"}
+    """
+    started = time.perf_counter()
+    if not osrm_url:
+        osrm_url = default_osrm_url()
+
+    # Düğümler: depolar, mevcut duraklar, yeni müşteriler
+    depot_node = {depot["id"]: i for i, depot in enumerate(depots)}
+    points = [_location(depot) for depot in depots]
+    node_customers = [None] * len(depots)
+    vehicle_by_id = {vehicle["id"]: vehicle for vehicle in vehicles}
+
+    plan_vehicles, plan_depots, plan_routes = [], [], []
+    committed_vehicle_ids = set()
+    for route in routes:
+        vehicle = vehicle_by_id.get(route["vehicle_id"])
+        if vehicle is None:
+            raise ValueError(f"Unknown vehicle in committed routes: {route['vehicle_id']}")
+        if vehicle["id"] in committed_vehicle_ids:
+            raise ValueError(f"Vehicle has more than one committed route: {route['vehicle_id']}")
+        nodes = []
+        for stop in route["stops"]:
+            nodes.append(len(points))
+            points.append(_location(stop))
+            node_customers.append(stop)
+        committed_vehicle_ids.add(vehicle["id"])
+        plan_vehicles.append(vehicle)
+        plan_depots.append(depot_node.get(route.get("depot_id"), 0))
+        plan_routes.append(nodes)
+
+    for vehicle in vehicles:
+        if vehicle["id"] not in committed_vehicle_ids:
+            plan_vehicles.append(vehicle)
+            plan_depots.append(depot_node.get(vehicle.get("depot_id"), 0))
+            plan_routes.append([])
+
+    planned_ids = {customer["id"] for customer in node_customers if customer}
+    new_nodes = []
+    for customer in new_customers:
+        if customer["id"] in planned_ids:
+            raise ValueError(f"Customer already in committed routes: {customer['id']}")
+        new_nodes.append(len(points))
+        points.append(_location(customer))
+        node_customers.append(customer)
+
+    demands = [0] * len(depots) + [c.get("demand_pallets", 1) for c in node_customers[len(depots):]]
+    service_times = [0] * len(depots) + [business_service_time(c) for c in node_customers[len(depots):]]
+
+    # Gereken yaylar: rota içi bloklar + yeni satır/sütunlar (tam N x N matris yok)
+    all_nodes = list(range(len(points)))
+    blocks = []
+    for depot, route in zip(plan_depots, plan_routes):
+        if route:
+            local = [depot] + route
+            blocks.append((local, local))
+    if new_nodes:
+        blocks.append((new_nodes, all_nodes))
+        blocks.append((all_nodes, new_nodes))
+
+    point_ids = [depot["id"] for depot in depots] + [customer["id"] for customer in node_customers[len(depots):]]
+    chain = distance_chain(osrm_url, default_matrix_store_dir(), log_prefix="[Insert]", cache=False)
+    matrices, source = _fetch_blocks(points, point_ids, blocks, chain)
+    distance = defaultdict(dict)
+    travel_time = defaultdict(dict)
+    for depot in range(len(depots)):
+        distance[depot][depot] = 0
+        travel_time[depot][depot] = 0
+    for (sources, destinations), matrix in zip(blocks, matrices):
+        minutes = travel_time_matrix(matrix, [service_times[j] for j in destinations], AVERAGE_SPEED_KMH).tolist()
+        meters = matrix.tolist()
+        for a, i in enumerate(sources):
+            distance_row, time_row = distance[i], travel_time[i]
+            for b, j in enumerate(destinations):
+                distance_row[j] = meters[a][b]
+                time_row[j] = minutes[a][b]
+
+    distance_before = sum(_route_distance(r, d, distance) for r, d in zip(plan_routes, plan_depots))
+
+    # Büyük talepler önce (sığma şansı azalan sırayla); araç tipi kısıtlı müşteriler sadece uyumlu araçlara
+    candidates = sorted(new_nodes, key=lambda n: -demands[n])
+    vehicle_domains, _ = vehicle_type_domains(node_customers[len(depots):], plan_vehicles)
+    unplaced = insert_cheapest(
+        plan_routes, candidates, demands, [v.get("capacity_pallets", 26) for v in plan_vehicles],
+        distance, travel_time, MAX_ROUTE_MINUTES, vehicle_fixed_cost=VEHICLE_FIXED_COST, route_depots=plan_depots,
+        allowed_vehicles=[None] * len(depots) + vehicle_domains
+    )
+
+    new_set = set(new_nodes) - set(unplaced)
+    touched = [i for i, route in enumerate(plan_routes) if new_set.intersection(route)]
+    if local_search_seconds > 0 and touched:
+        budget_ms = int(local_search_seconds * 1000 / len(touched))
+        for i in touched:
+            improved = _reoptimize_route(plan_routes[i], plan_depots[i], distance, travel_time, budget_ms)
+            if (_route_distance(improved, plan_depots[i], distance) < _route_distance(plan_routes[i], plan_depots[i], distance)
+                    and route_time(improved, travel_time, plan_depots[i]) <= MAX_ROUTE_MINUTES):
+                plan_routes[i] = improved
+
+    distance_after = sum(_route_distance(r, d, distance) for r, d in zip(plan_routes, plan_depots))
+
+    result_routes = []
+    inserted = []
+    for vehicle, depot, route in zip(plan_vehicles, plan_depots, plan_routes):
+        if not route:
+            continue
+        for order, node in enumerate(route, start=1):
+            if node in new_set:
+                inserted.append({"customer_id": node_customers[node]["id"], "vehicle_id": vehicle["id"], "stop_order": order})
+        result_routes.append({
+            "vehicle_id": vehicle["id"],
+            "depot_id": depots[depot]["id"],
+            "stops": [node_customers[node] for node in route],
+            "distance_km": round(_route_distance(route, depot, distance) / 1000, 2),
+            "duration_minutes": route_time(route, travel_time, depot),
+            "total_pallets": sum(demands[node] for node in route),
+        })
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    print(f"[Insert] {len(inserted)}/{len(new_nodes)} müşteri eklendi, {len(unplaced)} yerleştirilemedi ({elapsed_ms} ms, {source})")
+
+    return {
+        "routes": result_routes,
+        "inserted": inserted,
+        "unassigned": [node_customers[node]["id"] for node in unplaced],
+        "summary": {
+            "total_routes": len(result_routes),
+            "total_distance_km": round(distance_after / 1000, 2),
+            "added_distance_km": round((distance_after - distance_before) / 1000, 2),
+            "distance_source": source,
+            "elapsed_ms": elapsed_ms,
+        }
+    }
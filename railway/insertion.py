@@ -0,0 +1,68 @@
+from typing import Container, List, Optional, Sequence
+
+# Mevcut rotalara en ucuz uygun ekleme (kapasite + rota süresi kontrollü)
+# Rotalar düğüm indeksi listeleridir; depo düğümü (0) rotada yazılmaz, başta ve sonda varsayılır.
+
+
+def route_load(route: Sequence[int], demands: Sequence[int]) -> int:
+    return sum(demands[node] for node in route)
+
+
+def route_time(route: Sequence[int], time_matrix, depot: int = 0) -> int:
+    """Depo -> duraklar -> depo toplam transit süresi (servis süreleri time_matrix içinde)"""
+    total = 0
+    previous = depot
+    for node in route:
+        total += time_matrix[previous][node]
+        previous = node
+    return total + time_matrix[previous][depot]
+
+
+def insert_cheapest(routes: List[List[int]], nodes: Sequence[int], demands, capacities: Sequence[int],
+                    distance_matrix, time_matrix, max_route_time: int, vehicle_fixed_cost: int = 0,
+                    depot: int = 0, route_depots: Sequence[int] = None,
+                    allowed_vehicles: Sequence[Optional[Container[int]]] = None) -> List[int]:
+    """
+    nodes'u sırayla en düşük ek mesafe maliyetli uygun konuma ekle (routes yerinde güncellenir).
+    Uygunluk: araç kapasitesi ve rota süresi <= max_route_time.
+    Boş araca ekleme vehicle_fixed_cost kadar pahalıdır (mevcut rotalar tercih edilir).
+    Matrisler [i][j] ile indekslenebilen herhangi bir yapı olabilir (liste, ndarray, dict);
+    route_depots verilirse her rota kendi depo düğümünden başlar ve biter; allowed_vehicles[node]
+    verilirse (None değilse) düğüm sadece bu araç indekslerine eklenir (araç tipi domain'i).
+    Returns: hiçbir rotaya sığmayan düğümler
+    """
+    depots = route_depots if route_depots is not None else [depot] * len(routes)
+    loads = [route_load(route, demands) for route in routes]
+    times = [route_time(route, time_matrix, depots[vehicle]) for vehicle, route in enumerate(routes)]
+    unplaced = []
+
+    for node in nodes:
+        best = None  # (maliyet, araç, pozisyon, yeni süre)
+        allowed = allowed_vehicles[node] if allowed_vehicles is not None else None
+        for vehicle, route in enumerate(routes):
+            if loads[vehicle] + demands[node] > capacities[vehicle]:
+                continue
+            if allowed is not None and vehicle not in allowed:
+                continue
+            fixed = vehicle_fixed_cost if not route else 0
+            previous = depots[vehicle]
+            for position in range(len(route) + 1):
+                following = route[position] if position < len(route) else depots[vehicle]
+                new_time = (times[vehicle] - time_matrix[previous][following]
+                            + time_matrix[previous][node] + time_matrix[node][following])
+                if new_time <= max_route_time:
+                    cost = (fixed + distance_matrix[previous][node] + distance_matrix[node][following]
+                            - distance_matrix[previous][following])
+                    if best is None or cost < best[0]:
+                        best = (cost, vehicle, position, new_time)
+                previous = following
+
+        if best is None:
+            unplaced.append(node)
+            continue
+        _, vehicle, position, new_time = best
+        routes[vehicle].insert(position, node)
+        loads[vehicle] += demands[node]
+        times[vehicle] = new_time
+
+    return unplaced
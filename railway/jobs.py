@@ -0,0 +1,199 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Callable, Dict, Optional
+
+# Asenkron optimizasyon işleri: SQLite kalıcı sonuç deposu + arka plan worker havuzu
+DEFAULT_JOB_DB_PATH = os.path.join('/tmp', 'vrp-jobs.sqlite3')
+DEFAULT_JOB_WORKERS = 2
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+FINAL_STATUSES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobCancelledError(Exception):
+    """Runner, işin stop_event'i set edildiği için aramayı yarıda bıraktı (sonuç kaydedilmez / cache'lenmez)"""
+
+
+class JobStore:
+    """SQLite tabanlı iş deposu (worker restart'larında sonuçlar korunur)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    request_json TEXT NOT NULL,
+                    result_json TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    completed_at REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)")
+            self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor.rowcount
+
+    def create(self, request_data: dict) -> str:
+        job_id = uuid.uuid4().hex
+        self._execute(
+            "INSERT INTO jobs (id, status, request_json, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, JOB_QUEUED, json.dumps(request_data), time.time())
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row["id"],
+            "status": row["status"],
+            "request": json.loads(row["request_json"]),
+            "result": json.loads(row["result_json"]) if row["result_json"] else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "completed_at": row["completed_at"],
+        }
+
+    def mark_running(self, job_id: str) -> bool:
+        """Sadece kuyruktaki iş başlatılabilir (iptal edilmişse False)"""
+        return self._execute(
+            "UPDATE jobs SET status = ?, started_at = ? WHERE id = ? AND status = ?",
+            (JOB_RUNNING, time.time(), job_id, JOB_QUEUED)
+        ) == 1
+
+    def complete(self, job_id: str, result: dict) -> bool:
+        return self._execute(
+            "UPDATE jobs SET status = ?, result_json = ?, completed_at = ? WHERE id = ? AND status = ?",
+            (JOB_COMPLETED, json.dumps(result), time.time(), job_id, JOB_RUNNING)
+        ) == 1
+
+    def fail(self, job_id: str, error: str) -> bool:
+        return self._execute(
+            "UPDATE jobs SET status = ?, error = ?, completed_at = ? WHERE id = ? AND status = ?",
+            (JOB_FAILED, error, time.time(), job_id, JOB_RUNNING)
+        ) == 1
+
+    def cancel(self, job_id: str) -> bool:
+        return self._execute(
+            "UPDATE jobs SET status = ?, completed_at = ? WHERE id = ? AND status IN (?, ?)",
+            (JOB_CANCELLED, time.time(), job_id, JOB_QUEUED, JOB_RUNNING)
+        ) == 1
+
+    def requeue_interrupted(self) -> list:
+        """Restart öncesi yarıda kalan işleri kuyruğa geri al, kuyruktaki tüm işleri döndür"""
+        self._execute(
+            "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?",
+            (JOB_QUEUED, JOB_RUNNING)
+        )
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (JOB_QUEUED,)
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+
+class JobManager:
+    """
+    İşleri arka plan thread havuzunda çalıştırır, durumu JobStore'a yazar.
+    runner(request, stop_event): stop_event iş iptal edilince set edilir, runner aramayı erken bitirir
+    """
+
+    def __init__(self, store: JobStore, runner: Callable[[dict, threading.Event], dict],
+                 max_workers: int = DEFAULT_JOB_WORKERS):
+        self.store = store
+        self.runner = runner
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vrp-job")
+        self._futures: Dict[str, Future] = {}
+        self._stop_events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, request_data: dict) -> str:
+        job_id = self.store.create(request_data)
+        self._schedule(job_id)
+        return job_id
+
+    def resume(self) -> int:
+        """Servis açılışında yarım kalan/kuyruktaki işleri yeniden planla"""
+        job_ids = self.store.requeue_interrupted()
+        for job_id in job_ids:
+            self._schedule(job_id)
+        if job_ids:
+            print(f"[Jobs] {len(job_ids)} iş yeniden kuyruğa alındı")
+        return len(job_ids)
+
+    def _schedule(self, job_id: str) -> None:
+        stop_event = threading.Event()
+        with self._lock:
+            self._stop_events[job_id] = stop_event
+            future = self.executor.submit(self._run, job_id, stop_event)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda _: self._forget(job_id))
+
+    def _forget(self, job_id: str) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+            self._stop_events.pop(job_id, None)
+
+    def _run(self, job_id: str, stop_event: threading.Event) -> None:
+        if not self.store.mark_running(job_id):
+            return  # iptal edilmiş
+        job = self.store.get(job_id)
+        print(f"[Jobs] Job {job_id} başladı")
+        try:
+            result = self.runner(job["request"], stop_event)
+        except JobCancelledError:
+            print(f"[Jobs] Job {job_id} iptal edildi, arama / bekleme durduruldu")
+            return
+        except Exception as e:
+            print(f"[Jobs] Job {job_id} başarısız: {e}")
+            self.store.fail(job_id, str(e))
+            return
+        if self.store.complete(job_id, result):
+            print(f"[Jobs] Job {job_id} tamamlandı")
+        else:
+            print(f"[Jobs] Job {job_id} çözüldü ama iptal edilmişti, sonuç atıldı")
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Kuyruktaki iş hiç başlamaz; çalışan işin stop_event'i set edilir (arama bir sonraki çözümde,
+        başka isteğin çözümüne bağlanmış bekleme bir yoklama aralığında biter; worker thread'i serbest
+        kalır) ve sonucu kaydedilmez
+        """
+        if not self.store.cancel(job_id):
+            return False
+        with self._lock:
+            future = self._futures.get(job_id)
+            stop_event = self._stop_events.get(job_id)
+        if future:
+            future.cancel()
+        if stop_event:
+            stop_event.set()
+        return True
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,215 @@
+import time
+import numpy as np
+from typing import Container, Dict, List, Optional, Sequence
+
+# Çıkarılan rotaların hızlı son iyileştirmesi (NumPy delta değerlendirmesi): rota içi 2-opt ve Or-opt,
+# rotalar arası relocate. Her hamlenin mesafe ve süre farkı tüm adaylar için tek seferde hesaplanır,
+# en iyi iyileştiren hamle uygulanır. Kapasite, rota süresi (time_matrix, servis süreleri dahil) ve
+# araç tipi domain'leri korunur. Matrisler yönlü olabilir (OSRM): 2-opt ters çevrilen parçanın iç
+# yaylarını da yeniden hesaplar.
+# Rotalar insertion.py'deki gibi araç başına düğüm listeleridir; depo düğümü (0) yazılmaz.
+
+# Or-opt: tek hamlede taşınan ardışık durak sayısı üst sınırı
+OR_OPT_SEGMENT = 3
+
+
+def _arc_sums(path: np.ndarray, matrix: np.ndarray) -> tuple:
+    """İleri ve geri yönde yol öneki toplamları: forward[k] = path[0] -> path[k], backward[k] = ters yön"""
+    forward = np.concatenate(([0], np.cumsum(matrix[path[:-1], path[1:]])))
+    backward = np.concatenate(([0], np.cumsum(matrix[path[1:], path[:-1]])))
+    return forward, backward
+
+
+def _two_opt_move(route: List[int], distance: np.ndarray, times: np.ndarray, route_time: int,
+                  max_route_time: int) -> Optional[tuple]:
+    """En iyi iyileştiren 2-opt hamlesi (path[i..j] ters çevrilir): (mesafe farkı, i, j, süre farkı) ya da None"""
+    path = np.array([0] + route + [0])
+    inner = np.arange(1, len(path) - 1)
+    i, j = inner[:, np.newaxis], inner[np.newaxis, :]
+    deltas = []
+    for matrix in (distance, times):
+        forward, backward = _arc_sums(path, matrix)
+        deltas.append(
+            matrix[path[i - 1], path[j]] + matrix[path[i], path[j + 1]]
+            - matrix[path[i - 1], path[i]] - matrix[path[j], path[j + 1]]
+            + (backward[j] - backward[i]) - (forward[j] - forward[i])
+        )
+    distance_delta, time_delta = deltas
+    feasible = (j > i) & (route_time + time_delta <= max_route_time) & (distance_delta < 0)
+    if not feasible.any():
+        return None
+    best = np.argmin(np.where(feasible, distance_delta, 0))
+    a, b = np.unravel_index(best, distance_delta.shape)
+    return int(distance_delta[a, b]), int(inner[a]), int(inner[b]), int(time_delta[a, b])
+
+
+def _or_opt_move(route: List[int], distance: np.ndarray, times: np.ndarray, route_time: int,
+                 max_route_time: int) -> Optional[tuple]:
+    """
+    En iyi iyileştiren Or-opt hamlesi: path[a..a+size-1] parçası (yönü korunarak) parçaya değmeyen
+    bir yayın (path[e], path[e+1]) arasına taşınır. Returns: (mesafe farkı, a, size, e, süre farkı) ya da None
+    """
+    path = np.array([0] + route + [0])
+    edges = np.arange(len(path) - 1)
+    best = None
+    for size in range(1, min(OR_OPT_SEGMENT, len(route) - 1) + 1):
+        start = np.arange(1, len(path) - size)[:, np.newaxis]
+        first, last = path[start], path[start + size - 1]
+        before, after = path[start - 1], path[start + size]
+        u, v = path[edges][np.newaxis, :], path[edges + 1][np.newaxis, :]
+        deltas = [
+            matrix[u, first] + matrix[last, v] - matrix[u, v]
+            - (matrix[before, first] + matrix[last, after] - matrix[before, after])
+            for matrix in (distance, times)
+        ]
+        distance_delta, time_delta = deltas
+        # Parçaya değen yaylar (öncesi, içi, sonrası) aday değil
+        outside = (edges[np.newaxis, :] < start - 1) | (edges[np.newaxis, :] >= start + size)
+        feasible = outside & (route_time + time_delta <= max_route_time) & (distance_delta < 0)
+        if not feasible.any():
+            continue
+        index = np.argmin(np.where(feasible, distance_delta, 0))
+        s, e = np.unravel_index(index, distance_delta.shape)
+        if best is None or distance_delta[s, e] < best[0]:
+            best = (int(distance_delta[s, e]), int(start[s, 0]), size, int(edges[e]), int(time_delta[s, e]))
+    return best
+
+
+def _improve_route(route: List[int], distance: np.ndarray, times: np.ndarray, route_time: int,
+                   max_route_time: int, stats: dict, deadline: float) -> int:
+    """Rota içi 2-opt + Or-opt, iyileşme kalmayana kadar (route yerinde güncellenir). Returns: yeni rota süresi"""
+    while len(route) >= 2 and time.perf_counter() < deadline:
+        move = _two_opt_move(route, distance, times, route_time, max_route_time)
+        if move:
+            gain, i, j, time_delta = move
+            route[i - 1:j] = route[i - 1:j][::-1]
+            stats["two_opt"] += 1
+        else:
+            move = _or_opt_move(route, distance, times, route_time, max_route_time)
+            if not move:
+                break
+            gain, a, size, edge, time_delta = move
+            segment = route[a - 1:a - 1 + size]
+            del route[a - 1:a - 1 + size]
+            position = edge - size if edge >= a + size else edge
+            route[position:position] = segment
+            stats["or_opt"] += 1
+        stats["gain"] -= gain
+        route_time += time_delta
+    return route_time
+
+
+def _relocate_pass(routes: List[List[int]], distance: np.ndarray, times: np.ndarray, demands: Sequence[int],
+                   capacities: Sequence[int], loads: List[int], route_times: List[int], max_route_time: int,
+                   allowed: Sequence[Optional[Container[int]]], vehicle_fixed_cost: int, stats: dict,
+                   deadline: float) -> set:
+    """
+    Rotalar arası relocate: her durak, kapasitesi / süresi / domain'i uyan başka bir dolu rotada en ucuz
+    konuma taşınır (rotası boşalırsa araç sabit maliyeti de kazanılır). Returns: değişen araçlar
+    """
+    num_vehicles = len(routes)
+    changed = set()
+    domain_masks: Dict[Container[int], np.ndarray] = {}
+
+    def edge_arrays() -> tuple:
+        tails, heads, owners = [], [], []
+        for vehicle, route in enumerate(routes):
+            if route:
+                path = [0] + route + [0]
+                tails.extend(path[:-1])
+                heads.extend(path[1:])
+                owners.extend([vehicle] * (len(path) - 1))
+        return np.array(tails), np.array(heads), np.array(owners)
+
+    tails, heads, owners = edge_arrays()
+    capacity_left = np.array(capacities) - np.array(loads)
+    time_left = max_route_time - np.array(route_times)
+    for vehicle in range(num_vehicles):
+        position = 0
+        while position < len(routes[vehicle]):
+            if time.perf_counter() >= deadline:
+                return changed
+            route = routes[vehicle]
+            node = route[position]
+            before = route[position - 1] if position > 0 else 0
+            after = route[position + 1] if position + 1 < len(route) else 0
+            # Kaynak rota da sınırda kalmalı: üçgen eşitsizliği tutmayan sürelerde (OSRM, dakikaya
+            # yuvarlama) durağı çıkarmak rotayı uzatabilir
+            source_time = (route_times[vehicle] - int(times[before, node] + times[node, after] - times[before, after])
+                           if len(route) > 1 else 0)
+            if source_time > max_route_time:
+                position += 1
+                continue
+            removal = int(distance[before, node] + distance[node, after] - distance[before, after])
+            if len(route) == 1:
+                removal += vehicle_fixed_cost
+            insertion = distance[tails, node] + distance[node, heads] - distance[tails, heads]
+            time_insertion = times[tails, node] + times[node, heads] - times[tails, heads]
+            feasible = ((owners != vehicle) & (capacity_left[owners] >= demands[node])
+                        & (time_insertion <= time_left[owners]) & (insertion < removal))
+            if allowed[node] is not None:
+                if allowed[node] not in domain_masks:
+                    mask = np.zeros(num_vehicles, dtype=bool)
+                    mask[list(allowed[node])] = True
+                    domain_masks[allowed[node]] = mask
+                feasible &= domain_masks[allowed[node]][owners]
+            if not feasible.any():
+                position += 1
+                continue
+            candidates = np.flatnonzero(feasible)
+            edge = int(candidates[np.argmin(insertion[candidates])])
+            target = int(owners[edge])
+            # Hedef rotada yayın (tails[edge], heads[edge]) arasına: yayın rota içi sırası baş düğümden bulunur
+            target_route = routes[target]
+            insert_at = target_route.index(int(heads[edge])) if heads[edge] != 0 else len(target_route)
+            target_route.insert(insert_at, node)
+            del route[position]
+            loads[vehicle] -= demands[node]
+            loads[target] += demands[node]
+            route_times[vehicle] = source_time
+            route_times[target] += int(time_insertion[edge])
+            for changed_vehicle in (vehicle, target):
+                capacity_left[changed_vehicle] = capacities[changed_vehicle] - loads[changed_vehicle]
+                time_left[changed_vehicle] = max_route_time - route_times[changed_vehicle]
+            stats["relocate"] += 1
+            stats["gain"] += removal - int(insertion[edge])
+            changed.update((vehicle, target))
+            tails, heads, owners = edge_arrays()
+    return changed
+
+
+def improve_routes(routes: List[List[int]], distance_matrix, time_matrix, demands: Sequence[int],
+                   capacities: Sequence[int], max_route_time: int, time_limit: float,
+                   allowed_vehicles: Sequence[Optional[Container[int]]] = None, vehicle_fixed_cost: int = 0) -> dict:
+    """
+    routes'u yerinde iyileştir: değişen rotalarda 2-opt + Or-opt, ardından relocate turu; tur
+    iyileştirmesiz biterse ya da time_limit (saniye) dolarsa durur. Başlangıç rotaları uygun
+    (kapasite / süre) varsayılır; hamleler uygunluğu bozmaz.
+    allowed_vehicles[node]: düğümün taşınabileceği araç indeksleri (None = hepsi)
+    Returns: {"two_opt", "or_opt", "relocate": uygulanan hamle sayıları, "gain": mesafe + sabit maliyet kazancı,
+    "seconds"}
+    """
+    started = time.perf_counter()
+    deadline = started + time_limit
+    # Mesafeler MAX_DISTANCE_M ile sınırlı int32: dört yayın toplamı taşmaz, N² int64 kopyası alınmaz
+    distance = np.asarray(distance_matrix)
+    times = np.asarray(time_matrix)
+    allowed = allowed_vehicles if allowed_vehicles is not None else [None] * len(distance)
+    loads = [sum(demands[node] for node in route) for route in routes]
+    route_times = [
+        int(times[[0] + route, route + [0]].sum()) if route else 0 for route in routes
+    ]
+    stats = {"two_opt": 0, "or_opt": 0, "relocate": 0, "gain": 0}
+
+    dirty = set(range(len(routes)))
+    while dirty and time.perf_counter() < deadline:
+        for vehicle in sorted(dirty):
+            route_times[vehicle] = _improve_route(
+                routes[vehicle], distance, times, route_times[vehicle], max_route_time, stats, deadline
+            )
+        dirty = _relocate_pass(
+            routes, distance, times, demands, capacities, loads, route_times, max_route_time, allowed,
+            vehicle_fixed_cost, stats, deadline
+        )
+    stats["seconds"] = time.perf_counter() - started
+    return stats
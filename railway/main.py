@@ -1,13 +1,28 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Callable, List, Optional
+from concurrent.futures import CancelledError
+import asyncio
+import json
+import queue
 import sys
 import os
+import threading
+import time
 
 # OR-Tools optimizer scriptini import et
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from ortools_optimizer import optimize_routes
+from feasibility import InfeasibleProblemError
+from metrics import IN_FLIGHT, RESULT_CACHE, phase
+from incremental import insert_customers
+from matrix_cache import get_matrix_cache
+from result_cache import get_result_cache, request_cache_key
+from solve_context import DEFAULT_STALL_SECONDS, SolveContext
+from jobs import JobStore, JobManager, JobCancelledError, DEFAULT_JOB_DB_PATH, DEFAULT_JOB_WORKERS
 
 app = FastAPI(title="VRP Optimizer API")
 
@@ -37,29 +52,78 @@ class Customer(BaseModel):
     constraint_end_time: Optional[str] = None    # Format: "HH:MM" - end of CLOSED period
     required_vehicle_types: Optional[List[int]] = None
     required_vehicle_type: Optional[str] = None  # Single required vehicle type (kamyonet, kamyon_1, etc.)
+    priority: Optional[int] = None  # allow_drops: bırakma cezası çarpanı (varsayılan 1)
 
 class Vehicle(BaseModel):
     id: str
     type: int
     capacity_pallets: int
     fuel_consumption: float
+    depot_id: Optional[str] = None  # /insert: plana girmemiş aracın yeni rota açacağı depo
 
 class Depot(BaseModel):
     id: str
     location: Location
 
+class InitialRoute(BaseModel):
+    vehicle_id: str
+    customer_ids: List[str]  # Ziyaret sırasıyla
+
 class OptimizeRequest(BaseModel):
     customers: List[Customer]
     vehicles: List[Vehicle]
     depots: List[Depot]
     fuel_price: float = 47.50
     osrm_url: Optional[str] = None  # OSRM API URL for real road distances
+    initial_routes: Optional[List[InitialRoute]] = None  # Önceki plan: re-optimizasyon bu rotalardan başlar
+    decompose: bool = False  # Büyük depoları açısal dilimlere bölüp paralel çöz
+    nearest_neighbors: Optional[int] = None  # k: müşteri başına sadece en yakın k komşuya yay (büyük modeller)
+    allow_drops: bool = False  # Yerleştirilemeyen müşterileri bırak, kısmi plan döndür (dropped_customers)
+    drop_penalty: Optional[int] = None  # Müşteri bırakma taban cezası (varsayılan DROP_PENALTY)
+    deadline_seconds: Optional[float] = None  # Çağıranın bekleyebileceği süre: bütçe bitene / stall'a kadar iyileştir
+    stall_seconds: Optional[float] = None  # Bu kadar saniye iyileşme olmazsa dur (deadline'la varsayılan DEFAULT_STALL_SECONDS)
+
+class CommittedRoute(BaseModel):
+    vehicle_id: str
+    depot_id: Optional[str] = None
+    stops: List[Customer]  # Ziyaret sırasıyla
+
+class InsertRequest(BaseModel):
+    routes: List[CommittedRoute]
+    new_customers: List[Customer]
+    vehicles: List[Vehicle]
+    depots: List[Depot]
+    osrm_url: Optional[str] = None
+    local_search_seconds: float = 0  # > 0: yeni durak alan rotaları kısa GLS ile yeniden sırala
 
 class OptimizeResponse(BaseModel):
     success: bool
     routes: List[dict]
     summary: dict
+    dropped_customers: List[dict] = []  # allow_drops: {customer_id, depot_id, demand_pallets, reason, message}
+    error: Optional[str] = None
+
+class JobResponse(BaseModel):
+    job_id: str
+    status: str
+    result: Optional[OptimizeResponse] = None
     error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    completed_at: Optional[float] = None
+
+# /optimize ve /jobs arama süre sınırı
+OPTIMIZE_TIME_LIMIT_SECONDS = 300
+
+# X-Deadline bu değerden büyükse Unix zaman damgasıdır (epoch saniye), değilse kalan süre (saniye)
+DEADLINE_EPOCH_THRESHOLD = 1e9
+
+# Canlı çözüm akışı (SSE): varsayılan arama süresi ve keep-alive aralığı
+STREAM_TIME_LIMIT_SECONDS = 60
+STREAM_KEEPALIVE_SECONDS = 15
+
+# Asenkron işler: SQLite'ta kalıcı, arka plan thread havuzunda çözülür
+job_manager: Optional[JobManager] = None
 
 @app.get("/")
 def root():
@@ -73,47 +137,303 @@ def root():
 def health():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrikleri: faz süreleri, OSRM fallback'leri, solver durumları, devam eden çözümler"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/cache/stats")
+def cache_stats():
+    matrix_cache = get_matrix_cache()
+    result_cache = get_result_cache()
+    return {
+        "matrix": matrix_cache.stats() if matrix_cache else {"enabled": False},
+        "result": result_cache.stats() if result_cache else {"enabled": False}
+    }
+
+def deadline_budget(request: OptimizeRequest, x_deadline: Optional[str] = None) -> Optional[float]:
+    """
+    İsteğin süre bütçesi (saniye): X-Deadline header'ı (kalan süre ya da epoch) veya deadline_seconds.
+    Geçersiz / geçmiş deadline ValueError.
+    """
+    if x_deadline is not None:
+        try:
+            value = float(x_deadline)
+        except ValueError:
+            raise ValueError(f"Invalid X-Deadline header: {x_deadline!r}")
+        budget = value - time.time() if value > DEADLINE_EPOCH_THRESHOLD else value
+    else:
+        budget = request.deadline_seconds
+    if budget is not None and budget <= 0:
+        raise ValueError(f"Deadline already passed ({budget:.1f}s)")
+    return budget
+
+def solve_context_for(request: OptimizeRequest, time_limit_seconds: int = OPTIMIZE_TIME_LIMIT_SECONDS,
+                      deadline_seconds: Optional[float] = None) -> SolveContext:
+    """
+    İsteğin çözüm ayarları (router isteğe özel; process environment'ı değiştirilmez)
+    deadline_seconds: deadline_budget() sonucu; deadline şimdiden itibaren sayılır
+    """
+    settings = {}
+    if request.drop_penalty is not None:
+        settings["drop_penalty"] = request.drop_penalty
+    if deadline_seconds is not None:
+        settings["deadline"] = time.time() + deadline_seconds
+        settings["stall_seconds"] = request.stall_seconds or DEFAULT_STALL_SECONDS
+    elif request.stall_seconds:
+        settings["stall_seconds"] = request.stall_seconds
+    return SolveContext.create(
+        osrm_url=request.osrm_url,
+        fuel_price=request.fuel_price,
+        time_limit_seconds=time_limit_seconds,
+        allow_drops=request.allow_drops,
+        **settings
+    )
+
+def run_optimization(request: OptimizeRequest, context: SolveContext,
+                     on_solution: Callable[[dict], Optional[bool]] = None,
+                     stop_event: Optional[threading.Event] = None) -> dict:
+    """
+    Senkron /optimize, asenkron /jobs ve /optimize/stream için ortak çözüm akışı
+    stop_event: /jobs iptali; set edilince arama durur, JobCancelledError fırlatılır
+    """
+    print(f"[Railway] ========== OPTIMIZATION REQUEST ==========")
+    print(f"[Railway] Depots: {len(request.depots)}")
+    print(f"[Railway] Customers: {len(request.customers)}")
+    print(f"[Railway] Vehicles: {len(request.vehicles)}")
+    print(f"[Railway] Fuel price: {request.fuel_price}")
+    if request.initial_routes:
+        print(f"[Railway] Warm start: {len(request.initial_routes)} initial routes")
+    
+    # Calculate total demand and capacity
+    total_demand = sum(c.demand_pallets for c in request.customers)
+    total_capacity = sum(v.capacity_pallets for v in request.vehicles)
+    print(f"[Railway] Total demand: {total_demand} pallets")
+    print(f"[Railway] Total capacity: {total_capacity} pallets")
+    print(f"[Railway] Demand/Capacity ratio: {total_demand/total_capacity:.2f}" if total_capacity > 0 else "[Railway] WARNING: Total capacity is 0!")
+    
+    if request.osrm_url:
+        print(f"[Railway] Using OSRM URL: {context.osrm_url}")
+    
+    with phase("parse"):
+        customers = [c.dict() for c in request.customers]
+        vehicles = [v.dict() for v in request.vehicles]
+        depots = [d.dict() for d in request.depots]
+        initial_routes = [r.dict() for r in request.initial_routes] if request.initial_routes else None
+    
+    # OR-Tools optimizer'ı çağır
+    with IN_FLIGHT.track_inprogress():
+        result = optimize_routes(
+            customers=customers,
+            vehicles=vehicles,
+            depots=depots,
+            on_solution=on_solution,
+            initial_routes=initial_routes,
+            decompose=request.decompose,
+            nearest_neighbors=request.nearest_neighbors,
+            context=context,
+            stop_event=stop_event
+        )
+    if stop_event is not None and stop_event.is_set():
+        # Yarıda kesilen aramanın sonucu döndürülmez (result cache'e de yazılmaz)
+        raise JobCancelledError("Job cancelled")
+    
+    print(f"[Railway] Optimization successful: {len(result['routes'])} routes generated")
+    if result["dropped_customers"]:
+        print(f"[Railway] Dropped customers: {len(result['dropped_customers'])}")
+    
+    return OptimizeResponse(
+        success=True,
+        routes=result["routes"],
+        summary=result["summary"],
+        dropped_customers=result["dropped_customers"]
+    ).dict()
+
+def cached_optimization(request: OptimizeRequest, deadline_seconds: Optional[float] = None,
+                        stop_event: Optional[threading.Event] = None) -> dict:
+    """
+    /optimize ve /jobs: aynı istek TTL içinde yeniden çözülmez, cache'teki yanıt döner;
+    eşzamanlı aynı istekler devam eden tek çözümün sonucunu bekler
+    """
+    context = solve_context_for(request, deadline_seconds=deadline_seconds)
+    result_cache = get_result_cache()
+    if result_cache is None:
+        return run_optimization(request, context, stop_event=stop_event)
+    
+    # Deadline isteğin anlamını değiştirmez, sadece aramanın süresini: anahtara girmez. Epoch X-Deadline'dan
+    # hesaplanan bütçe her çağrıda farklıdır; aynı istek (çift tıklama / retry) cache'e isabet etsin, birleşsin
+    request_data = {name: value for name, value in request.dict().items() if name != "deadline_seconds"}
+    key = request_cache_key(request_data, context.osrm_url, time_limit_seconds=context.time_limit_seconds)
+    while True:
+        try:
+            result, outcome = result_cache.get_or_compute(
+                key, lambda: run_optimization(request, context, stop_event=stop_event), stop_event
+            )
+            break
+        except CancelledError:
+            # İptal edilen iş başka bir isteğin çözümünü bekliyordu: bekleme bırakılır, o çözüm sürer
+            raise JobCancelledError("Job cancelled")
+        except JobCancelledError:
+            if stop_event is not None and stop_event.is_set():
+                raise
+            # Beklenen çözüm iptal edilen bir işindi: bu istek kendisi çözer
+            print(f"[Railway] Coalesced solve was cancelled, solving again: {key[:12]}")
+    RESULT_CACHE.labels(outcome).inc()
+    if outcome != "miss":
+        print(f"[Railway] Result cache {outcome}: {key[:12]}")
+    return result
+
+def _run_job(request_data: dict, stop_event: threading.Event) -> dict:
+    with phase("parse"):
+        request = OptimizeRequest(**request_data)
+    # Kuyruktaki işin deadline'ı çözüm başladığında sayılmaya başlar
+    return cached_optimization(request, deadline_budget(request), stop_event)
+
+@app.on_event("startup")
+def start_job_manager():
+    global job_manager
+    store = JobStore(os.environ.get("JOB_DB_PATH", DEFAULT_JOB_DB_PATH))
+    job_manager = JobManager(store, _run_job, max_workers=int(os.environ.get("JOB_WORKERS", DEFAULT_JOB_WORKERS)))
+    job_manager.resume()
+
+@app.on_event("shutdown")
+def stop_job_manager():
+    if job_manager:
+        job_manager.shutdown()
+
 @app.post("/optimize", response_model=OptimizeResponse)
-def optimize(request: OptimizeRequest):
+def optimize(request: OptimizeRequest, x_deadline: Optional[str] = Header(None)):
+    """X-Deadline: yanıtın en geç ne zaman dönmesi gerektiği (kalan saniye ya da epoch; deadline_seconds'tan önceliklidir)"""
     try:
-        print(f"[Railway] ========== OPTIMIZATION REQUEST ==========")
-        print(f"[Railway] Depots: {len(request.depots)}")
-        print(f"[Railway] Customers: {len(request.customers)}")
-        print(f"[Railway] Vehicles: {len(request.vehicles)}")
-        print(f"[Railway] Fuel price: {request.fuel_price}")
-        
-        # Calculate total demand and capacity
-        total_demand = sum(c.demand_pallets for c in request.customers)
-        total_capacity = sum(v.capacity_pallets for v in request.vehicles)
-        print(f"[Railway] Total demand: {total_demand} pallets")
-        print(f"[Railway] Total capacity: {total_capacity} pallets")
-        print(f"[Railway] Demand/Capacity ratio: {total_demand/total_capacity:.2f}" if total_capacity > 0 else "[Railway] WARNING: Total capacity is 0!")
-        
-        # OSRM URL'yi environment variable'a kaydet (optimizer içinde kullanılacak)
-        if request.osrm_url:
-            os.environ['OSRM_URL'] = request.osrm_url
-            print(f"[Railway] Using OSRM URL: {request.osrm_url}")
-        
-        # OR-Tools optimizer'ı çağır
-        result = optimize_routes(
-            customers=[c.dict() for c in request.customers],
-            vehicles=[v.dict() for v in request.vehicles],
+        budget = deadline_budget(request, x_deadline)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        return cached_optimization(request, budget)
+    
+    except InfeasibleProblemError as e:
+        # Solver başlatılmadan reddedildi: istemci teşhislere göre veriyi düzeltebilir
+        print(f"[Railway] Infeasible: {str(e)}")
+        raise HTTPException(status_code=422, detail={"error": str(e), "diagnostics": e.diagnostics})
+    except Exception as e:
+        print(f"[Railway] ERROR: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/insert")
+def insert(request: InsertRequest):
+    """Gün içi yeni siparişleri onaylı plana tam yeniden çözüm yapmadan ekle"""
+    print(f"[Railway] Insert: {len(request.new_customers)} new customers into {len(request.routes)} routes")
+    try:
+        return insert_customers(
             depots=[d.dict() for d in request.depots],
-            fuel_price=request.fuel_price
-        )
-        
-        print(f"[Railway] Optimization successful: {len(result['routes'])} routes generated")
-        
-        return OptimizeResponse(
-            success=True,
-            routes=result["routes"],
-            summary=result["summary"]
+            vehicles=[v.dict() for v in request.vehicles],
+            routes=[r.dict() for r in request.routes],
+            new_customers=[c.dict() for c in request.new_customers],
+            osrm_url=request.osrm_url,
+            local_search_seconds=request.local_search_seconds
         )
-    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"[Railway] ERROR: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/optimize/stream")
+def optimize_stream(request: OptimizeRequest, time_limit_seconds: int = STREAM_TIME_LIMIT_SECONDS,
+                    x_deadline: Optional[str] = Header(None)):
+    """
+    Server-Sent Events: her iyileşen çözüm 'solution' olayı olarak gönderilir
+    (depot_id, objective, vehicles_used, routes[].customer_ids), arama bitince
+    'result' (OptimizeResponse) veya 'error' olayı gelir. İstemci bağlantıyı
+    kapatırsa (planı erken kabul) arama durdurulur. X-Deadline / deadline_seconds
+    verilirse arama time_limit_seconds'tan önce de biter.
+    """
+    try:
+        context = solve_context_for(request, time_limit_seconds, deadline_budget(request, x_deadline))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    events = queue.Queue()
+    disconnected = threading.Event()
+
+    def on_solution(event: dict) -> bool:
+        events.put(("solution", event))
+        return not disconnected.is_set()
+
+    def solve():
+        try:
+            events.put(("result", run_optimization(request, context, on_solution)))
+        except InfeasibleProblemError as e:
+            print(f"[Railway] Infeasible: {str(e)}")
+            events.put(("error", {"error": str(e), "diagnostics": e.diagnostics}))
+        except Exception as e:
+            print(f"[Railway] ERROR: {str(e)}")
+            events.put(("error", {"error": str(e)}))
+        events.put(None)
+
+    threading.Thread(target=solve, name="vrp-stream", daemon=True).start()
+
+    async def stream():
+        # Async generator: istemci koptuğunda Starlette görevi iptal eder ve finally çalışır
+        try:
+            while True:
+                try:
+                    item = await asyncio.to_thread(events.get, timeout=STREAM_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    return
+                yield _sse(*item)
+        finally:
+            # Normal bitiş veya istemci bağlantıyı kapattı: kalan aramayı durdur
+            disconnected.set()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def _job_response(job: dict) -> JobResponse:
+    return JobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        result=job["result"],
+        error=job["error"],
+        created_at=job["created_at"],
+        started_at=job["started_at"],
+        completed_at=job["completed_at"]
+    )
+
+@app.post("/jobs", response_model=JobResponse, status_code=202)
+def create_job(request: OptimizeRequest):
+    try:
+        deadline_budget(request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job_id = job_manager.submit(request.dict())
+    print(f"[Railway] Job {job_id} kuyruğa alındı")
+    return _job_response(job_manager.store.get(job_id))
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job(job_id: str):
+    job = job_manager.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
+
+@app.delete("/jobs/{job_id}", response_model=JobResponse)
+def cancel_job(job_id: str):
+    job = job_manager.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not job_manager.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job already {job['status']}")
+    return _job_response(job_manager.store.get(job_id))
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import numpy as np
+from typing import List, Optional
+
+# OSRM mesafe matrisleri için kalıcı disk cache'i
+# Anahtar: yuvarlanmış koordinat listesi + OSRM URL/profil (içerik adresli)
+# Format: int32 .npy (hücre başına 4 byte), TTL + boyut sınırlı LRU tahliye
+
+DEFAULT_CACHE_DIR = os.path.join('/tmp', 'vrp-matrix-cache')
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_MB = 512
+
+# 5 ondalık ≈ 1.1 metre; GPS gürültüsü aynı müşteriyi farklı anahtara düşürmesin
+COORD_PRECISION = 5
+
+
+def matrix_cache_key(locations: List[tuple], osrm_url: str, profile: str = 'driving') -> str:
+    """Koordinat listesi + router için kanonik SHA-256 anahtar"""
+    payload = {
+        'url': osrm_url.rstrip('/'),
+        'profile': profile,
+        'coords': [[round(float(lat), COORD_PRECISION), round(float(lng), COORD_PRECISION)] for lat, lng in locations],
+    }
+    canonical = json.dumps(payload, separators=(',', ':'), sort_keys=True)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class MatrixCache:
+    """
+    Dosya tabanlı matris cache'i.
+    Dosya mtime'ı yazılma zamanıdır (TTL), atime son erişimdir (LRU).
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > self.ttl_seconds:
+                os.remove(path)
+                with self._lock:
+                    self.expired += 1
+                    self.misses += 1
+                return None
+            matrix = np.load(path, allow_pickle=False)
+            # LRU: erişim zamanını güncelle, yazılma zamanını (TTL) koru
+            os.utime(path, (time.time(), stat.st_mtime))
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return matrix
+
+    def put(self, key: str, matrix: np.ndarray) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, np.asarray(matrix, dtype=np.int32), allow_pickle=False)
+            os.replace(tmp_path, path)  # atomik: eşzamanlı okuyucular yarım dosya görmez
+        except OSError as e:
+            print(f"[MatrixCache] WARNING: Cache yazılamadı: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        """Toplam boyut sınırı aşılırsa en eski erişilen dosyaları sil"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.npy'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, name))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def counters(self) -> dict:
+        """Bu process'teki sorgu sayaçları (hits, misses, expired, evictions)"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "expired": self.expired, "evictions": self.evictions}
+
+    def record(self, counters: dict) -> None:
+        """Başka bir process'te (depo havuzu worker'ı) sayılan sorguları bu örneğin sayaçlarına ekle"""
+        with self._lock:
+            self.hits += counters.get("hits", 0)
+            self.misses += counters.get("misses", 0)
+            self.expired += counters.get("expired", 0)
+            self.evictions += counters.get("evictions", 0)
+
+    def stats(self) -> dict:
+        entries = 0
+        size = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npy'):
+                entries += 1
+                try:
+                    size += os.path.getsize(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "entries": entries,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_matrix_cache() -> Optional[MatrixCache]:
+    """
+    Process genelinde tek cache örneği (environment ile yapılandırılır).
+    MATRIX_CACHE_DIR boş string ise cache kapalıdır.
+    """
+    global _cache
+    cache_dir = os.environ.get('MATRIX_CACHE_DIR', DEFAULT_CACHE_DIR)
+    if not cache_dir:
+        return None
+
+    with _cache_lock:
+        if _cache is None or _cache.cache_dir != cache_dir:
+            try:
+                _cache = MatrixCache(
+                    cache_dir,
+                    ttl_seconds=int(os.environ.get('MATRIX_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS)),
+                    max_bytes=int(float(os.environ.get('MATRIX_CACHE_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024),
+                )
+            except OSError as e:
+                print(f"[MatrixCache] WARNING: Cache dizini oluşturulamadı ({cache_dir}): {e}")
+                return None
+        return _cache
@@ -0,0 +1,130 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+# Önceden hesaplanmış mesafe deposu: tüm depo + müşteri noktaları için ana int32 matrisler
+# Dizin düzeni: manifest.json (id listesi, matris dosyaları, kaynak router, oluşturulma zamanı)
+# + distances-<zaman>.npy (metre) + opsiyonel durations-<zaman>.npy (saniye, OSRM seyahat süresi).
+# Her gece yeniden oluşturulur (scripts/build_distance_store.py); her process matrisleri bir kez
+# mmap ile açar (worker'lar tek kopyayı page cache üzerinden paylaşır), istek başına alt matris
+# id'lerle fancy indexing ile çıkarılır - ana matris belleğe kopyalanmaz.
+
+MANIFEST_NAME = 'manifest.json'
+
+
+class MatrixStore:
+    """Salt okunur depo: id -> satır indeksi, mmap'lenmiş (N x N) mesafe (metre) ve varsa süre (saniye) matrisi"""
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.manifest_mtime = os.stat(manifest_path).st_mtime
+
+        self.ids = self.manifest['ids']
+        self.index: Dict[str, int] = {location_id: i for i, location_id in enumerate(self.ids)}
+        self.distances = self._open(self.manifest['distances'])
+        self.durations = self._open(self.manifest['durations']) if self.manifest.get('durations') else None
+
+    def _open(self, name: str) -> np.ndarray:
+        matrix = np.load(os.path.join(self.store_dir, name), mmap_mode='r', allow_pickle=False)
+        if matrix.shape != (len(self.ids), len(self.ids)):
+            raise ValueError(f"Matrix shape {matrix.shape} does not match {len(self.ids)} ids")
+        return matrix
+
+    def rows(self, location_ids: Sequence[str]) -> np.ndarray:
+        """id'lerin satır indeksleri; depoda olmayan id varsa KeyError"""
+        missing = [location_id for location_id in location_ids if location_id not in self.index]
+        if missing:
+            raise KeyError(f"{len(missing)} locations not in distance store (e.g. {missing[0]})")
+        return np.fromiter((self.index[location_id] for location_id in location_ids), dtype=np.int64, count=len(location_ids))
+
+    def table(self, source_ids: Sequence[str], destination_ids: Sequence[str] = None, kind: str = 'distances') -> np.ndarray:
+        """
+        Kaynak x hedef alt matrisi (int32, sadece istenen hücreler okunur); destination_ids verilmezse kare.
+        kind: 'distances' (metre) | 'durations' (saniye; depoda yoksa LookupError)
+        """
+        matrix = self.distances if kind == 'distances' else self.durations
+        if matrix is None:
+            raise LookupError(f"Distance store has no {kind}")
+        sources = self.rows(source_ids)
+        destinations = sources if destination_ids is None else self.rows(destination_ids)
+        return np.asarray(matrix[np.ix_(sources, destinations)])
+
+
+def write_matrix_store(store_dir: str, ids: List[str], distances: np.ndarray, router: str,
+                       durations: Optional[np.ndarray] = None) -> str:
+    """
+    Depoyu yaz: önce yeni matris dosyaları, sonra manifest atomik olarak değiştirilir
+    (eşzamanlı okuyucular hep tutarlı bir id listesi + matris çifti görür). Eski matris
+    dosyaları silinir; açık mmap'ler Linux'ta silinen dosyayı okumaya devam eder.
+    Returns: manifest yolu
+    """
+    for matrix in (distances, durations):
+        if matrix is not None and matrix.shape != (len(ids), len(ids)):
+            raise ValueError(f"Matrix shape {matrix.shape} does not match {len(ids)} ids")
+    if len(set(ids)) != len(ids):
+        raise ValueError("Duplicate location ids")
+    os.makedirs(store_dir, exist_ok=True)
+
+    built_at = time.time()
+    manifest = {
+        'ids': list(ids),
+        'distances': _write_matrix(store_dir, f"distances-{int(built_at)}.npy", distances),
+        'durations': _write_matrix(store_dir, f"durations-{int(built_at)}.npy", durations) if durations is not None else None,
+        'router': router,
+        'built_at': built_at,
+    }
+    manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+
+    current = {manifest['distances'], manifest['durations']}
+    for name in os.listdir(store_dir):
+        if name.startswith(('distances-', 'durations-')) and name.endswith('.npy') and name not in current:
+            try:
+                os.remove(os.path.join(store_dir, name))
+            except OSError:
+                pass
+    return manifest_path
+
+
+def _write_matrix(store_dir: str, name: str, matrix: np.ndarray) -> str:
+    tmp_path = os.path.join(store_dir, f"{name}.tmp")
+    with open(tmp_path, 'wb') as f:
+        np.save(f, np.asarray(matrix, dtype=np.int32), allow_pickle=False)
+    os.replace(tmp_path, os.path.join(store_dir, name))
+    return name
+
+
+_stores: Dict[str, MatrixStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_matrix_store(store_dir: str) -> Optional[MatrixStore]:
+    """
+    Process başına açık depo (worker'lar aynı dosyayı page cache üzerinden paylaşır).
+    Manifest değiştiyse (gece yeniden oluşturma) depo yeniden açılır; depo yoksa None.
+    """
+    manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+    try:
+        mtime = os.stat(manifest_path).st_mtime
+    except OSError:
+        return None
+
+    with _stores_lock:
+        store = _stores.get(store_dir)
+        if store is None or store.manifest_mtime != mtime:
+            try:
+                store = MatrixStore(store_dir)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[MatrixStore] WARNING: Mesafe deposu açılamadı ({store_dir}): {e}")
+                return None
+            _stores[store_dir] = store
+        return store
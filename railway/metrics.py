@@ -0,0 +1,68 @@
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Prometheus metrikleri (/metrics): optimizer faz süreleri, OSRM fallback'leri, solver durumları
+# Depo çözümleri havuz worker'larında koşar; worker süreleri sonuç özetinde (summary["timings"])
+# ana process'e taşınır ve burada kaydedilir.
+
+PHASE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+PHASE_SECONDS = Histogram(
+    "optimizer_phase_seconds",
+    "Optimizer faz süreleri (parse, grouping, matrix, model, solve, extract)",
+    ["phase"],
+    buckets=PHASE_BUCKETS,
+)
+MATRIX_SECONDS = Histogram(
+    "optimizer_matrix_seconds",
+    "Mesafe matrisi oluşturma süresi, kaynağa göre (osrm, haversine, cache)",
+    ["source"],
+    buckets=PHASE_BUCKETS,
+)
+OSRM_FALLBACKS = Counter(
+    "optimizer_osrm_fallbacks_total",
+    "OSRM hatası sonrası haversine'e düşülen matris hesapları",
+    ["component"],
+)
+SOLVER_STATUS = Counter(
+    "optimizer_solver_status_total",
+    "Depo çözümlerinin OR-Tools durum kodları",
+    ["status"],
+)
+INFEASIBLE_PROBLEMS = Counter(
+    "optimizer_infeasible_problems_total",
+    "Çözüm öncesi analizde reddedilen isteklerin hata teşhisleri, koda göre",
+    ["code"],
+)
+RESULT_CACHE = Counter(
+    "optimizer_result_cache_total",
+    "İstek sonuç cache'i sorguları (hit, miss, coalesced)",
+    ["outcome"],
+)
+IN_FLIGHT = Gauge(
+    "optimizer_in_flight_solves",
+    "Devam eden optimizasyon istekleri",
+)
+
+
+@contextmanager
+def phase(name: str):
+    """with phase("parse"): ... bloğunun süresini kaydet"""
+    with PHASE_SECONDS.labels(name).time():
+        yield
+
+
+def observe_depot_summary(summary: dict) -> None:
+    """Depo çözüm özetindeki faz sürelerini, matris kaynağını ve solver durumunu kaydet"""
+    timings = summary.get("timings", {})
+    for name, seconds in timings.items():
+        PHASE_SECONDS.labels(name).observe(seconds)
+    source = summary.get("matrix_source")
+    if source:
+        if "matrix" in timings:
+            MATRIX_SECONDS.labels(source).observe(timings["matrix"])
+        if source == "haversine":
+            OSRM_FALLBACKS.labels("optimizer").inc()
+    if summary.get("solver_status"):
+        SOLVER_STATUS.labels(summary["solver_status"]).inc()
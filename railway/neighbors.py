@@ -0,0 +1,78 @@
+import math
+from collections import defaultdict
+from typing import List, Sequence, Tuple
+
+# Büyük modeller için k en yakın komşu (kNN) yay budaması
+# Noktalar düzlemsel (km) koordinatlarda eşit hücreli bir ızgaraya kovalanır; kNN sorgusu
+# sorgu hücresinden başlayıp halka halka genişler, tam N x N mesafe hesabı yapılmaz.
+
+KM_PER_DEG_LAT = 110.57
+KM_PER_DEG_LNG_EQUATOR = 111.32
+# Hücre başına hedeflenen ortalama nokta sayısı
+POINTS_PER_CELL = 4
+
+
+class GridIndex:
+    """(lat, lng) noktaları üzerinde ızgara tabanlı uzamsal indeks"""
+
+    def __init__(self, locations: Sequence[Tuple[float, float]]):
+        mean_lat = sum(lat for lat, _ in locations) / len(locations) if locations else 0.0
+        lng_scale = KM_PER_DEG_LNG_EQUATOR * math.cos(math.radians(mean_lat))
+        self.points = [(lng * lng_scale, lat * KM_PER_DEG_LAT) for lat, lng in locations]
+
+        # Hücre kenarı: kapsayan dikdörtgende hücre başına ortalama POINTS_PER_CELL nokta
+        width = max((x for x, _ in self.points), default=0.0) - min((x for x, _ in self.points), default=0.0)
+        height = max((y for _, y in self.points), default=0.0) - min((y for _, y in self.points), default=0.0)
+        area = max(width * height, width ** 2, height ** 2, 1e-6)
+        self.cell_km = math.sqrt(area * POINTS_PER_CELL / max(len(self.points), 1))
+
+        self.cells = defaultdict(list)
+        for i, point in enumerate(self.points):
+            self.cells[self._cell(point)].append(i)
+
+    def _cell(self, point: Tuple[float, float]) -> Tuple[int, int]:
+        return int(math.floor(point[0] / self.cell_km)), int(math.floor(point[1] / self.cell_km))
+
+    def _ring(self, center: Tuple[int, int], ring: int):
+        cx, cy = center
+        if ring == 0:
+            yield center
+            return
+        for dx in range(-ring, ring + 1):
+            yield cx + dx, cy - ring
+            yield cx + dx, cy + ring
+        for dy in range(-ring + 1, ring):
+            yield cx - ring, cy + dy
+            yield cx + ring, cy + dy
+
+    def nearest(self, i: int, k: int) -> List[int]:
+        """i noktasının kendisi hariç en yakın k noktası (yakından uzağa)"""
+        k = min(k, len(self.points) - 1)
+        if k <= 0:
+            return []
+        x, y = self.points[i]
+        center = self._cell(self.points[i])
+        found = []  # (uzaklık², nokta)
+        ring = 0
+        while True:
+            for cell in self._ring(center, ring):
+                for j in self.cells.get(cell, ()):
+                    if j != i:
+                        px, py = self.points[j]
+                        found.append(((px - x) ** 2 + (py - y) ** 2, j))
+            # ring halkasına kadar taranan alan, merkezden en az ring * hücre uzaklığındaki her noktayı kapsar
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= (ring * self.cell_km) ** 2:
+                    break
+            if len(found) == len(self.points) - 1:
+                found.sort()
+                break
+            ring += 1
+        return [j for _, j in found[:k]]
+
+
+def k_nearest(locations: Sequence[Tuple[float, float]], k: int) -> List[List[int]]:
+    """Her nokta için en yakın k noktanın indeksleri"""
+    index = GridIndex(locations)
+    return [index.nearest(i, k) for i in range(len(locations))]
@@ -1,9 +1,29 @@
 from ortools.constraint_solver import routing_enums_pb2
 from ortools.constraint_solver import pywrapcp
 import math
+import multiprocessing
 import os
-import requests
-from typing import List, Dict
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, List, Dict, Optional
+
+from distance_matrix import duration_time_matrix, haversine_matrix, to_int_lists, travel_time_matrix
+from distance_providers import DistanceChain, MatrixStoreProvider, distance_chain
+from feasibility import (
+    InfeasibleProblemError, check_fleet, check_reachability, haversine_reachability, raise_if_infeasible,
+    vehicle_type_domains
+)
+from insertion import insert_cheapest, route_time
+from savings import assign_vehicles, savings_routes
+from local_search import improve_routes
+from matrix_cache import get_matrix_cache
+from fleet_sizing import presize_fleet
+from decomposition import boundary_routes, cluster_boundaries, split_fleet, sweep_clusters
+from neighbors import k_nearest
+from metrics import INFEASIBLE_PROBLEMS, PHASE_SECONDS, SOLVER_STATUS, observe_depot_summary
+from solve_context import MIN_SEARCH_SECONDS, RESULT_RESERVE_SHARE, STALL_MIN_IMPROVEMENT, SolveContext, default_osrm_url
 
 # Multi-depot VRP optimization with OR-Tools
 # Business tiplerine göre servis süreleri (dakika)
@@ -24,6 +44,10 @@ VEHICLE_TYPES = {
     4: {"name": "Romork", "capacity": 36, "fuel": 40}
 }
 
+def business_service_time(customer: dict) -> int:
+    """Business tipine göre servis süresi (dakika)"""
+    return SERVICE_TIMES.get(customer.get("business_type", "default"), SERVICE_TIMES["default"])
+
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Haversine formula ile iki nokta arası mesafe (km)"""
     R = 6371  # Dünya yarıçapı (km)
@@ -46,46 +70,202 @@ def get_osrm_distance_matrix(locations: List[tuple], osrm_url: str = None) -> Li
     OSRM Table API kullanarak gerçek yol mesafesi matrisi hesapla
     Returns: Mesafe matrisi (metre cinsinden)
     """
-    if not osrm_url:
-        osrm_url = os.environ.get('OSRM_URL', 'https://router.project-osrm.org')
-    
-    try:
-        # Koordinatları OSRM formatına çevir: lng,lat
-        coords_str = ';'.join([f"{loc[1]},{loc[0]}" for loc in locations])
-        url = f"{osrm_url}/table/v1/driving/{coords_str}?annotations=distance"
-        
-        print(f"[OR-Tools] OSRM Table API çağrılıyor: {len(locations)} nokta")
-        print(f"[OR-Tools] OSRM URL: {osrm_url}")
-        
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if data.get('code') != 'Ok':
-            raise Exception(f"OSRM error: {data.get('code')}")
-        
+    return to_int_lists(build_distance_matrix(locations, distance_chain(osrm_url or default_osrm_url()))[0])
+
+def build_distance_matrix(locations: List[tuple], chain: DistanceChain, location_ids: List[str] = None) -> tuple:
+    """
+    Mesafe matrisi, kaynak zincirindeki ilk uygun kaynaktan (depo -> cache -> OSRM -> haversine)
+    location_ids: noktaların depo / müşteri id'leri (önceden hesaplanmış depo için)
+    Returns: (int32 mesafe matrisi (metre, numpy), "store" | "cache" | "osrm" | "haversine")
+    """
+    distance_matrix, source = chain.matrix(locations, location_ids)
+    if source == "store":
+        print(f"[OR-Tools] ✓ Mesafe matrisi önceden hesaplanmış depodan okundu: {len(locations)} nokta")
+    elif source == "cache":
+        print(f"[OR-Tools] ✓ Mesafe matrisi cache'ten okundu: {len(locations)} nokta")
+    elif source == "osrm":
         # OSRM distance matrix'i döndür (zaten metre cinsinden)
-        distance_matrix = data['distances']
-        print(f"[OR-Tools] ✓ OSRM Table API başarılı - Gerçek yol mesafesi kullanılıyor")
-        return [[int(d) for d in row] for row in distance_matrix]
-        
-    except Exception as e:
-        print(f"[OR-Tools] ✗ OSRM Table API hatası: {str(e)}")
+        print(f"[OR-Tools] ✓ OSRM Table API başarılı - Gerçek yol mesafesi kullanılıyor ({len(locations)} nokta)")
+    else:
         print(f"[OR-Tools] → Fallback: Haversine (kuş uçuşu) mesafe kullanılıyor")
-        
-        # Fallback: Haversine ile hesapla
-        matrix = []
-        for i, loc1 in enumerate(locations):
-            row = []
-            for j, loc2 in enumerate(locations):
-                if i == j:
-                    row.append(0)
-                else:
-                    dist = haversine_distance(loc1[0], loc1[1], loc2[0], loc2[1])
-                    row.append(int(dist * 1000))  # km'den metreye
-            matrix.append(row)
-        return matrix
+    return distance_matrix, source
+
+def _road_durations(context: SolveContext, matrix_source: str, location_ids: List[str]):
+    """context.road_durations açıksa ve mesafeler depodan geldiyse depodaki yol süreleri (saniye), yoksa None"""
+    if not context.road_durations or matrix_source != "store":
+        return None
+    try:
+        return MatrixStoreProvider(context.matrix_store_dir).durations(location_ids)
+    except Exception as e:
+        print(f"[OR-Tools] WARNING: Road durations unavailable, using average speed: {e}")
+        return None
+
+# Coğrafi ayrıştırma (opsiyonel): dilim başına hedef müşteri sayısı, sınır onarımında
+# dilim başına onarıma giren rota sayısı ve onarım çözümü süre sınırı
+# (deadline verildiyse bütçenin DECOMPOSE_REPAIR_BUDGET_SHARE'i sınır onarımına ayrılır)
+DECOMPOSE_CLUSTER_SIZE = int(os.environ.get('DECOMPOSE_CLUSTER_SIZE', 250))
+DECOMPOSE_REPAIR_ROUTES = 3
+DECOMPOSE_REPAIR_SECONDS = 10
+DECOMPOSE_REPAIR_BUDGET_SHARE = 0.2
+
+# Tasarruf planında yükü araç kapasitesinin bu oranını geçmeyen rotalar dağıtılıp en ucuz konuma eklenir
+SAVINGS_DISSOLVE_LOAD = 0.5
+
+# OPTIMIZER_LOG_LEVEL=DEBUG: müşteri başına satırlar ve OR-Tools arama logu da yazılır
+# (varsayılan INFO: sadece özet satırları; büyük isteklerde log I/O'su çözüm süresini yemesin)
+DEBUG_LOGS = os.environ.get('OPTIMIZER_LOG_LEVEL', 'INFO').upper() == 'DEBUG'
+
+# OR-Tools durum kodu -> adı (numaralar sürümler arasında değişir, enum'dan okunur)
+ROUTING_STATUS = {
+    getattr(pywrapcp.RoutingModel, name): name
+    for name in dir(pywrapcp.RoutingModel) if name.startswith('ROUTING_')
+}
+
+class SolverStatusError(Exception):
+    """Çözüm bulunamadı; status = OR-Tools durum adı (ör. ROUTING_FAIL_TIMEOUT)"""
+    def __init__(self, status: str, message: str):
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+    
+    def __str__(self) -> str:
+        return self.message
+
+# Depo alt problemleri için process havuzu (OR-Tools Python callback'leri GIL'i tutar)
+# OPTIMIZER_WORKERS: worker sayısı (varsayılan CPU sayısı, 1 = seri çözüm)
+_depot_pool = None
+_depot_pool_lock = threading.Lock()
+
+# Havuz worker'larına taşınan durdurma isteğinin (iş iptali) yoklanma aralığı
+STOP_POLL_SECONDS = 0.2
+
+def get_optimizer_workers() -> int:
+    return max(1, int(os.environ.get('OPTIMIZER_WORKERS', os.cpu_count() or 1)))
+
+def _get_depot_pool() -> ProcessPoolExecutor:
+    """
+    Kalıcı havuz: worker'lar istekler arasında yeniden kullanılır (OR-Tools import maliyeti bir kez).
+    Boyutu bir kez OPTIMIZER_WORKERS'tan alınır; isteğin eşzamanlılığı gönderdiği görev sayısıyla sınırlanır
+    """
+    global _depot_pool
+    with _depot_pool_lock:
+        if _depot_pool is None:
+            # spawn: uvicorn thread'leri varken fork güvenli değil
+            _depot_pool = ProcessPoolExecutor(
+                max_workers=get_optimizer_workers(), mp_context=multiprocessing.get_context('spawn')
+            )
+        return _depot_pool
+
+def _reset_depot_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Bozulan havuzu bırak (bir sonraki istek yenisini oluşturur). Bozuk havuzun future'ları zaten hata ile
+    biter; diğer isteklerin future'ları iptal edilmez
+    """
+    global _depot_pool
+    with _depot_pool_lock:
+        if _depot_pool is pool:
+            _depot_pool = None
+    pool.shutdown(wait=False)
+
+class _SolutionStream:
+    """
+    Depo çözücülerinin ara çözüm olaylarını on_solution geri çağrısına taşır.
+    Solver GIL'i arama boyunca tuttuğu için akışta depolar her zaman havuz worker'larında
+    çözülür; olaylar Manager kuyruğuyla gelir. on_solution False döndürürse tüm depolarda
+    arama durdurulur.
+    """
+
+    def __init__(self, on_solution: Callable[[dict], Optional[bool]]):
+        self._manager = multiprocessing.get_context('spawn').Manager()
+        self.queue = self._manager.Queue()
+        self.stop_event = self._manager.Event()
+        self._on_solution = on_solution
+        self._thread = threading.Thread(target=self._pump, name="vrp-solution-stream", daemon=True)
+        self._thread.start()
+
+    def _pump(self) -> None:
+        while True:
+            event = self.queue.get()
+            if event is None:
+                return
+            try:
+                if self._on_solution(event) is False:
+                    self.stop_event.set()
+            except Exception as e:
+                print(f"[OR-Tools] WARNING: on_solution callback failed, stopping search: {e}")
+                self.stop_event.set()
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self._thread.join()
+        self._manager.shutdown()
+
+class _StopRelay:
+    """
+    Ana process'teki stop_event'i (ör. iş iptali, threading.Event) havuz worker'larının görebildiği
+    Manager Event'ine taşır; worker'ların at-solution callback'i set edildiğini görünce aramayı bitirir.
+    """
+
+    def __init__(self, stop_event):
+        self._manager = multiprocessing.get_context('spawn').Manager()
+        self.event = self._manager.Event()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._relay, args=(stop_event,), name="vrp-stop-relay", daemon=True)
+        self._thread.start()
+
+    def _relay(self, stop_event) -> None:
+        while not self._closed.wait(STOP_POLL_SECONDS):
+            if stop_event.is_set():
+                self.event.set()
+                return
+
+    def close(self) -> None:
+        self._closed.set()
+        self._thread.join()
+        self._manager.shutdown()
+
+def _add_solution_reporter(routing, manager, vehicles: list, node_customers: list, depot: dict, progress_queue, stop_event):
+    """
+    At-solution callback: her iyileşen çözümde (amaç, kullanılan araç, rotalar) olayını kuyruğa yazar.
+    stop_event set edildiyse (istemci erken kabul etti / bağlantı koptu / iş iptal edildi) aramayı bitirir.
+    progress_queue None ise sadece durdurma denetlenir.
+    """
+    started = time.time()
+    state = {"best": None, "count": 0}
+
+    def report():
+        if stop_event is not None and stop_event.is_set():
+            routing.solver().FinishCurrentSearch()
+            return
+        if progress_queue is None:
+            return
+        objective = routing.CostVar().Value()
+        if state["best"] is not None and objective >= state["best"]:
+            return  # GLS iyileşmeyen komşulukları da kabul eder, sadece iyileşmeleri yayınla
+        state["best"] = objective
+        state["count"] += 1
+
+        routes = []
+        for vehicle_id in range(len(vehicles)):
+            index = routing.NextVar(routing.Start(vehicle_id)).Value()
+            customer_ids = []
+            while not routing.IsEnd(index):
+                customer_ids.append(node_customers[manager.IndexToNode(index) - 1]["id"])
+                index = routing.NextVar(index).Value()
+            if customer_ids:
+                routes.append({"vehicle_id": vehicles[vehicle_id]["id"], "customer_ids": customer_ids})
+
+        progress_queue.put({
+            "depot_id": depot["id"],
+            "solution_index": state["count"],
+            "objective": objective,
+            "vehicles_used": len(routes),
+            "elapsed_seconds": round(time.time() - started, 3),
+            "routes": routes,
+        })
+
+    routing.AddAtSolutionCallback(report)
+    return report
 
 def time_to_minutes(time_str: str) -> int:
     """Convert HH:MM time string to minutes from start of day"""
@@ -123,8 +303,36 @@ def parse_time_constraint(constraint: str) -> tuple:
     
     return (0, 24 * 60)
 
-def optimize_routes(depots: list, customers: list, vehicles: list, fuel_price: float = 47.50) -> dict:
-    """Multi-depot VRP optimizer"""
+def optimize_routes(depots: list, customers: list, vehicles: list, fuel_price: float = 47.50, max_workers: int = None,
+                    time_limit_seconds: int = 300, on_solution: Callable[[dict], Optional[bool]] = None,
+                    initial_routes: Optional[List[dict]] = None, decompose: bool = False,
+                    nearest_neighbors: Optional[int] = None, context: Optional[SolveContext] = None,
+                    stop_event=None) -> dict:
+    """
+    Multi-depot VRP optimizer (depolar paralel çözülür, sonuçlar depo sırasıyla birleştirilir)
+    on_solution verilirse ilk çözümde durulmaz: her depodaki her iyileşen çözüm
+    {depot_id, solution_index, objective, vehicles_used, elapsed_seconds, routes} olayıyla
+    bildirilir ve arama time_limit_seconds'a kadar sürer. on_solution False döndürürse
+    arama durur ve o ana kadarki en iyi çözüm döndürülür.
+    on_solution ve context.deadline yoksa ilk çözüm kabul edilir: soğuk başlangıçta bu tasarruf planıdır
+    (context.savings_start), OR-Tools araması yapılmaz ve time_limit_seconds etkisizdir; plan yalnızca
+    son iyileştirmeden (2-opt / Or-opt / relocate) geçer.
+    initial_routes: önceki plan [{vehicle_id, customer_ids}] - arama bu plandan başlar (warm start)
+    decompose: DECOMPOSE_CLUSTER_SIZE'dan büyük depolar açısal dilimlere bölünüp paralel çözülür,
+    ardından komşu dilim sınırları onarılır
+    nearest_neighbors: k verilirse her müşteriden çıkan yaylar k en yakın komşusu + depo dönüşü ile sınırlanır
+    context: istek ayarları (router, süre sınırı, hız, maliyetler); verilirse fuel_price ve
+    time_limit_seconds yerine kullanılır, verilmezse bu ikisi + varsayılan router'dan oluşturulur.
+    context.deadline verilirse kalan süre alt problemlere büyüklükleriyle orantılı bölünür
+    (matris çekimi + model + arama); arama ilk çözümde durmaz, bütçe bitene / stall'a kadar sürer
+    stop_event: set edilirse (ör. iş iptali) depo aramaları bir sonraki çözümde biter ve o ana kadarki
+    en iyi çözüm döner (on_solution'suz aramalar için; akışta on_solution False döndürür)
+    """
+    if context is None:
+        context = SolveContext.create(fuel_price=fuel_price, time_limit_seconds=time_limit_seconds)
+    
+    grouping_started = time.perf_counter()
+    
     # Group customers by depot
     customers_by_depot = {}
     for depot in depots:
@@ -134,15 +342,21 @@ def optimize_routes(depots: list, customers: list, vehicles: list, fuel_price: f
     print(f"[OR-Tools] Total customers to group: {len(customers)}")
     
     # Assign each customer to their assigned depot
+    unassigned = 0
     for customer in customers:
         depot_id = customer.get("depot_id")
-        print(f"[OR-Tools] Customer {customer.get('id')} ({customer.get('name')}): depot_id={depot_id}")
+        if DEBUG_LOGS:
+            print(f"[OR-Tools] Customer {customer.get('id')} ({customer.get('name')}): depot_id={depot_id}")
         if depot_id and depot_id in customers_by_depot:
             customers_by_depot[depot_id].append(customer)
         else:
             # Fallback: assign to first depot if no depot_id
-            print(f"[OR-Tools] WARNING: Customer {customer.get('id')} has no depot_id, assigning to first depot")
+            unassigned += 1
+            if DEBUG_LOGS:
+                print(f"[OR-Tools] WARNING: Customer {customer.get('id')} has no depot_id, assigning to first depot")
             customers_by_depot[depots[0]["id"]].append(customer)
+    if unassigned:
+        print(f"[OR-Tools] WARNING: {unassigned} customers have no depot_id, assigned to first depot")
     
     print(f"[OR-Tools] Customers grouped by depot:")
     for depot_id, depot_custs in customers_by_depot.items():
@@ -162,11 +376,8 @@ def optimize_routes(depots: list, customers: list, vehicles: list, fuel_price: f
     total_capacity = sum(v.get("capacity_pallets", 26) for v in vehicles)
     print(f"[OR-Tools] Total demand: {total_demand} pallets, Total capacity: {total_capacity} pallets")
     
-    if total_demand > total_capacity:
-        raise ValueError(f"Insufficient capacity: {total_demand} > {total_capacity}")
-    
-    # Optimize each depot separately
-    all_routes = []
+    # Depo başına araç dağıtımı (sıralı, deterministik)
+    depot_tasks = []
     vehicle_offset = 0
     
     for depot in depots:
@@ -193,30 +404,701 @@ def optimize_routes(depots: list, customers: list, vehicles: list, fuel_price: f
         
         print(f"[OR-Tools] Optimizing depot {depot['id']}: {len(depot_customers)} customers, {depot_demand} pallets, {len(depot_vehicles)} vehicles")
         
-        # Optimize this depot
-        depot_result = _optimize_single_depot(depot, depots, depot_customers, depot_vehicles, fuel_price)
-        
-        # Add depot routes to all routes
-        all_routes.extend(depot_result["routes"])
+        depot_tasks.append({
+            "primary_depot": depot,
+            "all_depots": depots,
+            "customers": depot_customers,
+            "vehicles": depot_vehicles,
+            "context": context,
+            "initial_routes": initial_routes,
+            "nearest_neighbors": nearest_neighbors,
+        })
         vehicle_offset += vehicles_for_depot
     
+    # Çözüm öncesi uygulanabilirlik: tüm depoların teşhisleri toplanır, hata varsa solver hiç başlamaz
+    feasibility_started = time.perf_counter()
+    diagnostics = _presolve_diagnostics(depot_tasks, context)
+    feasibility_seconds = time.perf_counter() - feasibility_started
+    PHASE_SECONDS.labels("feasibility").observe(feasibility_seconds)
+    if context.allow_drops:
+        # Bırakma modu: müşteriye özgü hatalar o müşteriyi çözüm öncesi bırakır, kalan fazlalığı solver bırakır
+        dropped_customers = _predrop_customers(depot_tasks, diagnostics)
+        depot_tasks = [task for task in depot_tasks if task["customers"]]
+        warnings = [d for d in diagnostics if d["severity"] != "error"]
+    else:
+        dropped_customers = []
+        try:
+            warnings = raise_if_infeasible(diagnostics)
+        except ValueError:
+            for diagnostic in diagnostics:
+                if diagnostic["severity"] == "error":
+                    INFEASIBLE_PROBLEMS.labels(diagnostic["code"]).inc()
+            raise
+    
+    # Ayrıştırma: büyük depo görevi dilim görevlerine bölünür; groups[i] = (depo görevi, dilimler, görev aralığı)
+    groups = []
+    solve_tasks = []
+    for task in depot_tasks:
+        clusters = _plan_clusters(task) if decompose else None
+        start = len(solve_tasks)
+        if clusters:
+            fleets = split_fleet(clusters, task["vehicles"])
+            solve_tasks.extend(dict(task, customers=c, vehicles=f) for c, f in zip(clusters, fleets))
+        else:
+            solve_tasks.append(task)
+        groups.append((task, clusters, range(start, len(solve_tasks))))
+    
+    grouping_seconds = time.perf_counter() - grouping_started - feasibility_seconds
+    PHASE_SECONDS.labels("grouping").observe(grouping_seconds)
+    
+    # Havuz OPTIMIZER_WORKERS boyutunda: max_workers bundan büyükse bütçeler gerçek eşzamanlılığa göre bölünsün
+    workers = min(max_workers or get_optimizer_workers(), get_optimizer_workers(), len(solve_tasks))
+    
+    if context.deadline is not None:
+        reserve = RESULT_RESERVE_SHARE + (DECOMPOSE_REPAIR_BUDGET_SHARE if any(g[1] for g in groups) else 0)
+        budgets = _task_budgets(solve_tasks, workers, context, reserve)
+        solve_tasks = [dict(task, budget_seconds=budget) for task, budget in zip(solve_tasks, budgets)]
+        print(f"[OR-Tools] Deadline budget: {context.remaining_seconds():.1f}s remaining, "
+              f"{len(solve_tasks)} tasks ({', '.join(f'{b:.1f}s' for b in budgets)})")
+    
+    stream = _SolutionStream(on_solution) if on_solution else None
+    if stream:
+        solve_tasks = [dict(task, progress_queue=stream.queue, stop_event=stream.stop_event) for task in solve_tasks]
+    in_process = workers <= 1 and stream is None
+    relay = None
+    if stop_event is not None and stream is None:
+        # Seri çözümde olay doğrudan okunur; havuz worker'larına Manager Event'i ile taşınır
+        relay = None if in_process else _StopRelay(stop_event)
+        shared_stop = stop_event if in_process else relay.event
+        solve_tasks = [dict(task, stop_event=shared_stop) for task in solve_tasks]
+    repaired_pairs = 0
+    try:
+        task_results = _solve_depots(solve_tasks, workers, in_process=in_process)
+        
+        # Add depot routes to all routes (depo sırası korunur)
+        all_routes = []
+        for result in task_results:
+            dropped_customers.extend(result.get("dropped_customers", []))
+        for task, clusters, task_range in groups:
+            if not clusters:
+                all_routes.extend(task_results[task_range.start]["routes"])
+                continue
+            cluster_routes = [task_results[i]["routes"] for i in task_range]
+            # Onarım görevi tüm depo filosunu görür (stream anahtarları dilim görevinden gelir)
+            repair_base = dict(solve_tasks[task_range.start], customers=task["customers"], vehicles=task["vehicles"])
+            cluster_routes, improved = _repair_boundaries(repair_base, clusters, cluster_routes, workers, in_process)
+            repaired_pairs += improved
+            for routes in cluster_routes:
+                all_routes.extend(routes)
+    finally:
+        if stream:
+            stream.close()
+        if relay:
+            relay.close()
+    depot_results = task_results
+    
     # Calculate summary statistics
     total_distance = sum(route["distance_km"] for route in all_routes)
     
+    summary = {
+        "total_routes": len(all_routes),
+        "total_distance_km": round(total_distance, 2),
+        "total_vehicles_used": len(all_routes),
+        "algorithm": "OR-Tools"
+    }
+    decomposed = [clusters for _, clusters, _ in groups if clusters]
+    if decomposed:
+        summary["decomposition"] = {
+            "depots": len(decomposed),
+            "clusters": sum(len(clusters) for clusters in decomposed),
+            "repaired_boundaries": repaired_pairs,
+        }
+    if nearest_neighbors:
+        pruned = [r["summary"]["neighbors"] for r in depot_results if r["summary"].get("neighbors")]
+        summary["neighbors"] = {
+            "k": nearest_neighbors,
+            "pruned_depots": len(pruned),
+            "arcs_kept": sum(n["arcs_kept"] for n in pruned),
+            "arcs_total": sum(n["arcs_total"] for n in pruned),
+        }
+    summary["search_seconds"] = round(sum(r["summary"]["search_seconds"] for r in depot_results), 3)
+    # Depo fazları depolar üzerinden toplanır (paralel çözümde duvar süresi değil, iş süresi)
+    timings = {"grouping": round(grouping_seconds, 4), "feasibility": round(feasibility_seconds, 4)}
+    for r in depot_results:
+        for name, seconds in r["summary"].get("timings", {}).items():
+            timings[name] = round(timings.get(name, 0) + seconds, 4)
+    summary["timings"] = timings
+    if any(r["summary"].get("vehicle_classes") for r in depot_results):
+        summary["vehicle_classes"] = sum(r["summary"].get("vehicle_classes", 0) for r in depot_results)
+    vehicle_types = [r["summary"]["vehicle_types"] for r in depot_results if r["summary"].get("vehicle_types")]
+    if vehicle_types:
+        summary["vehicle_types"] = {
+            name: sum(stats[name] for stats in vehicle_types) for name in ("restricted", "penalized", "mismatched")
+        }
+    initial_solutions = {}
+    for r in depot_results:
+        kind = r["summary"].get("initial_solution")
+        initial_solutions[kind] = initial_solutions.get(kind, 0) + 1
+    summary["initial_solutions"] = initial_solutions
+    fleets = [r["summary"]["fleet"] for r in depot_results if r["summary"].get("fleet")]
+    if fleets:
+        summary["fleet"] = {
+            "available": sum(f["available"] for f in fleets),
+            "presized": sum(f["presized"] for f in fleets),
+            "widened_depots": sum(1 for f in fleets if f["widened"]),
+        }
+    post_optimized = [r["summary"]["post_optimize"] for r in depot_results if r["summary"].get("post_optimize")]
+    if post_optimized:
+        summary["post_optimize"] = {key: sum(p[key] for p in post_optimized) for key in ("moves", "gain")}
+    fallbacks = sum(1 for r in depot_results if r["summary"].get("solver_fallback"))
+    if fallbacks:
+        summary["solver_fallback_depots"] = fallbacks
+    if warnings:
+        summary["diagnostics"] = warnings
+    if context.allow_drops:
+        summary["dropped"] = len(dropped_customers)
+    if context.deadline is not None:
+        budgets = [r["summary"]["budget"] for r in depot_results]
+        summary["budget"] = {
+            "search_limit_seconds": round(sum(b["search_limit_seconds"] for b in budgets), 3),
+            "stalled_depots": sum(1 for b in budgets if b["stalled"]),
+            "remaining_seconds": round(context.remaining_seconds(), 3),
+        }
+    if initial_routes:
+        warm_starts = [r["summary"].get("warm_start") for r in depot_results]
+        summary["warm_start"] = {
+            "depots": sum(1 for w in warm_starts if w),
+            "cold_start_depots": sum(1 for w in warm_starts if not w),
+            "kept_stops": sum(w["kept_stops"] for w in warm_starts if w),
+            "inserted_stops": sum(w["inserted_stops"] for w in warm_starts if w),
+        }
+    
     return {
         "routes": all_routes,
-        "summary": {
-            "total_routes": len(all_routes),
-            "total_distance_km": round(total_distance, 2),
-            "total_vehicles_used": len(all_routes),
-            "algorithm": "OR-Tools"
-        }
+        "summary": summary,
+        "dropped_customers": dropped_customers
     }
 
-def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: list, vehicles: list, fuel_price: float) -> dict:
-    """Single depot optimization (stable fallback)"""
+def _dropped_customer(customer: dict, depot: dict, reason: str, message: str = None) -> dict:
+    return {
+        "customer_id": customer["id"],
+        "customer_name": customer.get("name"),
+        "depot_id": depot["id"],
+        "demand_pallets": customer.get("demand_pallets", 0),
+        "reason": reason,
+        "message": message,
+    }
+
+def _predrop_customers(depot_tasks: list, diagnostics: List[dict]) -> List[dict]:
+    """
+    allow_drops: müşteriye özgü hata teşhisi olan (sipariş araca sığmıyor, ulaşılamaz) müşterileri
+    depo görevlerinden çıkar (görevler yerinde güncellenir). Returns: bırakılan müşteri kayıtları
+    """
+    reasons = {}
+    for diagnostic in diagnostics:
+        if diagnostic["severity"] == "error" and diagnostic.get("customer_id") is not None:
+            reasons.setdefault(diagnostic["customer_id"], diagnostic)
+    dropped = []
+    if not reasons:
+        return dropped
+    for task in depot_tasks:
+        kept = []
+        for customer in task["customers"]:
+            diagnostic = reasons.get(customer["id"])
+            if diagnostic is None:
+                kept.append(customer)
+            else:
+                dropped.append(_dropped_customer(customer, task["primary_depot"], diagnostic["code"], diagnostic["message"]))
+        task["customers"] = kept
+    print(f"[OR-Tools] Dropped {len(dropped)} customers before solving (allow_drops)")
+    return dropped
+
+def _presolve_diagnostics(depot_tasks: list, context: SolveContext) -> List[dict]:
+    """
+    Depo görevlerinin filo teşhisleri + kuş uçuşu ulaşılabilirlik alt sınırı (matris çekilmeden).
+    Tip uyumsuzlukları worker'da cezalı fallback ile çözüldüğünden tip teşhisleri uyarıdır. ROAD_DURATIONS açıksa süreler
+    ortalama hızdan gelmez; kesin ulaşılabilirlik kontrolü worker'da Time matrisiyle yapılır.
+    """
+    diagnostics = []
+    for task in depot_tasks:
+        depot, customers = task["primary_depot"], task["customers"]
+        diagnostics.extend(check_fleet(depot, customers, task["vehicles"], enforce_vehicle_types=False))
+        if not context.road_durations:
+            diagnostics.extend(haversine_reachability(
+                depot, customers, [business_service_time(c) for c in customers],
+                context.average_speed_kmh, context.max_route_minutes
+            ))
+    if diagnostics:
+        errors = sum(1 for d in diagnostics if d["severity"] == "error")
+        print(f"[OR-Tools] Feasibility: {errors} errors, {len(diagnostics) - errors} warnings")
+    return diagnostics
+
+def _task_budgets(solve_tasks: list, workers: int, context: SolveContext, reserve_share: float) -> List[float]:
+    """
+    Deadline'a kalan sürenin alt problemlere bölünmesi (saniye): görev müşteri sayısıyla orantılı pay alır.
+    workers görev aynı anda çözüldüğünden görevin payı workers * n_i / toplam (en fazla kalan sürenin tamamı).
+    reserve_share: sonuçların birleştirilmesi / sınır onarımı için ayrılan oran
+    """
+    available = max(0.0, context.remaining_seconds()) * (1 - reserve_share)
+    sizes = [max(1, len(task["customers"])) for task in solve_tasks]
+    total = sum(sizes)
+    return [available * min(1.0, workers * size / total) for size in sizes]
+
+def _add_stall_limit(routing, stall_seconds: float) -> dict:
+    """
+    At-solution callback: stall_seconds boyunca en iyi amaç STALL_MIN_IMPROVEMENT oranında
+    iyileşmezse aramayı bitirir (en iyi çözüm döner). Greedy descent her adımda çok küçük de olsa
+    iyileştirdiği için oran eşiği olmadan stall hiç görülmez.
+    Returns: durum {best, improved_at, stalled, callback}
+    """
+    state = {"best": None, "improved_at": time.time(), "stalled": False}
+
+    def check():
+        objective = routing.CostVar().Value()
+        now = time.time()
+        if state["best"] is None or objective < state["best"] * (1 - STALL_MIN_IMPROVEMENT):
+            state["best"] = objective
+            state["improved_at"] = now
+        elif now - state["improved_at"] >= stall_seconds:
+            state["stalled"] = True
+            routing.solver().FinishCurrentSearch()
+
+    routing.AddAtSolutionCallback(check)
+    # Referans arama boyunca tutulur (callback çöp toplanmasın)
+    state["callback"] = check
+    return state
+
+def _plan_clusters(task: dict) -> Optional[List[list]]:
+    """Depo görevi için açısal dilimler; ayrıştırmaya gerek yoksa None"""
+    customers = task["customers"]
+    num_clusters = min(math.ceil(len(customers) / DECOMPOSE_CLUSTER_SIZE), len(task["vehicles"]))
+    if num_clusters < 2:
+        return None
+    clusters = sweep_clusters(task["primary_depot"], customers, num_clusters)
+    print(f"[OR-Tools] Decomposition: depot {task['primary_depot']['id']} -> {len(clusters)} clusters "
+          f"({', '.join(str(len(c)) for c in clusters)} customers)")
+    return clusters if len(clusters) > 1 else None
+
+def _repair_boundaries(task: dict, clusters: List[list], cluster_routes: List[list], workers: int, in_process: bool) -> tuple:
+    """
+    Komşu dilim çiftlerinin sınıra en yakın rotalarını birlikte yeniden çöz (mevcut rotalardan
+    warm start, kısa yerel arama). Toplam maliyet düşerse rotalar değiştirilir.
+    Aynı turdaki çiftler ortak dilim paylaşmaz ve paralel çözülür.
+    Returns: (dilim başına rotalar, iyileşen sınır sayısı)
+    """
+    depot = task["primary_depot"]
+    boundaries = cluster_boundaries(depot, clusters)
+    customer_by_id = {c["id"]: c for cluster in clusters for c in cluster}
+    cluster_of = {c["id"]: i for i, cluster in enumerate(clusters) for c in cluster}
+    vehicle_by_id = {v["id"]: v for v in task["vehicles"]}
+    
+    k = len(clusters)
+    pairs = [(i, (i + 1) % k) for i in range(k)] if k > 2 else [(0, 1)]
+    rounds = []
+    while pairs:
+        used, current, rest = set(), [], []
+        for pair in pairs:
+            if used.intersection(pair):
+                rest.append(pair)
+            else:
+                current.append(pair)
+                used.update(pair)
+        rounds.append(current)
+        pairs = rest
+    
+    routes = [list(r) for r in cluster_routes]
+    improved = 0
+    context = task["context"]
+    for round_index, pairs in enumerate(rounds):
+        # Deadline: kalan süre kalan turlara eşit bölünür; tur başına en az bir kısa arama sığmazsa onarım biter
+        budget_seconds = None
+        if context.deadline is not None:
+            budget_seconds = context.remaining_seconds() * (1 - RESULT_RESERVE_SHARE) / (len(rounds) - round_index)
+            if budget_seconds < MIN_SEARCH_SECONDS:
+                print(f"[OR-Tools] Deadline: boundary repair stopped, {len(rounds) - round_index} rounds skipped")
+                break
+        selections = []
+        repair_tasks = []
+        for a, b in pairs:
+            selected = (boundary_routes(depot, routes[a], boundaries[a], DECOMPOSE_REPAIR_ROUTES)
+                        + boundary_routes(depot, routes[b], boundaries[a], DECOMPOSE_REPAIR_ROUTES))
+            if len(selected) < 2:
+                continue
+            selections.append((a, b, selected))
+            repair_tasks.append(dict(
+                task,
+                customers=[customer_by_id[s["customer_id"]] for r in selected for s in r["stops"]],
+                vehicles=[vehicle_by_id[r["vehicle_id"]] for r in selected],
+                initial_routes=[{"vehicle_id": r["vehicle_id"], "customer_ids": [s["customer_id"] for s in r["stops"]]} for r in selected],
+                context=context.replace(time_limit_seconds=DECOMPOSE_REPAIR_SECONDS),
+                budget_seconds=budget_seconds,
+            ))
+        if not repair_tasks:
+            continue
+        
+        # Aynı worker sayısı: kalıcı havuz yeniden oluşturulmaz
+        results = _solve_depots(repair_tasks, workers, in_process=in_process)
+        for (a, b, selected), result in zip(selections, results):
+            before = sum(r["total_cost"] for r in selected)
+            after = sum(r["total_cost"] for r in result["routes"])
+            served = sum(len(r["stops"]) for r in result["routes"])
+            if served < sum(len(r["stops"]) for r in selected) or after >= before - 0.01:
+                continue
+            improved += 1
+            selected_ids = {id(r) for r in selected}
+            routes[a] = [r for r in routes[a] if id(r) not in selected_ids]
+            routes[b] = [r for r in routes[b] if id(r) not in selected_ids]
+            for route in result["routes"]:
+                # Rota, duraklarının çoğunun ait olduğu dilime yazılır (sonraki turların seçimi için)
+                owner_a = sum(1 for s in route["stops"] if cluster_of[s["customer_id"]] == a)
+                routes[a if owner_a * 2 >= len(route["stops"]) else b].append(route)
+            print(f"[OR-Tools] Boundary {a}|{b} repaired: cost {before:.2f} -> {after:.2f}")
+    
+    return routes, improved
+
+def _dropped_customers(routing, manager, solution, depot: dict, node_customers: list, demands: list,
+                       vehicle_capacities: list, vehicle_loads: list, vehicle_domains: list, time_matrix,
+                       context: SolveContext, known_reasons: Dict[str, dict]) -> List[dict]:
+    """
+    Çözümde ziyaret edilmeyen (bırakılan) müşteriler ve nedenleri:
+      unreachable_customer: depo gidiş-dönüşü rota süresini aşıyor
+      penalty: boş uyumlu araçla tek duraklı rota mümkündü, ziyaret maliyeti bırakma cezasını aştı
+      route_duration: uyumlu araçlarda yer var ama rota süresine sığmıyor
+      capacity: hiçbir uyumlu araçta yer kalmadı
+    """
+    dropped = []
+    for node, customer in enumerate(node_customers, start=1):
+        index = manager.NodeToIndex(node)
+        if solution.Value(routing.NextVar(index)) != index:
+            continue
+        known = known_reasons.get(customer["id"])
+        if known is not None:
+            dropped.append(_dropped_customer(customer, depot, known["code"], known["message"]))
+            continue
+        allowed = vehicle_domains[node]
+        compatible = [v for v in range(len(vehicle_capacities)) if allowed is None or v in allowed]
+        fits = [v for v in compatible if vehicle_loads[v] + demands[node] <= vehicle_capacities[v]]
+        round_trip = time_matrix[0][node] + time_matrix[node][0]
+        if any(vehicle_loads[v] == 0 for v in fits) and round_trip <= context.max_route_minutes:
+            reason = "penalty"
+        elif fits:
+            reason = "route_duration"
+        else:
+            reason = "capacity"
+        dropped.append(_dropped_customer(customer, depot, reason))
+    if dropped:
+        print(f"[OR-Tools] Dropped {len(dropped)} customers (allow_drops)")
+    return dropped
+
+def _apply_vehicle_types(routing, manager, vehicles: list, node_customers: list, context: SolveContext) -> tuple:
+    """
+    required_vehicle_type(s) kısıtları (context.enforce_vehicle_types=False ise hiçbiri).
+    Returns: (düğüm başına izin verilen araç kümesi, düğüm başına cezalı tip kümesi, özet) - listeler
+    düğüm indeksli (0 = depo, None = kısıt yok); özet kısıt yoksa None
+    """
+    num_nodes = len(node_customers) + 1
+    if not context.enforce_vehicle_types:
+        return [None] * num_nodes, [None] * num_nodes, None
+    domains, fallbacks = vehicle_type_domains(node_customers, vehicles)
+    domains, fallbacks = [None] + domains, [None] + fallbacks
+    
+    # Aynı tip kümesini isteyen müşteriler aynı domain listesini paylaşır
+    domain_values = {}
+    restricted = 0
+    for node, allowed in enumerate(domains):
+        if allowed is None:
+            continue
+        if allowed not in domain_values:
+            domain_values[allowed] = [-1] + sorted(allowed)
+        routing.VehicleVar(manager.NodeToIndex(node)).SetValues(domain_values[allowed])
+        restricted += 1
+    
+    penalized = sum(1 for types in fallbacks if types is not None)
+    if penalized:
+        # Araç tipi başına birim transit vektörü: uyumsuz müşteri = 1; rota sonundaki toplam cezalandırılır
+        evaluators = {}
+        for vehicle_type in {vehicle["type"] for vehicle in vehicles}:
+            mismatch = [int(types is not None and vehicle_type not in types) for types in fallbacks]
+            evaluators[vehicle_type] = routing.RegisterUnaryTransitVector(mismatch)
+        routing.AddDimensionWithVehicleTransits(
+            [evaluators[vehicle["type"]] for vehicle in vehicles], 0, penalized, True, 'TypeMismatch'
+        )
+        mismatch_dimension = routing.GetDimensionOrDie('TypeMismatch')
+        for vehicle_id in range(len(vehicles)):
+            mismatch_dimension.SetCumulVarSoftUpperBound(routing.End(vehicle_id), 0, context.vehicle_type_penalty)
+    
+    if restricted or penalized:
+        print(f"[OR-Tools] Vehicle types: {restricted} customers restricted, {penalized} penalized fallbacks")
+        return domains, fallbacks, {"restricted": restricted, "penalized": penalized, "mismatched": 0}
+    return domains, fallbacks, None
+
+def _vehicle_classes(vehicles: list) -> List[List[int]]:
+    """Özdeş araç sınıfları: (tip, kapasite, depo, yakıt tüketimi) -> araç indeksleri (filo sırasıyla)"""
+    classes = {}
+    for index, vehicle in enumerate(vehicles):
+        key = (vehicle["type"], vehicle.get("capacity_pallets", 26), vehicle.get("depot_id"), vehicle.get("fuel_consumption"))
+        classes.setdefault(key, []).append(index)
+    return list(classes.values())
+
+def _break_vehicle_symmetry(routing, vehicles: list, preferred_routes: Optional[List[list]] = None) -> int:
+    """
+    Özdeş araçların permütasyonlarını kes: sınıf içinde bir araç ancak önceki araç kullanılıyorsa
+    kullanılabilir. preferred_routes (warm start) verilirse sıra sadece boş (yedek) araçlara
+    uygulanır: planlı araçların zinciri rota boşaltan hamleleri engelleyip araç sayısını artırıyor.
+    Model kapanmadan önce çağrılmalı.
+    Returns: sınıf sayısı
+    """
+    solver = routing.solver()
+    classes = _vehicle_classes(vehicles)
+    for members in classes:
+        if preferred_routes:
+            members = [vehicle for vehicle in members if not preferred_routes[vehicle]]
+        for previous, vehicle in zip(members, members[1:]):
+            solver.Add(routing.ActiveVehicleVar(vehicle) <= routing.ActiveVehicleVar(previous))
+    print(f"[OR-Tools] Symmetry breaking: {len(vehicles)} vehicles in {len(classes)} classes")
+    return len(classes)
+
+def _restrict_to_neighbors(routing, manager, num_depots: int, locations: list, k: int,
+                           keep_routes: Optional[List[List[int]]] = None) -> Optional[dict]:
+    """
+    Müşteri düğümlerinin NextVar alanını k en yakın komşu (simetrik) + rota sonları (depo dönüşü) ile sınırla.
+    Araç başlangıçlarından çıkan yaylar serbesttir. keep_routes (düğüm listeleri) içindeki yaylar
+    korunur ki warm start ataması geçerli kalsın.
+    Returns: {"arcs_kept", "arcs_total"} ya da budama anlamsızsa (müşteri sayısı <= k + 1) None
+    """
+    num_customers = len(locations) - num_depots
+    if k <= 0 or num_customers <= k + 1:
+        return None
+    
+    neighbor_lists = k_nearest(locations[num_depots:], k)
+    allowed = [set(neighbors) for neighbors in neighbor_lists]
+    for i, neighbors in enumerate(neighbor_lists):
+        for j in neighbors:
+            allowed[j].add(i)
+    for route in keep_routes or []:
+        for a, b in zip(route, route[1:]):
+            allowed[a - num_depots].add(b - num_depots)
+    
+    # Rota sonu indeksleri düğüm indekslerinden sonra gelir ([Size(), Size() + araç sayısı)) ve
+    # alanda kalır; [0, Size()) içinde izin verilmeyen aralıklar çıkarılır (binlerce araçta SetValues'tan hızlı)
+    arcs_kept = 0
+    for i, targets in enumerate(allowed):
+        index = manager.NodeToIndex(i + num_depots)
+        next_var = routing.NextVar(index)
+        # Kendisi: düğüm pasif kalabilsin (atlanabilir müşteri disjunction'ları için)
+        keep = sorted([manager.NodeToIndex(j + num_depots) for j in targets] + [index])
+        previous = -1
+        for value in keep + [routing.Size()]:
+            if value > previous + 1:
+                next_var.RemoveInterval(previous + 1, value - 1)
+            previous = value
+        arcs_kept += len(targets) + 1
+    
+    arcs_total = num_customers * num_customers
+    print(f"[OR-Tools] kNN pruning (k={k}): {arcs_kept}/{arcs_total} customer arcs kept "
+          f"({100 * arcs_kept / arcs_total:.1f}%)")
+    return {"arcs_kept": arcs_kept, "arcs_total": arcs_total}
+
+def _solve_depots(depot_tasks: list, workers: int, in_process: bool = True) -> list:
+    """Depo alt problemlerini çöz; sonuç listesi depot_tasks sırasındadır (faz metrikleri burada kaydedilir)"""
+    try:
+        results = _run_depot_tasks(depot_tasks, workers, in_process)
+    except SolverStatusError as e:
+        SOLVER_STATUS.labels(e.status).inc()
+        raise
+    except InfeasibleProblemError as e:
+        for diagnostic in e.diagnostics:
+            if diagnostic["severity"] == "error":
+                INFEASIBLE_PROBLEMS.labels(diagnostic["code"]).inc()
+        raise
+    # Havuz worker'larının matris cache sorguları worker process'inde sayılır: /cache/stats ana
+    # process'in sayaçlarını gösterdiği için özetle gelen sayaçlar burada eklenir
+    matrix_cache = get_matrix_cache() if not in_process else None
+    for result in results:
+        observe_depot_summary(result["summary"])
+        if matrix_cache and result["summary"].get("matrix_cache"):
+            matrix_cache.record(result["summary"]["matrix_cache"])
+    return results
+
+def _run_depot_tasks(depot_tasks: list, workers: int, in_process: bool) -> list:
+    if in_process:
+        return [_optimize_single_depot(**task) for task in depot_tasks]
+    
+    print(f"[OR-Tools] Solving {len(depot_tasks)} depots in parallel ({workers} workers)")
+    pool = _get_depot_pool()
+    # Havuz istekler arasında paylaşılır: bu istek aynı anda en fazla workers görev gönderir,
+    # biten görevin yerine sıradaki gönderilir
+    results = [None] * len(depot_tasks)
+    pending = {}
+    next_task = 0
+    try:
+        while next_task < len(depot_tasks) or pending:
+            while next_task < len(depot_tasks) and len(pending) < workers:
+                pending[pool.submit(_optimize_single_depot, **depot_tasks[next_task])] = next_task
+                next_task += 1
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+    except BrokenProcessPool:
+        # Worker öldü (OOM vb.) - bir sonraki istek için havuzu yeniden oluştur
+        _reset_depot_pool(pool)
+        raise
+    except Exception:
+        # Sadece bu isteğin gönderdiği, henüz başlamamış görevler iptal edilir
+        for future in pending:
+            future.cancel()
+        raise
+    return results
+
+def _warm_start_routes(initial_routes: List[dict], vehicles: list, node_customers: list, demands: list,
+                       vehicle_capacities: list, distance_matrix, time_matrix, context: SolveContext,
+                       vehicle_domains: list = None) -> Optional[dict]:
+    """
+    Önceki planı (araç id -> sıralı müşteri id) bu deponun başlangıç rotalarına çevir.
+    Artık olmayan duraklar çıkarılır, kapasite/süreyi aşan kuyruklar, araç tipi domain'ine
+    uymayan duraklar ve yeni müşteriler en ucuz uygun konuma eklenir. Hepsi yerleştirilemezse None (soğuk başlangıç).
+    Returns: {"routes": araç başına düğüm listesi, "kept_stops", "inserted_stops"}
+    """
+    node_by_customer = {customer["id"]: node for node, customer in enumerate(node_customers, start=1)}
+    vehicle_index = {vehicle["id"]: i for i, vehicle in enumerate(vehicles)}
+    routes = [[] for _ in vehicles]
+    placed = set()
+    
+    for plan in initial_routes:
+        vehicle = vehicle_index.get(plan.get("vehicle_id"))
+        if vehicle is None:
+            continue  # araç bu depoda değil: durakları aşağıda yeniden eklenir
+        route = routes[vehicle]
+        load = 0
+        for customer_id in plan.get("customer_ids", []):
+            node = node_by_customer.get(customer_id)
+            if node is None or node in placed or load + demands[node] > vehicle_capacities[vehicle]:
+                continue
+            if vehicle_domains and vehicle_domains[node] is not None and vehicle not in vehicle_domains[node]:
+                continue
+            route.append(node)
+            placed.add(node)
+            load += demands[node]
+        # Servis süresi / mesafe değiştiyse rota sonundan kırp
+        while route and route_time(route, time_matrix) > context.max_route_minutes:
+            placed.discard(route.pop())
+    
+    kept = len(placed)
+    missing = sorted((node for node in range(1, len(demands)) if node not in placed), key=lambda n: -demands[n])
+    unplaced = insert_cheapest(
+        routes, missing, demands, vehicle_capacities, distance_matrix, time_matrix,
+        context.max_route_minutes, vehicle_fixed_cost=context.vehicle_fixed_cost, allowed_vehicles=vehicle_domains
+    )
+    if unplaced and not context.allow_drops:
+        print(f"[OR-Tools] WARNING: Warm start: {len(unplaced)} stops could not be inserted, cold start")
+        return None
+    
+    # allow_drops: yerleştirilemeyen duraklar başlangıç atamasında ziyaret edilmez (bırakılmış)
+    print(f"[OR-Tools] Warm start: {kept} stops kept, {len(missing) - len(unplaced)} inserted, {len(unplaced)} left out")
+    return {"routes": routes, "kept_stops": kept, "inserted_stops": len(missing) - len(unplaced)}
+
+def _savings_start(demands: list, vehicle_capacities: list, distance_array, distance_matrix, time_array, time_matrix,
+                   context: SolveContext, vehicle_domains: list = None) -> Optional[dict]:
+    """
+    Soğuk başlangıç planı: Clarke-Wright tasarruf rotaları araçlara atanır, araç bulamayan duraklar
+    en ucuz uygun konuma eklenir. Hepsi yerleştirilemezse None (PATH_CHEAPEST_ARC; allow_drops'ta dışarıda kalır).
+    Returns: {"routes": araç başına düğüm listesi, "inserted_stops", "seconds"}
+    """
+    started = time.perf_counter()
+    routes = assign_vehicles(
+        savings_routes(distance_array, time_array, demands, vehicle_capacities, context.max_route_minutes, vehicle_domains),
+        demands, vehicle_capacities, vehicle_domains
+    )
+    # Az dolu artık rotalar (birleşme adayı kalmamış uç rotalar) dağıtılır, durakları diğer rotalara eklenir
+    for vehicle, route in enumerate(routes):
+        if route and sum(demands[node] for node in route) <= vehicle_capacities[vehicle] * SAVINGS_DISSOLVE_LOAD:
+            routes[vehicle] = []
+    placed = {node for route in routes for node in route}
+    missing = sorted((node for node in range(1, len(demands)) if node not in placed), key=lambda n: -demands[n])
+    unplaced = insert_cheapest(
+        routes, missing, demands, vehicle_capacities, distance_matrix, time_matrix,
+        context.max_route_minutes, vehicle_fixed_cost=context.vehicle_fixed_cost, allowed_vehicles=vehicle_domains
+    )
+    seconds = time.perf_counter() - started
+    if unplaced and not context.allow_drops:
+        print(f"[OR-Tools] WARNING: Savings: {len(unplaced)} stops could not be placed, PATH_CHEAPEST_ARC")
+        return None
+    print(f"[OR-Tools] Savings plan: {sum(1 for r in routes if r)} routes, {len(missing) - len(unplaced)} inserted, "
+          f"{len(unplaced)} left out ({seconds * 1000:.1f} ms)")
+    return {"routes": routes, "inserted_stops": len(missing) - len(unplaced), "seconds": seconds}
+
+def _presized_vehicles(vehicles: list, node_customers: list, demands: list, time_array, context: SolveContext,
+                       initial_routes: Optional[List[dict]] = None) -> list:
+    """
+    Modele verilecek araçlar (fleet_sizing.presize_fleet, tip domain'leri tüm filo üzerinden);
+    warm start planındaki araçlar korunur. Küçültme mümkün değilse vehicles aynen döner
+    """
+    domains = [None] * len(demands)
+    if context.enforce_vehicle_types:
+        domains = [None] + vehicle_type_domains(node_customers, vehicles)[0]
+    planned = {plan.get("vehicle_id") for plan in initial_routes or [] if plan.get("customer_ids")}
+    keep = [index for index, vehicle in enumerate(vehicles) if vehicle["id"] in planned]
+    selected = presize_fleet(
+        demands, [v.get("capacity_pallets", 26) for v in vehicles], time_array, context.max_route_minutes, domains, keep
+    )
+    if selected is None:
+        return vehicles
+    print(f"[OR-Tools] Fleet pre-sizing: {len(selected)} of {len(vehicles)} vehicles in the model")
+    return [vehicles[index] for index in selected]
+
+def _unserved_customers(routes: List[List[int]], node_customers: list, drop_reasons: dict) -> int:
+    """Rotalarda yer almayan, depodan ulaşılabilir (drop_reasons'ta olmayan) müşteri sayısı"""
+    served = {node for route in routes for node in route}
+    return sum(
+        1 for node, customer in enumerate(node_customers, start=1)
+        if node not in served and customer["id"] not in drop_reasons
+    )
+
+def _solution_routes(routing, manager, solution, num_vehicles: int) -> List[List[int]]:
+    """Atamadaki araç başına ziyaret sırası (düğüm listeleri, depo yazılmaz)"""
+    node_routes = []
+    for vehicle_id in range(num_vehicles):
+        route = []
+        index = solution.Value(routing.NextVar(routing.Start(vehicle_id)))
+        while not routing.IsEnd(index):
+            route.append(manager.IndexToNode(index))
+            index = solution.Value(routing.NextVar(index))
+        node_routes.append(route)
+    return node_routes
+
+def _relocation_domains(vehicles: list, node_routes: List[List[int]], vehicle_domains: list, type_fallbacks: list) -> list:
+    """
+    Son iyileştirmede düğümlerin taşınabileceği araçlar: araç tipi domain'i; cezalı fallback müşterisi
+    istenen tipteki araçlara (uyumsuz araçtaysa yerinde kalır, ceza artmasın)
+    """
+    domains = list(vehicle_domains)
+    by_types = {}
+    for vehicle_id, route in enumerate(node_routes):
+        for node in route:
+            types = type_fallbacks[node]
+            if types is None:
+                continue
+            if vehicles[vehicle_id]["type"] not in types:
+                domains[node] = frozenset((vehicle_id,))
+                continue
+            if types not in by_types:
+                by_types[types] = frozenset(v for v, vehicle in enumerate(vehicles) if vehicle["type"] in types)
+            domains[node] = by_types[types]
+    return domains
+
+def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: list, vehicles: list, context: SolveContext,
+                           progress_queue=None, stop_event=None, initial_routes: Optional[List[dict]] = None,
+                           nearest_neighbors: Optional[int] = None, budget_seconds: Optional[float] = None,
+                           matrices: Optional[tuple] = None) -> dict:
+    """
+    Single depot optimization (stable fallback)
+    budget_seconds: deadline bütçesinden bu alt probleme ayrılan süre (matris + model + arama)
+    matrices: ön boyutlandırılmış filo yetmediğinde alt küme denemesinin matrisleri; verilirse matrisler
+    yeniden kurulmaz ve model tüm filoyla kurulur (context.presize_fleet açık olsa da)
+    """
     try:
         total_distance = 0
+        task_deadline = context.task_deadline(budget_seconds)
         
         print(f"[OR-Tools] ===== ADIM 1 TEST: DISTANCE + CAPACITY ONLY =====")
         print(f"[OR-Tools] Starting single-depot optimization...")
@@ -236,6 +1118,7 @@ def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: lis
         locations = [(depot_lat, depot_lng)]
         demands = [0]
         service_times_list = [0]  # Store service times for each location
+        node_customers = []  # node i -> node_customers[i - 1] (geçersiz koordinatlar atlanır)
         
         for customer in customers:
             lat = customer["location"]["lat"]
@@ -247,8 +1130,8 @@ def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: lis
                 
             locations.append((lat, lng))
             demands.append(customer.get("demand_pallets", 1))
-            service_duration = customer.get("service_duration", 15)  # Default 15 minutes
-            service_times_list.append(service_duration)
+            service_times_list.append(business_service_time(customer))
+            node_customers.append(customer)
         
         num_locations = len(locations)
         num_vehicles = len(vehicles)
@@ -256,18 +1139,69 @@ def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: lis
         print(f"[OR-Tools] Locations: {num_locations} (1 depot + {num_locations-1} customers)")
         print(f"[OR-Tools] Total demand: {sum(demands)} pallets")
         
-        # Distance matrix - OSRM Table API ile gerçek yol mesafesi
-        print(f"[OR-Tools] ===== MESAFE MATRİSİ HESAPLANIYOR =====")
-        osrm_url = os.environ.get('OSRM_URL', 'https://router.project-osrm.org')
-        distance_matrix = get_osrm_distance_matrix(locations, osrm_url)
-        
-        # Sanity check
-        for i, row in enumerate(distance_matrix):
-            for j, dist in enumerate(row):
-                if dist < 0:
-                    distance_matrix[i][j] = 0
-                elif dist > 20000000:  # 20,000 km üzeri
-                    distance_matrix[i][j] = 20000000
+        if matrices is None:
+            # Distance matrix - OSRM Table API ile gerçek yol mesafesi
+            print(f"[OR-Tools] ===== MESAFE MATRİSİ HESAPLANIYOR =====")
+            matrix_started = time.perf_counter()
+            location_ids = [primary_depot["id"]] + [customer["id"] for customer in node_customers]
+            cache = get_matrix_cache()
+            cache_before = cache.counters() if cache else None
+            distance_array, matrix_source = build_distance_matrix(
+                locations, context.distance_chain(context.matrix_timeout(task_deadline)), location_ids
+            )
+            # Bu matris için cache sorgu sayaçları (özetle ana process'e taşınır)
+            matrix_cache = (
+                {name: count - cache_before[name] for name, count in cache.counters().items()} if cache else None
+            )
+            # OR-Tools matrisleri Python listesi olarak alır; Time matrisi listeden değil numpy dizisinden türetilir
+            distance_matrix = to_int_lists(distance_array)
+            matrix_seconds = time.perf_counter() - matrix_started
+            
+            # Travel time: distance in meters, average speed 60 km/h + service time at destination (0 for depot)
+            # (ROAD_DURATIONS: depodaki OSRM seyahat süreleri + servis süresi)
+            road_durations = _road_durations(context, matrix_source, location_ids)
+            if road_durations is not None:
+                time_array = duration_time_matrix(road_durations, service_times_list)
+                print(f"[OR-Tools] Time dimension uses road durations from the distance store")
+            else:
+                time_array = travel_time_matrix(distance_array, service_times_list, context.average_speed_kmh)
+            
+            # Kesin ulaşılabilirlik: depo -> müşteri -> depo, Time boyutunun kullandığı sürelerle
+            # (allow_drops: ulaşılamayan müşteriyi solver zaten bırakır, neden kaydedilir)
+            reachability = check_reachability(
+                primary_depot, node_customers, time_array[0, 1:], time_array[1:, 0], context.max_route_minutes
+            )
+            drop_reasons = {d["customer_id"]: d for d in reachability}
+            if not context.allow_drops:
+                raise_if_infeasible(reachability)
+            time_matrix = to_int_lists(time_array)
+            matrices = (distance_array, distance_matrix, matrix_source, matrix_cache, matrix_seconds, road_durations,
+                        time_array, time_matrix, drop_reasons)
+            presize = context.presize_fleet
+        else:
+            # Tüm filoyla yeniden çözüm: matrisler alt küme denemesinden (yeniden sorgu / dönüşüm yok)
+            (distance_array, distance_matrix, matrix_source, matrix_cache, matrix_seconds, road_durations,
+             time_array, time_matrix, drop_reasons) = matrices
+            presize = False
+        
+        # Filo ön boyutlandırma: kutulama + süre tahminine (pay ile) yeten araç alt kümesi modele girer;
+        # alt kümeyle çözüm bulunamazsa (ya da müşteri bırakılırsa) tüm filoyla yeniden çözülür.
+        # Sadece kurulu bir başlangıç planıyla (warm start / tasarruf): PATH_CHEAPEST_ARC en küçüğe yakın
+        # filoda ilk çözümü çoğu zaman bulamıyor ve bunu ancak süre sınırında bildiriyor
+        fleet = vehicles
+        if presize and (initial_routes or context.savings_start):
+            vehicles = _presized_vehicles(fleet, node_customers, demands, time_array, context, initial_routes)
+            num_vehicles = len(vehicles)
+        
+        def widened(reason: str) -> dict:
+            """Ön boyutlandırılmış filo yetmedi: kalan bütçeyle tüm filo üzerinde yeniden çözülür"""
+            print(f"[OR-Tools] WARNING: Pre-sized fleet ({len(vehicles)} vehicles) {reason}, retrying with all {len(fleet)} vehicles")
+            result = _optimize_single_depot(
+                primary_depot, all_depots, customers, fleet, context, progress_queue, stop_event, initial_routes,
+                nearest_neighbors, context.remaining_seconds(task_deadline), matrices
+            )
+            result["summary"]["fleet"] = {"available": len(fleet), "presized": len(vehicles), "widened": True}
+            return result
         
         vehicle_capacities = [v.get("capacity_pallets", 26) for v in vehicles]
         total_capacity = sum(vehicle_capacities)
@@ -276,31 +1210,25 @@ def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: lis
         print(f"[OR-Tools] Total capacity: {total_capacity} pallets")
         print(f"[OR-Tools] Demand/Capacity ratio: {total_demand/total_capacity:.2f}")
         
-        if total_demand > total_capacity:
+        if total_demand > total_capacity and not context.allow_drops:
             raise ValueError(f"Insufficient capacity: {total_demand} > {total_capacity}")
         
+        model_started = time.perf_counter()
         manager = pywrapcp.RoutingIndexManager(num_locations, num_vehicles, 0)
         routing = pywrapcp.RoutingModel(manager)
         
-        def distance_callback(from_index, to_index):
-            from_node = manager.IndexToNode(from_index)
-            to_node = manager.IndexToNode(to_index)
-            return distance_matrix[from_node][to_node]
-        
-        transit_callback_index = routing.RegisterTransitCallback(distance_callback)
+        # Transit değerleri bir kez tamsayı matris olarak hesaplanır ve native kaydedilir:
+        # arama döngüsü Python'a hiç geri dönmez
+        transit_callback_index = routing.RegisterTransitMatrix(distance_matrix)
         routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
         
         # Add fixed cost per vehicle to minimize vehicle count
         # This makes using each vehicle "expensive" so optimizer prefers fewer vehicles
         # 10000 units ≈ 10 km equivalent cost per vehicle
-        routing.SetFixedCostOfAllVehicles(10000)
-        print(f"[OR-Tools] Fixed vehicle cost: 10000 (prioritizes fewer vehicles)")
-        
-        def demand_callback(from_index):
-            from_node = manager.IndexToNode(from_index)
-            return demands[from_node]
+        routing.SetFixedCostOfAllVehicles(context.vehicle_fixed_cost)
+        print(f"[OR-Tools] Fixed vehicle cost: {context.vehicle_fixed_cost} (prioritizes fewer vehicles)")
         
-        demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
+        demand_callback_index = routing.RegisterUnaryTransitVector(demands)
         routing.AddDimensionWithVehicleCapacity(
             demand_callback_index,
             0,
@@ -311,72 +1239,21 @@ def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: lis
         
         print(f"[OR-Tools] Capacity dimension added")
         
-        # Vehicle type constraints - RELAXED APPROACH
-        # We log vehicle type preferences but don't enforce them strictly
-        # This ensures OR-Tools can always find a solution
-        print(f"[OR-Tools] ===== VEHICLE TYPE CONSTRAINTS: RELAXED =====")
-        
-        # Map vehicle type names to integers  
-        type_mapping = {
-            "kamyonet": 0,
-            "kamyon_1": 1,
-            "kamyon_2": 2,
-            "tir": 3,
-            "romork": 4
-        }
-        
-        # Log vehicle type preferences for visibility
-        constraint_count = 0
-        for customer_idx, customer in enumerate(customers):
-            required_type = customer.get("required_vehicle_type")
-            if required_type:
-                constraint_count += 1
-                print(f"[OR-Tools] Customer {customer['name']} prefers: {required_type} (not enforced)")
-        
-        if constraint_count > 0:
-            print(f"[OR-Tools] Found {constraint_count} vehicle type preferences (logged only)")
-        else:
-            print(f"[OR-Tools] No vehicle type preferences specified")
-        
-        # NOTE: Strict vehicle type constraints are disabled to ensure feasibility
-        # In production, consider implementing this as a post-optimization filter or
-        # using OR-Tools allowed/forbidden arc callbacks with proper slack
+        # Vehicle type constraints: uyumlu araç kümeleri VehicleVar domain'i olarak bir kez uygulanır;
+        # kesin uygulanamayanlar (uyumlu araç / kapasite yok) TypeMismatch cezasıyla çözülür
+        vehicle_domains, type_fallbacks, vehicle_type_stats = _apply_vehicle_types(
+            routing, manager, vehicles, node_customers, context
+        )
         
         # Add Time dimension for duration tracking
         print(f"[OR-Tools] ===== ADDING TIME DIMENSION =====")
-        
-        def time_callback(from_index, to_index):
-            """Calculate travel + service time between nodes"""
-            try:
-                from_node = manager.IndexToNode(from_index)
-                to_node = manager.IndexToNode(to_index)
-                
-                # Travel time: distance in meters, average speed 60 km/h
-                # Formula: (distance_km / speed_kmh) * 60 minutes = travel time in minutes
-                distance_km = distance_matrix[from_node][to_node] / 1000.0
-                average_speed_kmh = 60.0
-                travel_time_minutes = (distance_km / average_speed_kmh) * 60.0
-                
-                # Service time at destination (0 for depot)
-                if to_node == 0:
-                    service_time_minutes = 0
-                else:
-                    customer = customers[to_node - 1]
-                    business_type = customer.get("business_type", "default")
-                    service_time_minutes = SERVICE_TIMES.get(business_type, SERVICE_TIMES["default"])
-                
-                return int(travel_time_minutes + service_time_minutes)
-            except Exception as e:
-                print(f"[OR-Tools] ERROR in time_callback: {e}")
-                return 999999
-        
-        time_callback_index = routing.RegisterTransitCallback(time_callback)
+        time_callback_index = routing.RegisterTransitMatrix(time_matrix)
         
         # Time dimension: max 1440 minutes per route (24 hours)
         routing.AddDimension(
             time_callback_index,
             120,  # slack: 120 minutes (2 hours)
-            1440,  # max: 1440 minutes (24 hours) per vehicle
+            context.max_route_minutes,  # max: 1440 minutes (24 hours) per vehicle
             True,  # start cumul to zero
             'Time'
         )
@@ -389,6 +1266,12 @@ def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: lis
             print(f"[OR-Tools] ✗ CRITICAL: Time dimension NOT found after AddDimension! Error: {e}")
             raise Exception(f"Time dimension creation failed: {e}")
         
+        # Bırakma modu: her müşteri tek düğümlü, cezalı disjunction (ceza pallet ve öncelikle artar)
+        if context.allow_drops:
+            for node, customer in enumerate(node_customers, start=1):
+                routing.AddDisjunction([manager.NodeToIndex(node)], context.drop_penalty_for(customer))
+            print(f"[OR-Tools] Drop disjunctions added for {len(node_customers)} customers")
+        
         search_parameters = pywrapcp.DefaultRoutingSearchParameters()
         
         # Use PATH_CHEAPEST_ARC - fastest initial solution strategy
@@ -402,30 +1285,118 @@ def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: lis
         )
         
         # Increase timeout to 5 minutes for complex problems
-        search_parameters.time_limit.seconds = 300
-        search_parameters.log_search = True
-        
-        # Accept first feasible solution quickly
-        search_parameters.solution_limit = 1
-        
-        print(f"[OR-Tools] Solving with PATH_CHEAPEST_ARC + AUTOMATIC metaheuristic (300s limit)...")
+        # (deadline: matris + model sonrası kalan görev bütçesi, time_limit_seconds'ı aşmaz; son iyileştirmenin
+        # bütçesi önceden ayrılır, yoksa arama kalan sürenin hepsini alır ve son iyileştirme atlanır)
+        search_deadline = task_deadline - context.post_optimize_seconds if task_deadline is not None else None
+        search_limit = context.search_seconds(search_deadline)
+        search_parameters.time_limit.FromMilliseconds(int(search_limit * 1000))
+        search_parameters.log_search = DEBUG_LOGS
+        
+        if progress_queue is not None:
+            # Canlı akış: ilk çözüm hemen yayınlanır, GLS zaman limitine / durdurulana kadar iyileştirir
+            search_parameters.local_search_metaheuristic = (
+                routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+            )
+        if progress_queue is not None or stop_event is not None:
+            # Referans arama boyunca tutulur (callback çöp toplanmasın)
+            solution_reporter = _add_solution_reporter(
+                routing, manager, vehicles, node_customers, primary_depot, progress_queue, stop_event
+            )
+        
+        # Warm start: önceki plandan başlangıç ataması; yerel arama oradan devam eder.
+        # Soğuk başlangıçta ilk plan Clarke-Wright tasarruf sezgiselinden gelir (PATH_CHEAPEST_ARC yerine)
+        warm_start = None
+        savings_start = None
+        initial_assignment = None
+        if initial_routes:
+            warm_start = _warm_start_routes(
+                initial_routes, vehicles, node_customers, demands, vehicle_capacities, distance_matrix, time_matrix, context,
+                vehicle_domains
+            )
+            if fleet is not vehicles and warm_start is None:
+                return widened("cannot place every customer in the warm start plan")
+        elif context.savings_start:
+            savings_start = _savings_start(
+                demands, vehicle_capacities, distance_array, distance_matrix, time_array, time_matrix, context, vehicle_domains
+            )
+            # Ön boyutlandırılmış filoda tasarruf planı hızlı uygunluk sınamasıdır: ulaşılabilir her müşteriyi
+            # yerleştiremiyorsa arama (PATH_CHEAPEST_ARC süre sınırına kadar) beklenmeden filo genişletilir
+            if fleet is not vehicles and (
+                savings_start is None or _unserved_customers(savings_start["routes"], node_customers, drop_reasons)
+            ):
+                return widened("cannot place every customer in the savings plan")
+        start_routes = (warm_start or savings_start or {}).get("routes")
+        
+        # Özdeş araç sınıflarında yedek araçların sıralı kullanımı: sadece bir atamadan devam eden yerel aramada.
+        # İlk çözüm sezgiseli (PATH_CHEAPEST_ARC) bu yan kısıtla çok daha fazla araç açıyor / zaman
+        # aşımına düşüyor; soğuk başlangıçta OR-Tools boş araçları zaten sınıf başına bir kez dener.
+        vehicle_classes = None
+        if context.break_symmetry and start_routes:
+            vehicle_classes = _break_vehicle_symmetry(routing, vehicles, start_routes)
+        
+        # kNN budaması model kapanmadan önce (başlangıç planının yayları korunur)
+        pruning = None
+        if nearest_neighbors:
+            pruning = _restrict_to_neighbors(routing, manager, 1, locations, nearest_neighbors, start_routes)
+        if start_routes:
+            routing.CloseModelWithParameters(search_parameters)
+            initial_assignment = routing.ReadAssignmentFromRoutes(
+                [[manager.NodeToIndex(node) for node in route] for route in start_routes], True
+            )
+            if initial_assignment is None and fleet is not vehicles:
+                return widened("initial plan rejected by the model")
+            if initial_assignment is None:
+                print(f"[OR-Tools] WARNING: {'Warm start' if warm_start else 'Savings'} routes rejected by the model, cold start")
+                warm_start = savings_start = None
+        
+        if progress_queue is None and warm_start is None and task_deadline is None:
+            # Accept first feasible solution quickly. Tasarruf planı varsa ilk çözüm odur: OR-Tools planı
+            # aramasız kabul eder (time_limit / first_solution_strategy etkisiz); rotalar sadece aşağıdaki
+            # NumPy son iyileştirmesiyle (post_optimize_seconds) düzelir. Arama için deadline verilmeli
+            search_parameters.solution_limit = 1
+        
+        # Stall: iyileşme durduysa bütçenin kalanı beklenmez (ilk çözümde duran aramada gereksiz)
+        stall_limit = None
+        if context.stall_seconds and search_parameters.solution_limit != 1:
+            stall_limit = _add_stall_limit(routing, context.stall_seconds)
+        
+        first_solution = (
+            "warm start" if warm_start else "savings" if savings_start
+            else routing_enums_pb2.FirstSolutionStrategy.Value.Name(search_parameters.first_solution_strategy)
+        )
+        metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.Value.Name(search_parameters.local_search_metaheuristic)
+        print(f"[OR-Tools] Solving with {first_solution} + {metaheuristic} metaheuristic ({search_limit:.1f}s limit)...")
         print(f"[OR-Tools] About to call SolveWithParameters()...")
         
-        solution = routing.SolveWithParameters(search_parameters)
-        
-        print(f"[OR-Tools] SolveWithParameters() returned, solution exists: {solution is not None}")
-        
+        search_started = time.perf_counter()
+        model_seconds = search_started - model_started
+        solver_fallback = False
+        if initial_assignment is not None and task_deadline is not None and context.remaining_seconds(task_deadline) <= 0:
+            # Bütçe matris + model kurulumunda tükendi: arama yapılmaz, başlangıç planı döner
+            print(f"[OR-Tools] Deadline: no time left for search, returning the initial plan")
+            solution = None
+        elif initial_assignment is not None:
+            solution = routing.SolveFromAssignmentWithParameters(initial_assignment, search_parameters)
+        else:
+            solution = routing.SolveWithParameters(search_parameters)
+        search_seconds = time.perf_counter() - search_started
+        
+        print(f"[OR-Tools] SolveWithParameters() returned, solution exists: {solution is not None} ({search_seconds:.2f}s)")
+        
+        status = routing.status()
+        status_msg = ROUTING_STATUS.get(status, f"UNKNOWN({status})")
+        if not solution and initial_assignment is not None:
+            # Solver çözüm döndürmedi (süre / bütçe): model tarafından doğrulanmış başlangıç planı kullanılır
+            print(f"[OR-Tools] WARNING: Solver returned no solution ({status_msg}), using the initial plan")
+            solution = initial_assignment
+            solver_fallback = True
+        node_routes = _solution_routes(routing, manager, solution, num_vehicles) if solution else None
+        # Ön boyutlandırılmış filo: çözüm yoksa ya da ulaşılabilir müşteri bırakıldıysa tüm filoyla yeniden
+        if fleet is not vehicles and (
+            not solution or (context.allow_drops and _unserved_customers(node_routes, node_customers, drop_reasons))
+        ):
+            return widened("found no solution" if not solution else "dropped reachable customers")
         if not solution:
-            status = routing.status()
-            status_msg = {
-                0: "ROUTING_NOT_SOLVED",
-                1: "ROUTING_SUCCESS",
-                2: "ROUTING_FAIL",
-                3: "ROUTING_FAIL_TIMEOUT",
-                4: "ROUTING_INVALID",
-                5: "ROUTING_FAIL_NO_SOLUTION_FOUND",
-                6: "ROUTING_OPTIMAL"
-            }.get(status, f"UNKNOWN({status})")
             
             # Collect diagnostic info
             total_demand = sum(demands)
@@ -437,83 +1408,82 @@ def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: lis
             error_details += f"\nDemand/Capacity ratio: {total_demand/total_capacity:.2f}" if total_capacity > 0 else "\nTotal capacity is 0!"
             
             print(f"[OR-Tools] ERROR: {error_details}")
-            raise Exception(error_details)
+            raise SolverStatusError(status_msg, error_details)
         
         # Parse results
+        extract_started = time.perf_counter()
         routes = []
         
-        # Get time dimension for duration calculation
-        try:
-            time_dimension = routing.GetDimensionOrDie('Time')
-            print(f"[OR-Tools] Time dimension found successfully")
-        except Exception as e:
-            print(f"[OR-Tools] CRITICAL WARNING: Time dimension not found! Error: {e}")
-            print(f"[OR-Tools] Using fallback duration calculation")
-            time_dimension = None  # Will trigger fallback logic
-        
+        # Çözümün rotaları (düğüm listeleri); ilk çözümde duran aramanın bıraktığı kesişen yaylar,
+        # gereksiz uğramalar NumPy yerel aramasıyla (2-opt, Or-opt, relocate) kısa bütçede giderilir
+        post_optimize = None
+        post_optimize_seconds = context.post_optimize_budget(task_deadline)
+        if post_optimize_seconds > 0:
+            post_optimize = improve_routes(
+                node_routes, distance_array, time_array, demands, vehicle_capacities, context.max_route_minutes,
+                post_optimize_seconds, _relocation_domains(vehicles, node_routes, vehicle_domains, type_fallbacks),
+                context.vehicle_fixed_cost
+            )
+            print(f"[OR-Tools] Post-optimization: {post_optimize['two_opt']} 2-opt, {post_optimize['or_opt']} or-opt, "
+                  f"{post_optimize['relocate']} relocate moves, gain {post_optimize['gain']} ({post_optimize['seconds']:.2f}s)")
+        
+        vehicle_loads = [0] * num_vehicles
         for vehicle_id in range(num_vehicles):
-            index = routing.Start(vehicle_id)
-            route_distance = 0
             route_stops = []
             stop_order = 1
             cumulative_load = 0  # pallets
             
-            while not routing.IsEnd(index):
-                node_index = manager.IndexToNode(index)
+            # Yay maliyetleri modelden (ilk yayda araç sabit maliyeti dahil)
+            node_route = node_routes[vehicle_id]
+            path = [routing.Start(vehicle_id)] + [manager.NodeToIndex(node) for node in node_route] + [routing.End(vehicle_id)]
+            route_distance = sum(
+                routing.GetArcCostForVehicle(previous_index, index, vehicle_id) for previous_index, index in zip(path, path[1:])
+            )
+            
+            for node_index in node_route:
+                customer = node_customers[node_index - 1]
                 
-                if node_index > 0:  # Skip depot
-                    customer = customers[node_index - 1]
-                    
-                    if route_stops:
-                        prev_loc = route_stops[-1]["location"]
-                        distance_from_prev = haversine_distance(
-                            prev_loc["lat"], prev_loc["lng"],
-                            customer["location"]["lat"], customer["location"]["lng"]
-                        )
-                        travel_time = (distance_from_prev / 60) * 60
-                    else:
-                        # First stop - distance from depot
-                        distance_from_prev = haversine_distance(
-                            depot_lat, depot_lng,
-                            customer["location"]["lat"], customer["location"]["lng"]
-                        )
-                        travel_time = (distance_from_prev / 60) * 60
-                    
-                    cumulative_load += customer["demand_pallets"]
-                    
-                    route_stops.append({
-                        "customer_id": customer["id"],
-                        "customer_name": customer["name"],
-                        "location": customer["location"],
-                        "demand": customer["demand_pallets"],
-                        "stopOrder": stop_order,  # Stop sequence number
-                        "cumulativeLoad": cumulative_load,  # Total pallets loaded so far
-                        "distanceFromPrev": round(distance_from_prev, 2)  # km from previous stop
-                    })
-                    
-                    stop_order += 1
+                if route_stops:
+                    prev_loc = route_stops[-1]["location"]
+                    distance_from_prev = haversine_distance(
+                        prev_loc["lat"], prev_loc["lng"],
+                        customer["location"]["lat"], customer["location"]["lng"]
+                    )
+                    travel_time = (distance_from_prev / 60) * 60
+                else:
+                    # First stop - distance from depot
+                    distance_from_prev = haversine_distance(
+                        depot_lat, depot_lng,
+                        customer["location"]["lat"], customer["location"]["lng"]
+                    )
+                    travel_time = (distance_from_prev / 60) * 60
                 
-                previous_index = index
-                index = solution.Value(routing.NextVar(index))
-                route_distance += routing.GetArcCostForVehicle(previous_index, index, vehicle_id)
+                cumulative_load += customer["demand_pallets"]
+                
+                route_stops.append({
+                    "customer_id": customer["id"],
+                    "customer_name": customer["name"],
+                    "location": customer["location"],
+                    "demand": customer["demand_pallets"],
+                    "stopOrder": stop_order,  # Stop sequence number
+                    "cumulativeLoad": cumulative_load,  # Total pallets loaded so far
+                    "distanceFromPrev": round(distance_from_prev, 2)  # km from previous stop
+                })
+                fallback_types = type_fallbacks[node_index]
+                if fallback_types is not None and vehicles[vehicle_id]["type"] not in fallback_types:
+                    # Cezalı fallback: istenen tipte uygun araç yoktu
+                    route_stops[-1]["vehicle_type_mismatch"] = True
+                    vehicle_type_stats["mismatched"] += 1
+                
+                stop_order += 1
             
             if len(route_stops) > 0:
                 route_distance_km = route_distance / 1000
                 vehicle = vehicles[vehicle_id]
                 fuel_consumption = VEHICLE_TYPES[vehicle["type"]]["fuel"]
                 
-                # Calculate route duration from time dimension or fallback
-                end_index = routing.End(vehicle_id)
-                if time_dimension:
-                    route_duration_min = solution.Min(time_dimension.CumulVar(end_index))
-                else:
-                    # Fallback: estimate duration from distance (60 km/h average)
-                    # Formula: (distance_km / speed_kmh) * 60 = minutes
-                    route_duration_min = int((route_distance_km / 60.0) * 60.0)
-                    # Add service times for all stops
-                    for stop in route_stops:
-                        route_duration_min += stop.get("service_duration", 30)
-                    print(f"[OR-Tools] WARNING: Using fallback duration calculation for vehicle {vehicle_id}: {route_duration_min} min")
+                # Süre: Time boyutunun transitleri (servis süreleri dahil); start cumul 0, bekleme yok
+                route_duration_min = route_time(node_route, time_matrix)
                 
                 # Validate duration against 1440-minute target (1560 max with slack)
                 if route_duration_min > 1440:
@@ -526,10 +1496,10 @@ def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: lis
                     if route_duration_min > 660:
                         print(f"[OR-Tools] ERROR: Route exceeds maximum allowed time of 660 minutes!")
                 
-                fuel_cost = (route_distance_km / 100) * fuel_consumption * fuel_price
-                distance_cost = route_distance_km * 2.5
-                fixed_cost = 500.0
-                toll_cost = route_distance_km * 0.5
+                fuel_cost = (route_distance_km / 100) * fuel_consumption * context.fuel_price
+                distance_cost = route_distance_km * context.distance_cost_per_km
+                fixed_cost = context.route_fixed_cost
+                toll_cost = route_distance_km * context.toll_cost_per_km
                 total_cost = fuel_cost + distance_cost + fixed_cost + toll_cost
                 
                 # Cap duration at 600 for display (even if slack was used)
@@ -553,24 +1523,79 @@ def _optimize_single_depot(primary_depot: dict, all_depots: list, customers: lis
                 })
                 
                 total_distance += route_distance_km
+                vehicle_loads[vehicle_id] = cumulative_load
         
         print(f"[OR-Tools] Generated {len(routes)} routes")
         print(f"[OR-Tools] Total distance: {round(total_distance, 2)} km")
         
+        dropped_customers = []
+        if context.allow_drops:
+            dropped_customers = _dropped_customers(
+                routing, manager, solution, primary_depot, node_customers, demands, vehicle_capacities,
+                vehicle_loads, vehicle_domains, time_matrix, context, drop_reasons
+            )
+        
+        summary = {
+            "total_routes": len(routes),
+            "total_distance_km": round(total_distance, 2),
+            "total_vehicles_used": len(routes),
+            "algorithm": "OR-Tools",
+            "search_seconds": round(search_seconds, 3),
+            "solver_status": status_msg,
+            "matrix_source": matrix_source,
+            "duration_source": "road" if road_durations is not None else "speed",
+            "timings": {
+                "matrix": round(matrix_seconds, 4),
+                "model": round(model_seconds, 4),
+                "solve": round(search_seconds, 4),
+                "extract": round(time.perf_counter() - extract_started, 4),
+            }
+        }
+        if matrix_cache:
+            summary["matrix_cache"] = matrix_cache
+        if pruning:
+            summary["neighbors"] = pruning
+        if vehicle_type_stats:
+            summary["vehicle_types"] = vehicle_type_stats
+        if vehicle_classes:
+            summary["vehicle_classes"] = vehicle_classes
+        if warm_start:
+            summary["warm_start"] = {
+                "kept_stops": warm_start["kept_stops"],
+                "inserted_stops": warm_start["inserted_stops"]
+            }
+        summary["initial_solution"] = "warm_start" if warm_start else "savings" if savings_start else "path_cheapest_arc"
+        if savings_start:
+            summary["timings"]["savings"] = round(savings_start["seconds"], 4)
+        if solver_fallback:
+            summary["solver_fallback"] = True
+        if fleet is not vehicles:
+            summary["fleet"] = {"available": len(fleet), "presized": num_vehicles, "widened": False}
+        if post_optimize:
+            summary["post_optimize"] = {
+                "moves": post_optimize["two_opt"] + post_optimize["or_opt"] + post_optimize["relocate"],
+                "gain": post_optimize["gain"],
+            }
+            summary["timings"]["post_optimize"] = round(post_optimize["seconds"], 4)
+        if context.allow_drops:
+            summary["dropped"] = len(dropped_customers)
+        if task_deadline is not None:
+            summary["budget"] = {
+                "search_limit_seconds": round(search_limit, 3),
+                "stalled": bool(stall_limit and stall_limit["stalled"]),
+            }
+        
         return {
             "routes": routes,
-            "summary": {
-                "total_routes": len(routes),
-                "total_distance_km": round(total_distance, 2),
-                "total_vehicles_used": len(routes),
-                "algorithm": "OR-Tools"
-            }
+            "summary": summary,
+            "dropped_customers": dropped_customers
         }
     except Exception as e:
         print(f"[OR-Tools] ERROR during optimization: {e}")
         raise e
 
-def _optimize_multi_depot(depots: list, customers: list, vehicles: list, fuel_price: float) -> dict:
+def _optimize_multi_depot(depots: list, customers: list, vehicles: list, context: SolveContext,
+                          nearest_neighbors: Optional[int] = None) -> dict:
     """True multi-depot optimization (experimental)"""
     try:
         print(f"[OR-Tools] Starting optimization...")
@@ -591,6 +1616,8 @@ def _optimize_multi_depot(depots: list, customers: list, vehicles: list, fuel_pr
         locations = depot_locations.copy()
         
         demands = [0] * len(depots)
+        service_times = [0] * len(depots)  # Depolar için servis süresi 0
+        node_customers = []  # node i -> node_customers[i - len(depots)]
         
         for i, customer in enumerate(customers):
             lat = customer["location"]["lat"]
@@ -602,6 +1629,8 @@ def _optimize_multi_depot(depots: list, customers: list, vehicles: list, fuel_pr
                 
             locations.append((lat, lng))
             demands.append(customer.get("demand_pallets", 1))
+            service_times.append(business_service_time(customer))
+            node_customers.append(customer)
         
         num_locations = len(locations)
         num_vehicles = len(vehicles)
@@ -609,19 +1638,8 @@ def _optimize_multi_depot(depots: list, customers: list, vehicles: list, fuel_pr
         print(f"[OR-Tools] Valid locations: {num_locations}")
         print(f"[OR-Tools] Total demand: {sum(demands)} pallets")
         
-        distance_matrix = []
-        for i, loc1 in enumerate(locations):
-            row = []
-            for j, loc2 in enumerate(locations):
-                if i == j:
-                    row.append(0)
-                else:
-                    dist = haversine_distance(loc1[0], loc1[1], loc2[0], loc2[1])
-                    if dist < 0 or dist > 20000:
-                        print(f"[OR-Tools] WARNING: Suspicious distance between {i} and {j}: {dist}km")
-                        dist = max(1, min(dist, 20000))
-                    row.append(int(dist * 1000))
-            distance_matrix.append(row)
+        distance_array = haversine_matrix(locations)
+        distance_matrix = to_int_lists(distance_array)
         
         print(f"[OR-Tools] Distance matrix size: {len(distance_matrix)}x{len(distance_matrix[0])}")
         
@@ -664,32 +1682,15 @@ def _optimize_multi_depot(depots: list, customers: list, vehicles: list, fuel_pr
         routing = pywrapcp.RoutingModel(manager)
         print(f"[OR-Tools] RoutingModel created")
         
-        def distance_callback(from_index, to_index):
-            try:
-                from_node = manager.IndexToNode(from_index)
-                to_node = manager.IndexToNode(to_index)
-                return distance_matrix[from_node][to_node]
-            except Exception as e:
-                print(f"[OR-Tools] ERROR in distance_callback: {e}")
-                return 1000000
-        
-        transit_callback_index = routing.RegisterTransitCallback(distance_callback)
+        transit_callback_index = routing.RegisterTransitMatrix(distance_matrix)
         routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
-        print(f"[OR-Tools] Distance callback registered")
+        print(f"[OR-Tools] Distance matrix registered")
         
         # Add fixed cost per vehicle to minimize vehicle count
-        routing.SetFixedCostOfAllVehicles(10000)
-        print(f"[OR-Tools] Fixed vehicle cost: 10000 (prioritizes fewer vehicles)")
+        routing.SetFixedCostOfAllVehicles(context.vehicle_fixed_cost)
+        print(f"[OR-Tools] Fixed vehicle cost: {context.vehicle_fixed_cost} (prioritizes fewer vehicles)")
         
-        def demand_callback(from_index):
-            try:
-                from_node = manager.IndexToNode(from_index)
-                return demands[from_node]
-            except Exception as e:
-                print(f"[OR-Tools] ERROR in demand_callback: {e}")
-                return 0
-        
-        demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
+        demand_callback_index = routing.RegisterUnaryTransitVector(demands)
         routing.AddDimensionWithVehicleCapacity(
             demand_callback_index,
             0,
@@ -699,34 +1700,15 @@ def _optimize_multi_depot(depots: list, customers: list, vehicles: list, fuel_pr
         )
         print(f"[OR-Tools] Capacity dimension added")
         
-        # Time dimension: travel time + service time
-        def time_callback(from_index, to_index):
-            """Calculate travel + service time between nodes"""
-            try:
-                from_node = manager.IndexToNode(from_index)
-                to_node = manager.IndexToNode(to_index)
-                
-                # Travel time: distance in meters, average speed 60 km/h
-                # Formula: (distance_km / speed_kmh) * 60 minutes = travel time in minutes
-                distance_km = distance_matrix[from_node][to_node] / 1000.0
-                average_speed_kmh = 60.0
-                travel_time_minutes = (distance_km / average_speed_kmh) * 60.0
-                
-                # Service time at destination
-                service_time_minutes = SERVICE_TIMES.get(customers[to_node - len(depots)].get("business_type", "default"), SERVICE_TIMES["default"]) if to_node >= len(depots) else 0
-                
-                return int(travel_time_minutes + service_time_minutes)
-            except Exception as e:
-                print(f"[OR-Tools] ERROR in time_callback: {e}")
-                return 999999
-        
-        time_callback_index = routing.RegisterTransitCallback(time_callback)
+        # Time dimension: travel time (average speed) + service time at destination
+        time_matrix = to_int_lists(travel_time_matrix(distance_array, service_times, context.average_speed_kmh))
+        time_callback_index = routing.RegisterTransitMatrix(time_matrix)
         
         # Time dimension: max 1440 minutes per route (24 hours total including breaks)
         routing.AddDimension(
             time_callback_index,
             120,  # slack: 120 minutes (2 hours)
-            1440,  # Max 1440 minutes (24 hours) per vehicle
+            context.max_route_minutes,  # Max 1440 minutes (24 hours) per vehicle
             True,  # Start cumul to zero
             'Time'
         )
@@ -751,24 +1733,22 @@ def _optimize_multi_depot(depots: list, customers: list, vehicles: list, fuel_pr
         search_parameters.local_search_metaheuristic = (
             routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH  # Better optimization
         )
-        search_parameters.time_limit.seconds = 120  # Increased from 30 to 120 seconds
-        search_parameters.log_search = True
+        search_limit = context.search_seconds(context.deadline)
+        search_parameters.time_limit.FromMilliseconds(int(search_limit * 1000))
+        search_parameters.log_search = DEBUG_LOGS
+        
+        pruning = None
+        if nearest_neighbors:
+            pruning = _restrict_to_neighbors(routing, manager, num_depots, locations, nearest_neighbors)
         
-        print(f"[OR-Tools] Starting solver with 120s timeout and guided local search...")
+        print(f"[OR-Tools] Starting solver with {search_limit:.0f}s timeout and guided local search...")
+        search_started = time.perf_counter()
         solution = routing.SolveWithParameters(search_parameters)
+        search_seconds = time.perf_counter() - search_started
         
         if not solution:
             status = routing.status()
-            status_messages = {
-                0: "ROUTING_NOT_SOLVED",
-                1: "ROUTING_SUCCESS",
-                2: "ROUTING_FAIL",
-                3: "ROUTING_FAIL_TIMEOUT",
-                4: "ROUTING_INVALID",
-                5: "ROUTING_FAIL_NO_SOLUTION_FOUND",
-                6: "ROUTING_OPTIMAL"
-            }
-            status_msg = status_messages.get(status, f"UNKNOWN({status})")
+            status_msg = ROUTING_STATUS.get(status, f"UNKNOWN({status})")
             print(f"[OR-Tools] No solution found. Status: {status_msg}")
             
             error_details = f"Model initialization failed. Status: {status_msg}"
@@ -776,13 +1756,7 @@ def _optimize_multi_depot(depots: list, customers: list, vehicles: list, fuel_pr
             error_details += f"\nTotal demand: {total_demand} pallets; Total capacity: {total_capacity} pallets"
             error_details += f"\nDemand/Capacity ratio: {total_demand/total_capacity:.2f}" if total_capacity > 0 else "\nTotal capacity is 0!"
             
-            raise Exception(error_details)
-        
-        # Servis süreleri
-        service_times = [0] * len(depots)  # Depolar için servis süresi 0
-        for customer in customers:
-            business = customer.get("business_type", "default")
-            service_times.append(SERVICE_TIMES.get(business, SERVICE_TIMES["default"]))
+            raise SolverStatusError(status_msg, error_details)
         
         # Sonuçları parse et
         routes = []
@@ -806,7 +1780,7 @@ def _optimize_multi_depot(depots: list, customers: list, vehicles: list, fuel_pr
                 node_index = manager.IndexToNode(index)
                 
                 if node_index >= len(depots):
-                    customer = customers[node_index - len(depots)]
+                    customer = node_customers[node_index - len(depots)]
                     
                     if route_stops:
                         prev_loc = route_stops[-1]["location"]
@@ -852,13 +1826,13 @@ def _optimize_multi_depot(depots: list, customers: list, vehicles: list, fuel_pr
                 fuel_consumption = VEHICLE_TYPES[vehicle["type"]]["fuel"]
                 
                 # Calculate route duration: (distance_km / speed_kmh) * 60 = minutes
-                route_duration_minutes = (route_distance_km / 60.0) * 60.0
+                route_duration_minutes = (route_distance_km / context.average_speed_kmh) * 60.0
                 route_duration_minutes += sum(s["service_time"] for s in route_stops)
                 
-                fuel_cost = (route_distance_km / 100) * fuel_consumption * fuel_price
-                distance_cost = route_distance_km * 2.5
-                fixed_cost = 500.0
-                toll_cost = route_distance_km * 0.5
+                fuel_cost = (route_distance_km / 100) * fuel_consumption * context.fuel_price
+                distance_cost = route_distance_km * context.distance_cost_per_km
+                fixed_cost = context.route_fixed_cost
+                toll_cost = route_distance_km * context.toll_cost_per_km
                 total_cost = fuel_cost + distance_cost + fixed_cost + toll_cost
                 
                 routes.append({
@@ -883,14 +1857,19 @@ def _optimize_multi_depot(depots: list, customers: list, vehicles: list, fuel_pr
         print(f"[OR-Tools] Generated {len(routes)} routes")
         print(f"[OR-Tools] Total distance: {round(total_distance, 2)} km")
         
+        summary = {
+            "total_routes": len(routes),
+            "total_distance_km": round(total_distance, 2),
+            "total_vehicles_used": len(routes),
+            "algorithm": "OR-Tools",
+            "search_seconds": round(search_seconds, 3)
+        }
+        if pruning:
+            summary["neighbors"] = pruning
+        
         return {
             "routes": routes,
-            "summary": {
-                "total_routes": len(routes),
-                "total_distance_km": round(total_distance, 2),
-                "total_vehicles_used": len(routes),
-                "algorithm": "OR-Tools"
-            }
+            "summary": summary
         }
     except Exception as e:
         print(f"[OR-Tools] ERROR during optimization: {e}")
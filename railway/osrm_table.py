@@ -0,0 +1,141 @@
+import os
+import threading
+import requests
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import List
+
+from distance_matrix import clamp_matrix
+
+# OSRM Table API - büyük nokta setleri için kaynak/hedef karolarına bölünmüş paralel çekim
+# osrm-routed varsayılan --max-table-size 100: kaynak x hedef <= 100 x 100
+DEFAULT_TILE_SIZE = int(os.environ.get('OSRM_TILE_SIZE', 100))
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get('OSRM_MAX_CONCURRENCY', 4))
+DEFAULT_TIMEOUT_SECONDS = 30
+TILE_RETRIES = 1
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size: int = DEFAULT_MAX_CONCURRENCY) -> requests.Session:
+    """Process genelinde paylaşılan, bağlantı havuzlu requests.Session"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def _fetch_tile(session: requests.Session, osrm_url: str, profile: str, locations: List[tuple],
+                src: range, dst: range, timeout: int, annotation: str = 'distance') -> np.ndarray:
+    """Tek karo: URL'de sadece src ∪ dst koordinatları bulunur"""
+    if src == dst:
+        coords = [locations[i] for i in src]
+        sources = range(len(src))
+        destinations = sources
+    else:
+        coords = [locations[i] for i in src] + [locations[j] for j in dst]
+        sources = range(len(src))
+        destinations = range(len(src), len(src) + len(dst))
+
+    # ';' ayırıcıları encode edilmeden gönderilir (OSRM URL formatı)
+    coords_str = ';'.join([f"{loc[1]},{loc[0]}" for loc in coords])
+    url = (
+        f"{osrm_url}/table/v1/{profile}/{coords_str}?annotations={annotation}"
+        f"&sources={';'.join(map(str, sources))}"
+        f"&destinations={';'.join(map(str, destinations))}"
+    )
+
+    last_error = None
+    for _ in range(TILE_RETRIES + 1):
+        try:
+            response = session.get(url, timeout=timeout)
+            response.raise_for_status()
+            data = response.json()
+            if data.get('code') != 'Ok':
+                raise Exception(f"OSRM error: {data.get('code')}")
+            tile = clamp_matrix(data[f'{annotation}s'])
+            if tile.shape != (len(src), len(dst)):
+                raise Exception(f"OSRM tile shape {tile.shape} != {(len(src), len(dst))}")
+            return tile
+        except Exception as e:
+            last_error = e
+    raise last_error
+
+
+def fetch_osrm_table(locations: List[tuple], osrm_url: str, profile: str = 'driving',
+                     tile_size: int = DEFAULT_TILE_SIZE, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                     timeout: int = DEFAULT_TIMEOUT_SECONDS, annotation: str = 'distance') -> np.ndarray:
+    """
+    OSRM Table API ile tam mesafe matrisi (metre, int32).
+    tile_size'dan büyük setler karolara bölünür, en fazla max_concurrency karo
+    eşzamanlı çekilir ve tek matriste birleştirilir. Herhangi bir karo başarısız
+    olursa exception fırlatılır (çağıran haversine fallback'ine düşer).
+    annotation='duration': mesafe yerine seyahat süresi matrisi (saniye)
+    """
+    n = len(locations)
+    session = get_session(max(1, max_concurrency))
+
+    if n <= tile_size:
+        # Tek istek (eski davranış)
+        coords_str = ';'.join([f"{loc[1]},{loc[0]}" for loc in locations])
+        response = session.get(f"{osrm_url}/table/v1/{profile}/{coords_str}?annotations={annotation}", timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+        if data.get('code') != 'Ok':
+            raise Exception(f"OSRM error: {data.get('code')}")
+        return clamp_matrix(data[f'{annotation}s'])
+
+    blocks = [range(start, min(start + tile_size, n)) for start in range(0, n, tile_size)]
+    tiles = [(src, dst) for src in blocks for dst in blocks]
+    print(f"[OSRM] {n} nokta -> {len(tiles)} karo ({tile_size}x{tile_size}), eşzamanlılık: {max_concurrency}")
+
+    matrix = np.empty((n, n), dtype=np.int32)
+    _gather_tiles(session, osrm_url, profile, locations, tiles, matrix, 0, max_concurrency, timeout, annotation)
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+
+def fetch_osrm_table_rect(sources: List[tuple], destinations: List[tuple], osrm_url: str, profile: str = 'driving',
+                          tile_size: int = DEFAULT_TILE_SIZE, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                          timeout: int = DEFAULT_TIMEOUT_SECONDS) -> np.ndarray:
+    """
+    Dikdörtgen tablo: sources x destinations mesafeleri (metre, int32).
+    Tam matris yerine sadece yeni noktaların satır/sütunları gerektiğinde kullanılır.
+    """
+    n_src, n_dst = len(sources), len(destinations)
+    locations = list(sources) + list(destinations)
+    session = get_session(max(1, max_concurrency))
+
+    src_blocks = [range(start, min(start + tile_size, n_src)) for start in range(0, n_src, tile_size)]
+    dst_blocks = [range(n_src + start, n_src + min(start + tile_size, n_dst)) for start in range(0, n_dst, tile_size)]
+    tiles = [(src, dst) for src in src_blocks for dst in dst_blocks]
+
+    matrix = np.empty((n_src, n_dst), dtype=np.int32)
+    _gather_tiles(session, osrm_url, profile, locations, tiles, matrix, n_src, max_concurrency, timeout)
+    return matrix
+
+
+def _gather_tiles(session: requests.Session, osrm_url: str, profile: str, locations: List[tuple], tiles: list,
+                  matrix: np.ndarray, dst_offset: int, max_concurrency: int, timeout: int,
+                  annotation: str = 'distance') -> None:
+    """Karoları paralel çek ve matrise yerleştir (hedef indeksleri dst_offset kadar kaydırılır)"""
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        futures = {
+            executor.submit(_fetch_tile, session, osrm_url, profile, locations, src, dst, timeout, annotation): (src, dst)
+            for src, dst in tiles
+        }
+        try:
+            for future, (src, dst) in futures.items():
+                matrix[src.start:src.stop, dst.start - dst_offset:dst.stop - dst_offset] = future.result()
+        except Exception:
+            # Bir karo başarısızsa kalanları bekleme
+            for future in futures:
+                future.cancel()
+            raise
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional, Tuple
+
+from matrix_cache import COORD_PRECISION
+
+# İstek seviyesinde sonuç cache'i: aynı OptimizeRequest (çift tıklama, proxy timeout sonrası tekrar)
+# yeniden çözülmez. Anahtar normalize edilmiş isteğin kanonik SHA-256'sı; değer OptimizeResponse.
+# Aynı anahtarla eşzamanlı gelen istekler devam eden tek çözüme bağlanır (coalescing).
+
+DEFAULT_TTL_SECONDS = 10 * 60
+DEFAULT_MAX_ENTRIES = 128
+
+# Bağlanmış bekleyenin stop_event'ini yoklama aralığı (saniye)
+WAIT_POLL_SECONDS = 0.2
+
+
+def _normalize(value):
+    """Anahtar için normalizasyon: koordinat/ondalık yuvarlama (sözlük sırası json.dumps'ta sabitlenir)"""
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalize(item) for item in value]
+    if isinstance(value, float):
+        return round(value, COORD_PRECISION)
+    return value
+
+
+def request_cache_key(request: dict, osrm_url: str, **solver_params) -> str:
+    """
+    Normalize edilmiş istek (varsayılanları doldurulmuş model dökümü) + etkin OSRM URL'si +
+    solver parametreleri (ör. time_limit_seconds) için kanonik anahtar.
+    Liste sıraları korunur: araç sırası depo dağıtımını, müşteri sırası düğüm sırasını belirler.
+    """
+    payload = {
+        'request': _normalize({key: value for key, value in request.items() if key != 'osrm_url'}),
+        'osrm_url': osrm_url.rstrip('/'),
+        'params': _normalize(solver_params),
+    }
+    canonical = json.dumps(payload, separators=(',', ':'), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResultCache:
+    """
+    Bellek içi TTL + LRU sonuç cache'i ve devam eden çözümler tablosu.
+    Hatalı çözümler cache'lenmez; bağlanmış bekleyenler aynı hatayı alır.
+    """
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # anahtar -> (yazılma zamanı, sonuç)
+        self._in_flight = {}  # anahtar -> Future
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: str, compute: Callable[[], dict],
+                       stop_event: Optional[threading.Event] = None) -> Tuple[dict, str]:
+        """
+        Returns: (sonuç, "hit" | "miss" | "coalesced")
+        miss: bu çağrı çözer; coalesced: aynı anahtarlı devam eden çözümün sonucunu bekler
+        stop_event: bekleyen çağıran vazgeçerse (ör. iş iptali) set edilir; bekleme CancelledError ile biter,
+        devam eden çözüm (başka çağıranlarınki) sürer
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if time.time() - entry[0] <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1], "hit"
+                del self._entries[key]
+                self.expired += 1
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            while True:
+                try:
+                    return future.result(timeout=None if stop_event is None else WAIT_POLL_SECONDS), "coalesced"
+                except FutureTimeoutError:
+                    if stop_event.is_set():
+                        raise CancelledError("Stopped waiting for the in-flight result")
+
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            self._entries[key] = (time.time(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        future.set_result(result)
+        return result, "miss"
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "in_flight": len(self._in_flight),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Process genelinde tek sonuç cache'i (environment ile yapılandırılır).
+    RESULT_CACHE_TTL_SECONDS=0 ise cache kapalıdır.
+    """
+    global _cache
+    ttl_seconds = int(os.environ.get('RESULT_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+    if ttl_seconds <= 0:
+        return None
+
+    with _cache_lock:
+        if _cache is None or _cache.ttl_seconds != ttl_seconds:
+            _cache = ResultCache(
+                ttl_seconds=ttl_seconds,
+                max_entries=int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)),
+            )
+        return _cache
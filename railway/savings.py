@@ -0,0 +1,167 @@
+import numpy as np
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+from distance_matrix import MAX_DISTANCE_M
+
+# Clarke-Wright paralel tasarruf sezgiseli (NumPy): her müşteri kendi rotasıyla başlar, i ile biten
+# rota j ile başlayan rotaya s(i, j) = d(i, 0) + d(0, j) - d(i, j) tasarrufu azalan sırada eklenir.
+# Kapasite, rota süresi (time_matrix, servis süreleri dahil) ve araç tipi domain'leri birleşmede
+# kontrol edilir. Matrisler yönlüdür (OSRM asimetrik): rotalar ters çevrilmez.
+# Rotalar insertion.py'deki gibi düğüm listeleridir; depo düğümü (0) yazılmaz.
+
+# Müşteri başına aday birleşme sayısı: tüm N² çift yerine her müşterinin en yüksek tasarruflu
+# SAVINGS_CANDIDATES ardılı sıralanır (binlerce durakta da milisaniyeler)
+SAVINGS_CANDIDATES = 30
+
+
+def savings_routes(distance_matrix: np.ndarray, time_matrix: np.ndarray, demands: Sequence[int],
+                   capacities: Sequence[int], max_route_time: int,
+                   allowed_vehicles: Sequence[Optional[FrozenSet[int]]] = None,
+                   candidates: int = SAVINGS_CANDIDATES) -> List[List[int]]:
+    """
+    Tasarruf rotaları (araç atamasız). Birleşen rotanın yükü, ortak domain'indeki (yoksa filodaki)
+    en büyük araç kapasitesini, süresi max_route_time'ı aşmaz; domain'leri kesişmeyen rotalar birleşmez.
+    Karışık filo: en küçük araç kapasitesinin üstündeki her yük eşiğinde, o eşiği aşan rota sayısı
+    o yükü taşıyabilen araç sayısını geçmez (yükler sadece büyür; büyük rotalar büyük araçlara sığar).
+    allowed_vehicles[node]: düğümün izinli araç indeksleri (None = hepsi)
+    Returns: rotalar (müşteri düğüm listeleri, tek duraklılar dahil)
+    """
+    # Mesafeler MAX_DISTANCE_M ile sınırlı: iki yayın toplamı int32'ye sığar (int64'e göre yarı bellek / süre)
+    distance = np.minimum(np.asarray(distance_matrix), MAX_DISTANCE_M).astype(np.int32, copy=False)
+    times = np.asarray(time_matrix, dtype=np.int64)
+    n = len(distance) - 1
+    if n <= 0:
+        return []
+
+    # Aday çiftler: her i için en yüksek tasarruflu k ardıl (vektörize), sonra pozitifler azalan sırada
+    savings = distance[1:, :1] + distance[:1, 1:] - distance[1:, 1:]
+    np.fill_diagonal(savings, -1)
+    k = min(candidates, n - 1)
+    if k > 0:
+        successors = np.argpartition(savings, -k, axis=1)[:, -k:] if k < n - 1 else np.argsort(savings, axis=1)[:, -k:]
+        sources = np.repeat(np.arange(n), k)
+        successors = successors.ravel()
+        values = savings[sources, successors]
+        positive = values > 0
+        sources, successors, values = sources[positive], successors[positive], values[positive]
+        order = np.argsort(-values.astype(np.int64), kind='stable')
+        pairs = list(zip((sources[order] + 1).tolist(), (successors[order] + 1).tolist()))
+    else:
+        pairs = []
+
+    fleet_capacity = max(capacities)
+    smallest_capacity = min(capacities)
+    # vehicles_at_least[L]: kapasitesi >= L araç sayısı; routes_at_least[L]: yükü >= L rota sayısı (L > en küçük kapasite)
+    vehicles_at_least = np.cumsum(np.bincount(capacities, minlength=fleet_capacity + 1)[::-1])[::-1].tolist()
+    routes_at_least = [0] * (fleet_capacity + 1)
+    for demand in demands[1:]:
+        for level in range(smallest_capacity + 1, min(int(demand), fleet_capacity) + 1):
+            routes_at_least[level] += 1
+    domain_capacity: Dict[Optional[FrozenSet[int]], int] = {None: fleet_capacity}
+
+    def capacity_of(domain: Optional[FrozenSet[int]]) -> int:
+        if domain not in domain_capacity:
+            domain_capacity[domain] = max((capacities[v] for v in domain), default=0)
+        return domain_capacity[domain]
+
+    # Rota durumu: düğüm -> rota (başı), rota başı -> son düğüm / yük / süre / domain; next: ardıl düğüm
+    route_of = list(range(n + 1))
+    tail = list(range(n + 1))
+    members = [[node] for node in range(n + 1)]
+    load = [int(d) for d in demands]
+    duration = (times[0, :] + times[:, 0]).tolist()
+    domains = list(allowed_vehicles) if allowed_vehicles is not None else [None] * (n + 1)
+    to_depot = times[:, 0].tolist()
+    from_depot = times[0, :].tolist()
+
+    for i, j in pairs:
+        a, b = route_of[i], route_of[j]
+        # i a rotasının sonu, j b rotasının başı olmalı
+        if a == b or tail[a] != i or b != j:
+            continue
+        merged_load = load[a] + load[b]
+        if merged_load > fleet_capacity:
+            continue
+        merged_time = duration[a] + duration[b] - to_depot[i] - from_depot[j] + int(times[i, j])
+        if merged_time > max_route_time:
+            continue
+        domain = domains[a]
+        if domains[b] is not None:
+            domain = domains[b] if domain is None else domain & domains[b]
+        if domain is not None and (not domain or merged_load > capacity_of(domain)):
+            continue
+        # Yeni rota max(yük a, yük b) ile birleşik yük arasındaki eşikleri ilk kez aşar
+        crossed = range(max(load[a], load[b], smallest_capacity) + 1, merged_load + 1)
+        if any(routes_at_least[level] >= vehicles_at_least[level] for level in crossed):
+            continue
+        for level in range(smallest_capacity + 1, merged_load + 1):
+            # >= level eşiğinde: a ve b'den eşiği aşanlar çıkar, birleşik rota girer
+            routes_at_least[level] += 1 - (load[a] >= level) - (load[b] >= level)
+
+        # b'yi a'nın sonuna ekle (rota kimliği baş düğümdür, a korunur)
+        for node in members[b]:
+            route_of[node] = a
+        members[a].extend(members[b])
+        members[b] = []
+        tail[a] = tail[b]
+        load[a] = merged_load
+        duration[a] = merged_time
+        domains[a] = domain
+
+    return [members[head] for head in range(1, n + 1) if route_of[head] == head and members[head]]
+
+
+def assign_vehicles(routes: List[List[int]], demands: Sequence[int], capacities: Sequence[int],
+                    allowed_vehicles: Sequence[Optional[FrozenSet[int]]] = None) -> List[List[int]]:
+    """
+    Rotaları araçlara ata: araç tipi kısıtlı (domain'i dar) rotalar önce, sonra yükü büyük olan; her rota
+    sığdığı (ve domain'ine uyan) en küçük boş araca.
+    Hiçbir boş araca sığmayan rota (birleşmeler filonun en büyük kapasitesiyle yapıldı; karışık filoda
+    büyük araç sayısı yetmeyebilir) sırası korunarak bölünür: en büyük uygun boş aracın alabildiği
+    baş kısım atanır, kalanı yeniden sıraya girer.
+    Returns: araç başına düğüm listesi; uygun boş araç kalmayan durakları hiçbir araçta yer almaz
+    """
+    vehicle_routes: List[List[int]] = [[] for _ in capacities]
+    free = sorted(range(len(capacities)), key=lambda v: (capacities[v], v))
+
+    def domain_of(route: List[int]) -> Optional[FrozenSet[int]]:
+        domain = None
+        if allowed_vehicles is not None:
+            for node in route:
+                if allowed_vehicles[node] is not None:
+                    domain = allowed_vehicles[node] if domain is None else domain & allowed_vehicles[node]
+        return domain
+
+    def priority(route: List[int]) -> tuple:
+        domain = domain_of(route)
+        return (len(domain) if domain is not None else len(capacities) + 1, -sum(demands[node] for node in route))
+
+    pending = sorted((list(route) for route in routes), key=priority)
+    while pending:
+        route = pending.pop(0)
+        route_load = sum(demands[node] for node in route)
+        domain = domain_of(route)
+        candidates = [position for position, vehicle in enumerate(free) if domain is None or vehicle in domain]
+        if not candidates:
+            continue
+        fitting = [position for position in candidates if capacities[free[position]] >= route_load]
+        if fitting:
+            vehicle_routes[free.pop(fitting[0])] = route
+            continue
+        # Bölme: en büyük uygun araca sığan en uzun baş kısım
+        vehicle = free[candidates[-1]]
+        head, load = [], 0
+        for node in route:
+            if load + demands[node] > capacities[vehicle]:
+                break
+            head.append(node)
+            load += demands[node]
+        if not head:
+            continue  # tek sipariş bile sığmıyor: durak atanmadan kalır
+        free.pop(candidates[-1])
+        vehicle_routes[vehicle] = head
+        rest = route[len(head):]
+        rest_priority = priority(rest)
+        position = next((p for p, r in enumerate(pending) if priority(r) > rest_priority), len(pending))
+        pending.insert(position, rest)
+    return vehicle_routes
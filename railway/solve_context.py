@@ -0,0 +1,162 @@
+import dataclasses
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from distance_providers import DistanceChain, distance_chain
+
+# İstek başına çözüm ayarları: mesafe kaynağı (OSRM URL, önceden hesaplanmış depo), süre sınırı,
+# hız ve maliyet katsayıları.
+# optimize_routes'a açıkça verilir ve depo görevleriyle havuz worker'larına taşınır; eşzamanlı
+# istekler process genelindeki os.environ['OSRM_URL'] gibi paylaşılan durumu değiştirmez.
+
+DEFAULT_OSRM_URL = 'https://router.project-osrm.org'
+
+# Seyahat süresi hesabında ortalama hız (km/h)
+AVERAGE_SPEED_KMH = 60.0
+
+# Araç başına sabit maliyet (≈ 10 km) ve rota başına azami süre (dakika)
+VEHICLE_FIXED_COST = 10000
+MAX_ROUTE_MINUTES = 1440
+
+# Uyumsuz araç tipiyle ziyaret edilen (ceza ile çözülen) müşteri başına maliyet (≈ 100 km)
+VEHICLE_TYPE_PENALTY = 100000
+
+# allow_drops: müşteri bırakma cezası (≈ 1000 km + palet başına 100 km), priority ile çarpılır
+DROP_PENALTY = 1000000
+DROP_PENALTY_PER_PALLET = 100000
+
+# Deadline bütçesi: depo görevinin bütçesinin en fazla bu oranı OSRM matris çekimini bekler (aşılırsa
+# haversine), sonuçların birleştirilmesi / yanıt için global bütçenin RESULT_RESERVE_SHARE'i ayrılır.
+# Arama bütçe tükense bile en az MIN_SEARCH_SECONDS sürer (ilk çözüm bulunabilsin).
+MATRIX_BUDGET_SHARE = 0.25
+RESULT_RESERVE_SHARE = 0.05
+MIN_SEARCH_SECONDS = 1.0
+
+# Deadline verilip stall_seconds verilmezse: bu kadar saniye iyileşme olmazsa arama durur.
+# İyileşme sayılması için amaç, son iyileşmedeki değerden en az STALL_MIN_IMPROVEMENT oranında düşmeli
+DEFAULT_STALL_SECONDS = 10.0
+STALL_MIN_IMPROVEMENT = 0.001
+
+# Çıkarılan rotalarda 2-opt / Or-opt / relocate son iyileştirmesinin süre bütçesi (depo başına, saniye)
+POST_OPTIMIZE_SECONDS = 1.0
+
+
+def default_osrm_url() -> str:
+    """İstekte URL yoksa kullanılan router (OSRM_URL environment'ı sadece okunur)"""
+    return os.environ.get('OSRM_URL', DEFAULT_OSRM_URL)
+
+
+def default_matrix_store_dir() -> Optional[str]:
+    """DISTANCE_STORE_DIR: scripts/build_distance_store.py çıktısı (boş/yok = depo kullanılmaz)"""
+    return os.environ.get('DISTANCE_STORE_DIR') or None
+
+
+def default_road_durations() -> bool:
+    """ROAD_DURATIONS=1: depodaki OSRM seyahat süreleri Time boyutunda kullanılır (ortalama hız yerine)"""
+    return os.environ.get('ROAD_DURATIONS', '').lower() in ('1', 'true', 'yes')
+
+
+@dataclass(frozen=True)
+class SolveContext:
+    """
+    Tek bir optimizasyon isteğinin değişmez ayarları.
+    road_durations: mesafeler depodan geldiyse ve depoda süre matrisi varsa Time boyutu
+    average_speed_kmh yerine bu sürelerle kurulur.
+    vehicle_fixed_cost ve max_route_minutes solver modeline, *_per_km / route_fixed_cost
+    rota maliyet dökümüne (TL) girer.
+    enforce_vehicle_types: required_vehicle_type(s) araç domain'i olarak uygulanır; kesin
+    uygulanamayan müşteriler vehicle_type_penalty cezasıyla başka tipe verilebilir.
+    break_symmetry: warm start'lı yerel aramada özdeş araç sınıflarındaki yedek araçlar sırayla
+    kullanılır (eşdeğer araç permütasyonları aranmaz).
+    allow_drops: her müşteri cezalı disjunction'dır; yerleştirilemeyenler bırakılır ve kısmi plan
+    döner (uygulanamazlık hatası yerine dropped_customers listesi).
+    savings_start: soğuk başlangıçta ilk plan Clarke-Wright tasarruf sezgiselinden kurulur ve OR-Tools'a
+    başlangıç ataması olarak verilir (False: PATH_CHEAPEST_ARC); solver çözüm döndüremezse bu plan kullanılır.
+    Deadline ve akış yoksa arama ilk çözümde durur: OR-Tools tasarruf planını aramasız kabul eder
+    (time_limit_seconds ve first_solution_strategy etkisizdir), iyileştirme son iyileştirmeden gelir.
+    deadline: isteğin bitmesi gereken an (time.time() epoch'u; havuz worker'larında da geçerli).
+    Verilirse arama ilk çözümde durmaz, bütçe bitene kadar iyileştirir; time_limit_seconds üst sınır kalır.
+    stall_seconds: bu kadar saniye daha iyi çözüm bulunmazsa arama erken durur.
+    presize_fleet: başlangıç planı (warm start / savings_start) varsa model, depoya ayrılan tüm araçlar
+    yerine palet kutulama + süre tahminine (pay ile) yeten tip uyumlu araç alt kümesiyle kurulur;
+    alt kümeyle plan / çözüm bulunamazsa tüm filoyla yeniden çözülür.
+    post_optimize_seconds: çözümden çıkarılan rotalara uygulanan NumPy yerel aramasının bütçesi
+    (0 = kapalı); deadline varsa kalan süreyle sınırlıdır.
+    """
+    osrm_url: str = DEFAULT_OSRM_URL
+    matrix_store_dir: Optional[str] = None
+    road_durations: bool = False
+    fuel_price: float = 47.50
+    time_limit_seconds: int = 300
+    deadline: Optional[float] = None
+    stall_seconds: Optional[float] = None
+    average_speed_kmh: float = AVERAGE_SPEED_KMH
+    vehicle_fixed_cost: int = VEHICLE_FIXED_COST
+    max_route_minutes: int = MAX_ROUTE_MINUTES
+    enforce_vehicle_types: bool = True
+    vehicle_type_penalty: int = VEHICLE_TYPE_PENALTY
+    break_symmetry: bool = True
+    allow_drops: bool = False
+    savings_start: bool = True
+    presize_fleet: bool = True
+    post_optimize_seconds: float = POST_OPTIMIZE_SECONDS
+    drop_penalty: int = DROP_PENALTY
+    drop_penalty_per_pallet: int = DROP_PENALTY_PER_PALLET
+    distance_cost_per_km: float = 2.5
+    toll_cost_per_km: float = 0.5
+    route_fixed_cost: float = 500.0
+
+    @classmethod
+    def create(cls, osrm_url: Optional[str] = None, **settings) -> "SolveContext":
+        """osrm_url / matrix_store_dir / road_durations verilmezse environment'taki varsayılanlar kullanılır"""
+        settings.setdefault('matrix_store_dir', default_matrix_store_dir())
+        settings.setdefault('road_durations', default_road_durations())
+        return cls(osrm_url=osrm_url or default_osrm_url(), **settings)
+
+    def distance_chain(self, timeout: Optional[float] = None) -> DistanceChain:
+        """Mesafe kaynakları: depo (varsa) -> matris cache'i -> OSRM -> haversine (timeout: OSRM istek süresi)"""
+        return distance_chain(self.osrm_url, self.matrix_store_dir, timeout=timeout)
+
+    def remaining_seconds(self, deadline: Optional[float] = None) -> Optional[float]:
+        """deadline'a (verilmezse isteğin deadline'ına) kalan süre; deadline yoksa None"""
+        deadline = self.deadline if deadline is None else deadline
+        return None if deadline is None else deadline - time.time()
+
+    def task_deadline(self, budget_seconds: Optional[float] = None) -> Optional[float]:
+        """Şimdi başlayan alt problemin bitiş anı: bütçesi ile isteğin deadline'ından erken olanı"""
+        if self.deadline is None:
+            return None
+        if budget_seconds is None:
+            return self.deadline
+        return min(self.deadline, time.time() + budget_seconds)
+
+    def matrix_timeout(self, deadline: Optional[float]) -> Optional[float]:
+        """Matris çekimi için OSRM istek süresi: kalan bütçenin MATRIX_BUDGET_SHARE'i (deadline yoksa None)"""
+        remaining = self.remaining_seconds(deadline)
+        if remaining is None:
+            return None
+        return max(MIN_SEARCH_SECONDS, remaining * MATRIX_BUDGET_SHARE)
+
+    def search_seconds(self, deadline: Optional[float]) -> float:
+        """Arama süre sınırı: time_limit_seconds, deadline varsa kalan süreyle sınırlı (en az MIN_SEARCH_SECONDS)"""
+        remaining = self.remaining_seconds(deadline)
+        if remaining is None:
+            return float(self.time_limit_seconds)
+        return max(MIN_SEARCH_SECONDS, min(float(self.time_limit_seconds), remaining))
+
+    def post_optimize_budget(self, deadline: Optional[float]) -> float:
+        """Son iyileştirme süresi: post_optimize_seconds, deadline varsa kalan süreyle sınırlı (bitmişse 0)"""
+        remaining = self.remaining_seconds(deadline)
+        if remaining is None:
+            return float(self.post_optimize_seconds)
+        return max(0.0, min(float(self.post_optimize_seconds), remaining))
+
+    def drop_penalty_for(self, customer: dict) -> int:
+        """Müşteriyi bırakmanın maliyeti: taban + palet başına ceza, müşteri önceliğiyle (priority, varsayılan 1) çarpılır"""
+        base = self.drop_penalty + self.drop_penalty_per_pallet * customer.get("demand_pallets", 1)
+        return int(base * max(customer.get("priority") or 1, 1))
+
+    def replace(self, **changes) -> "SolveContext":
+        return dataclasses.replace(self, **changes)
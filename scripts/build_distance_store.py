@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Önceden hesaplanmış mesafe deposunu oluştur (gece çalıştırılır)
+Tüm aktif depolar + müşteriler için N x N mesafe (ve OSRM ile süre) matrisi çekilir ve
+DISTANCE_STORE_DIR'e yazılır; optimizer bu depodaki noktalar için ağ çağrısı yapmaz.
+
+Kullanım:
+  python3 scripts/build_distance_store.py --api-url https://<app> --output /data/distance-store
+  python3 scripts/build_distance_store.py --locations locations.json --haversine
+locations.json: [{"id": ..., "lat": ..., "lng": ...}, ...]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'railway'))
+from distance_matrix import haversine_matrix
+from matrix_store import write_matrix_store
+from osrm_table import fetch_osrm_table
+from solve_context import default_osrm_url
+
+
+def fetch_app_locations(api_url: str) -> list:
+    """Uygulama API'sinden depolar (/api/depots, sadece aktifler) ve müşteriler (/api/customers)"""
+    locations = []
+    for path in ("/api/depots", "/api/customers"):
+        response = requests.get(f"{api_url.rstrip('/')}{path}", timeout=60)
+        response.raise_for_status()
+        locations.extend({"id": row["id"], "lat": row["lat"], "lng": row["lng"]} for row in response.json())
+    return locations
+
+
+def valid_locations(locations: list) -> list:
+    """Geçersiz koordinatlı ve tekrar eden id'li satırları at (DECIMAL kolonlar string gelebilir)"""
+    seen = set()
+    result = []
+    for row in locations:
+        try:
+            lat, lng = float(row["lat"]), float(row["lng"])
+        except (KeyError, TypeError, ValueError):
+            print(f"[DistanceStore] WARNING: Koordinatsız nokta atlandı: {row.get('id')}")
+            continue
+        if not (-90 <= lat <= 90) or not (-180 <= lng <= 180) or row["id"] in seen:
+            print(f"[DistanceStore] WARNING: Geçersiz / tekrar eden nokta atlandı: {row['id']}")
+            continue
+        seen.add(row["id"])
+        result.append((str(row["id"]), lat, lng))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--api-url", help="Next.js uygulamasının kök URL'si (/api/depots, /api/customers)")
+    source.add_argument("--locations", help="[{id, lat, lng}] JSON dosyası")
+    parser.add_argument("--output", default=os.environ.get('DISTANCE_STORE_DIR'), help="Depo dizini (varsayılan DISTANCE_STORE_DIR)")
+    parser.add_argument("--osrm-url", default=None, help="Router (varsayılan OSRM_URL)")
+    parser.add_argument("--haversine", action="store_true", help="OSRM yerine kuş uçuşu mesafe (çevrimdışı test deposu, süre matrisi yok)")
+    parser.add_argument("--no-durations", action="store_true", help="OSRM süre matrisini çekme (sadece mesafe)")
+    args = parser.parse_args()
+    if not args.output:
+        parser.error("--output veya DISTANCE_STORE_DIR gerekli")
+
+    if args.api_url:
+        rows = fetch_app_locations(args.api_url)
+    else:
+        with open(args.locations, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+    points = valid_locations(rows)
+    if not points:
+        sys.exit("[DistanceStore] ERROR: Nokta yok")
+
+    ids = [location_id for location_id, _, _ in points]
+    coords = [(lat, lng) for _, lat, lng in points]
+    started = time.perf_counter()
+    durations = None
+    if args.haversine:
+        router = "haversine"
+        distances = haversine_matrix(coords)
+    else:
+        # OSRM hatasında depo yazılmaz: haversine'i router mesafesi diye saklamayalım
+        router = (args.osrm_url or default_osrm_url()).rstrip('/')
+        print(f"[DistanceStore] OSRM Table API çağrılıyor: {len(coords)} nokta ({router})")
+        distances = fetch_osrm_table(coords, router)
+        if not args.no_durations:
+            durations = fetch_osrm_table(coords, router, annotation='duration')
+
+    manifest_path = write_matrix_store(args.output, ids, np.asarray(distances, dtype=np.int32), router, durations)
+    size = distances.nbytes + (durations.nbytes if durations is not None else 0)
+    print(f"[DistanceStore] ✓ {len(ids)} nokta, {size / 1024 / 1024:.1f} MB, "
+          f"{time.perf_counter() - started:.1f}s -> {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,12 +5,19 @@ Tüm kısıtları destekler: kapasite, zaman, mola, servis, araç tipi
 """
 
 import json
+import os
 import sys
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
+import numpy as np
 from ortools.constraint_solver import routing_enums_pb2
 from ortools.constraint_solver import pywrapcp
 
+# Paylaşılan vektörize mesafe matrisi (railway/distance_matrix.py)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'railway'))
+from distance_matrix import haversine_matrix
+
 
 def parse_time_constraint(constraint_text: str) -> Dict[str, Any]:
     """
@@ -109,33 +116,18 @@ def create_data_model(input_data: Dict[str, Any]) -> Dict[str, Any]:
     
     data['depot'] = 0
     
+    if 'time_limit_seconds' in input_data:
+        data['time_limit_seconds'] = input_data['time_limit_seconds']
+    if input_data.get('deadline_seconds'):
+        # Çağıranın bekleyebileceği toplam süre: girdi okunduğu andan itibaren
+        data['deadline'] = time.time() + float(input_data['deadline_seconds'])
+    
     return data
 
 
 def compute_distance_matrix(locations: List[List[float]]) -> List[List[float]]:
     """Kuş uçuşu mesafe matrisi (km)"""
-    from math import radians, cos, sin, asin, sqrt
-    
-    def haversine(lat1, lon1, lat2, lon2):
-        R = 6371  # Dünya yarıçapı (km)
-        dlat = radians(lat2 - lat1)
-        dlon = radians(lon2 - lon1)
-        a = sin(dlat/2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
-        return R * c
-    
-    n = len(locations)
-    matrix = [[0.0] * n for _ in range(n)]
-    
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                matrix[i][j] = haversine(
-                    locations[i][0], locations[i][1],
-                    locations[j][0], locations[j][1]
-                )
-    
-    return matrix
+    return (haversine_matrix(locations) / 1000.0).tolist()
 
 
 def solve_vrp(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -149,21 +141,15 @@ def solve_vrp(data: Dict[str, Any]) -> Dict[str, Any]:
     )
     routing = pywrapcp.RoutingModel(manager)
     
-    # 1. MESAFE CALLBACK
-    def distance_callback(from_index, to_index):
-        from_node = manager.IndexToNode(from_index)
-        to_node = manager.IndexToNode(to_index)
-        return int(data['distance_matrix'][from_node][to_node] * 100)  # cm'ye çevir
+    # Transit matrisleri bir kez tamsayıya çevrilip native kaydedilir (Python callback yok)
     
-    distance_callback_index = routing.RegisterTransitCallback(distance_callback)
+    # 1. MESAFE MATRİSİ (km * 100)
+    distance_matrix = (np.asarray(data['distance_matrix'], dtype=np.float64) * 100).astype(np.int64)
+    distance_callback_index = routing.RegisterTransitMatrix(distance_matrix.tolist())
     routing.SetArcCostEvaluatorOfAllVehicles(distance_callback_index)
     
     # 2. KAPASİTE KISITI
-    def demand_callback(from_index):
-        from_node = manager.IndexToNode(from_index)
-        return data['demands'][from_node]
-    
-    demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback)
+    demand_callback_index = routing.RegisterUnaryTransitVector([int(d) for d in data['demands']])
     routing.AddDimensionWithVehicleCapacity(
         demand_callback_index,
         0,  # null capacity slack
@@ -172,15 +158,12 @@ def solve_vrp(data: Dict[str, Any]) -> Dict[str, Any]:
         'Capacity'
     )
     
-    # 3. ZAMAN KISITI (Sürüş + Servis + Mola)
-    def time_callback(from_index, to_index):
-        from_node = manager.IndexToNode(from_index)
-        to_node = manager.IndexToNode(to_index)
-        travel_time = int(data['time_matrix'][from_node][to_node])
-        service_time = data['service_times'][to_node]
-        return travel_time + service_time
-    
-    time_callback_index = routing.RegisterTransitCallback(time_callback)
+    # 3. ZAMAN KISITI (Sürüş + Servis + Mola): int(seyahat) + varış noktası servis süresi
+    time_matrix = (
+        np.asarray(data['time_matrix'], dtype=np.float64).astype(np.int64)
+        + np.asarray(data['service_times'], dtype=np.int64)[np.newaxis, :]
+    )
+    time_callback_index = routing.RegisterTransitMatrix(time_matrix.tolist())
     routing.AddDimension(
         time_callback_index,
         60,  # 60 dakika slack (esneklik)
@@ -209,31 +192,32 @@ def solve_vrp(data: Dict[str, Any]) -> Dict[str, Any]:
             time_dimension.CumulVar(index).RemoveInterval(forbidden_start, forbidden_end)
     
     # 4. ARAC TİPİ KISITI
+    # Araçlar tipe göre bir kez gruplanır; aynı tip kümesini isteyen müşteriler aynı domain'i paylaşır
+    vehicles_by_type = {}
+    for vehicle_id, vehicle_type in enumerate(data['vehicle_types']):
+        vehicles_by_type.setdefault(vehicle_type, []).append(vehicle_id)
+    vehicle_domains = {}
     for node_idx in range(1, len(data['vehicle_constraints'])):
         allowed_types = data['vehicle_constraints'][node_idx]
         if allowed_types:
-            index = manager.NodeToIndex(node_idx)
+            key = frozenset(allowed_types)
+            if key not in vehicle_domains:
+                vehicle_domains[key] = [-1] + sorted(v for t in key for v in vehicles_by_type.get(t, []))
             # Bu müşteriyi sadece izin verilen araç tipleri ziyaret edebilir
-            for vehicle_id in range(data['num_vehicles']):
-                if data['vehicle_types'][vehicle_id] not in allowed_types:
-                    routing.VehicleVar(index).RemoveValue(vehicle_id)
+            routing.VehicleVar(manager.NodeToIndex(node_idx)).SetValues(vehicle_domains[key])
     
     # 5. SURUCU MOLA KISITI
-    # 4.5 saat sonra 45 dk mola (OR-Tools break intervals)
+    # 4.5 saat sonra 45 dk mola (OR-Tools break intervals, Time boyutunda)
+    node_visit_transit = [data['service_times'][manager.IndexToNode(index)] for index in range(routing.Size())]
     for vehicle_id in range(data['num_vehicles']):
-        break_intervals = routing.GetBreakIntervalsOfVehicle(vehicle_id)
-        break_intervals.append(
-            pywrapcp.IntervalVar(
-                routing.solver(),
-                int(data['max_drive_time']),  # 4.5h sonra
-                int(data['max_drive_time']),  # 4.5h sonra
-                int(data['break_duration']),  # 45 dk süre
-                int(data['break_duration']),  # 45 dk süre
-                0,
-                1,
-                f'break_{vehicle_id}'
-            )
+        break_interval = routing.solver().FixedDurationIntervalVar(
+            int(data['max_drive_time']),  # 4.5h sonra (en erken)
+            int(data['max_drive_time']),  # 4.5h sonra (en geç)
+            int(data['break_duration']),  # 45 dk süre
+            False,  # zorunlu mola
+            f'break_{vehicle_id}'
         )
+        time_dimension.SetBreakIntervalsOfVehicle([break_interval], vehicle_id, node_visit_transit)
     
     # Arama parametreleri
     search_parameters = pywrapcp.DefaultRoutingSearchParameters()
@@ -248,8 +232,12 @@ def solve_vrp(data: Dict[str, Any]) -> Dict[str, Any]:
         routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
     )
     
-    # Zaman limiti: 30 saniye (256 müşteri için yeterli)
-    search_parameters.time_limit.seconds = 30
+    # Zaman limiti: 30 saniye (256 müşteri için yeterli), girdiden değiştirilebilir;
+    # deadline_seconds verildiyse model kurulumundan kalan süreyle sınırlanır (en az 1 saniye)
+    time_limit = float(data.get('time_limit_seconds', 30))
+    if 'deadline' in data:
+        time_limit = max(1.0, min(time_limit, data['deadline'] - time.time()))
+    search_parameters.time_limit.FromMilliseconds(int(time_limit * 1000))
     
     # Solution limit: İlk 10 çözümü değerlendir
     search_parameters.solution_limit = 10
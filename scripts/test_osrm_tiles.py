@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Karolu OSRM Table çekimi testi
+Lokal sahte OSRM sunucusu (max-table-size 100) ile 350 nokta senaryosunu test eder
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'railway'))
+from distance_matrix import haversine_matrix
+from osrm_table import fetch_osrm_table
+
+MAX_TABLE_SIZE = 100
+ROAD_FACTOR = 1.3  # sahte "yol" mesafesi = kuş uçuşu * 1.3
+ROAD_SPEED_MPS = 12.5  # sahte seyahat süresi = yol mesafesi / 45 km/h
+
+stats = {"requests": 0, "rejected": 0, "in_flight": 0, "max_in_flight": 0}
+stats_lock = threading.Lock()
+
+
+class FakeOSRMHandler(BaseHTTPRequestHandler):
+    """/table/v1/driving/{coords}?sources=..&destinations=.. taklidi"""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        with stats_lock:
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            parts = urlsplit(self.path)
+            coords = [c.split(',') for c in parts.path.rsplit('/', 1)[-1].split(';')]
+            locations = [(float(lat), float(lng)) for lng, lat in coords]
+            query = parse_qs(parts.query)
+            sources = [int(i) for i in query['sources'][0].split(';')] if 'sources' in query else list(range(len(locations)))
+            destinations = [int(i) for i in query['destinations'][0].split(';')] if 'destinations' in query else list(range(len(locations)))
+
+            if len(sources) * len(destinations) > MAX_TABLE_SIZE * MAX_TABLE_SIZE:
+                with stats_lock:
+                    stats["rejected"] += 1
+                self._send(400, {"code": "TooBig", "message": "Too many table coordinates"})
+                return
+
+            matrix = haversine_matrix([locations[i] for i in sources], [locations[j] for j in destinations]) * ROAD_FACTOR
+            if query.get('annotations', ['distance'])[0] == 'duration':
+                self._send(200, {"code": "Ok", "durations": (matrix / ROAD_SPEED_MPS).tolist()})
+            else:
+                self._send(200, {"code": "Ok", "distances": matrix.tolist()})
+        finally:
+            with stats_lock:
+                stats["in_flight"] -= 1
+
+
+def main():
+    print("=" * 60)
+    print("OSRM KAROLU TABLE TESTİ")
+    print("=" * 60)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOSRMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    osrm_url = f"http://127.0.0.1:{server.server_port}"
+
+    rng = random.Random(7)
+    locations = [(37.0 + rng.uniform(-0.3, 0.3), 35.32 + rng.uniform(-0.3, 0.3)) for _ in range(350)]
+
+    try:
+        # Tek istek sunucunun sınırına takılmalı
+        try:
+            fetch_osrm_table(locations, osrm_url, tile_size=len(locations))
+            print("\n❌ HATA: Karosuz istek reddedilmedi")
+            sys.exit(1)
+        except Exception as e:
+            print(f"Karosuz istek reddedildi (beklenen): {type(e).__name__}")
+
+        stats.update(requests=0, max_in_flight=0)
+        matrix = fetch_osrm_table(locations, osrm_url, tile_size=MAX_TABLE_SIZE, max_concurrency=3)
+
+        expected = (haversine_matrix(locations) * ROAD_FACTOR).astype('int32')
+        max_diff = int(abs(matrix.astype('int64') - expected).max())
+
+        print(f"Matris boyutu: {matrix.shape}")
+        print(f"Karo isteği: {stats['requests']} (beklenen 16)")
+        print(f"Maks eşzamanlı istek: {stats['max_in_flight']} (sınır 3)")
+        print(f"Beklenen matristen maks fark: {max_diff} m")
+
+        if matrix.shape != (350, 350) or stats['requests'] != 16 or stats['max_in_flight'] > 3 or max_diff > 1:
+            print("\n❌ HATA: Karolu matris beklenen sonuçla uyuşmuyor")
+            sys.exit(1)
+
+        # Süre matrisi (annotations=duration, saniye) aynı karolarla çekilir
+        durations = fetch_osrm_table(locations, osrm_url, tile_size=MAX_TABLE_SIZE, max_concurrency=3, annotation='duration')
+        expected_durations = (haversine_matrix(locations) * ROAD_FACTOR / ROAD_SPEED_MPS).astype('int32')
+        max_duration_diff = int(abs(durations.astype('int64') - expected_durations).max())
+        print(f"Süre matrisinde beklenenden maks fark: {max_duration_diff} s")
+        if durations.shape != (350, 350) or max_duration_diff > 1:
+            print("\n❌ HATA: Karolu süre matrisi beklenen sonuçla uyuşmuyor")
+            sys.exit(1)
+
+        print("\n✅ TEST BAŞARILI")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()